@@ -0,0 +1,352 @@
+"""Counts, latencies, retries and throttles of the AWS API calls of a run."""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from aws_finops_dashboard.state import atomic_write_json, get_state_dir
+from aws_finops_dashboard.tracing import tracer
+
+console = Console()
+
+# Error codes AWS services use to reject a call for exceeding a rate limit
+THROTTLING_ERROR_CODES = {
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "RequestThrottledException",
+    "TooManyRequestsException",
+    "ProvisionedThroughputExceededException",
+    "RequestLimitExceeded",
+    "RequestThrottled",
+    "BandwidthLimitExceeded",
+    "LimitExceededException",
+    "SlowDown",
+    "EC2ThrottledException",
+}
+
+LATENCY_HISTORY_FILENAME = "api_latencies.json"
+# Weight of the latest run in the moving average of the recorded latencies
+LATENCY_SMOOTHING = 0.5
+
+# (profile, service, operation, region)
+CallKey = Tuple[str, str, str, str]
+
+_START = "api_metrics_start"
+_THROTTLES = "api_metrics_throttles"
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = round(percent / 100 * len(sorted_values)) - 1
+    return sorted_values[max(0, min(len(sorted_values) - 1, rank))]
+
+
+def _error_code(parsed: Any) -> Optional[str]:
+    if isinstance(parsed, dict):
+        return parsed.get("Error", {}).get("Code")
+    return None
+
+
+class ApiCallMetrics:
+    """
+    Records every AWS API call made through an instrumented boto3 session.
+
+    Sessions are instrumented by aws_client.create_session once recording or
+    tracing is enabled, through botocore's before-call, needs-retry, after-call and
+    after-call-error events. Latencies cover the whole call, retries included.
+    Worker processes record into their own instance; their snapshot() is
+    merged into the one of the main process.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._calls: Dict[CallKey, Dict[str, Any]] = {}
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def instrument(self, session: Any, profile: Optional[str]) -> None:
+        """Record the calls of every client created from the session."""
+        profile = profile or "default"
+        events = session.events
+        events.register("before-call", self._before_call)
+        events.register("needs-retry", self._needs_retry)
+        events.register("after-call", functools.partial(self._after_call, profile))
+        events.register(
+            "after-call-error", functools.partial(self._after_call_error, profile)
+        )
+
+    def _before_call(self, context: Dict[str, Any], **kwargs: Any) -> None:
+        context[_START] = time.perf_counter()
+        context[_THROTTLES] = 0
+
+    def _needs_retry(
+        self, response: Any = None, request_dict: Any = None, **kwargs: Any
+    ) -> None:
+        # Called after every attempt; response is (http response, parsed) or None
+        if response is None or not request_dict:
+            return
+        if _error_code(response[1]) in THROTTLING_ERROR_CODES:
+            context = request_dict.get("context", {})
+            context[_THROTTLES] = context.get(_THROTTLES, 0) + 1
+
+    def _after_call(
+        self,
+        profile: str,
+        event_name: str,
+        context: Dict[str, Any],
+        parsed: Any = None,
+        **kwargs: Any,
+    ) -> None:
+        # Error responses from the service also end up here, parsed
+        retries = 0
+        if isinstance(parsed, dict):
+            retries = parsed.get("ResponseMetadata", {}).get("RetryAttempts", 0)
+        error = _error_code(parsed) is not None
+        self._record(profile, event_name, context, retries, error)
+
+    def _after_call_error(
+        self,
+        profile: str,
+        event_name: str,
+        context: Dict[str, Any],
+        exception: Any = None,
+        **kwargs: Any,
+    ) -> None:
+        # Calls that got no response at all, e.g. on connection errors
+        response = getattr(exception, "response", None) or {}
+        retries = response.get("ResponseMetadata", {}).get("RetryAttempts", 0)
+        self._record(profile, event_name, context, retries, error=True)
+
+    def _record(
+        self,
+        profile: str,
+        event_name: str,
+        context: Dict[str, Any],
+        retries: int,
+        error: bool,
+    ) -> None:
+        if _START not in context:
+            return
+        elapsed = time.perf_counter() - context[_START]
+        # after-call.<service id>.<operation>
+        _, service, operation = event_name.split(".", 2)
+        region = context.get("client_region") or "global"
+        if tracer.enabled:
+            tracer.add_span(
+                f"{service}.{operation}",
+                context[_START],
+                elapsed,
+                "aws",
+                profile=profile,
+                region=region,
+                retries=retries,
+                error=error,
+            )
+        if not self.enabled:
+            return
+        key = (profile, service, operation, region)
+        with self._lock:
+            entry = self._calls.setdefault(
+                key,
+                {"latencies": [], "retries": 0, "throttles": 0, "errors": 0},
+            )
+            entry["latencies"].append(elapsed)
+            entry["retries"] += retries
+            entry["throttles"] += context.get(_THROTTLES, 0)
+            entry["errors"] += int(error)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Return the recorded calls as picklable, JSON-serializable records."""
+        with self._lock:
+            return [
+                {
+                    "profile": key[0],
+                    "service": key[1],
+                    "operation": key[2],
+                    "region": key[3],
+                    **entry,
+                    "latencies": list(entry["latencies"]),
+                }
+                for key, entry in self._calls.items()
+            ]
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Return the snapshot and forget the recorded calls."""
+        records = self.snapshot()
+        with self._lock:
+            self._calls = {}
+        return records
+
+    def merge(self, records: List[Dict[str, Any]]) -> None:
+        """Add the snapshot of another instance, e.g. of a worker process."""
+        with self._lock:
+            for record in records:
+                key = (
+                    record["profile"],
+                    record["service"],
+                    record["operation"],
+                    record["region"],
+                )
+                entry = self._calls.setdefault(
+                    key,
+                    {"latencies": [], "retries": 0, "throttles": 0, "errors": 0},
+                )
+                entry["latencies"].extend(record["latencies"])
+                for field in ("retries", "throttles", "errors"):
+                    entry[field] += record[field]
+
+
+# Shared by every session of the process
+api_calls = ApiCallMetrics()
+
+
+def summarize(
+    records: List[Dict[str, Any]], group_by: Tuple[str, ...]
+) -> List[Dict[str, Any]]:
+    """
+    Aggregate call records by the given fields, slowest total time first.
+
+    Each summary has the call count, total and percentile latencies in
+    milliseconds, and the retry, throttle and error counts.
+    """
+    groups: Dict[Tuple[str, ...], Dict[str, Any]] = defaultdict(
+        lambda: {"latencies": [], "retries": 0, "throttles": 0, "errors": 0}
+    )
+    for record in records:
+        group = groups[tuple(record[field] for field in group_by)]
+        group["latencies"].extend(record["latencies"])
+        for field in ("retries", "throttles", "errors"):
+            group[field] += record[field]
+
+    summaries = []
+    for values, group in groups.items():
+        latencies = sorted(group["latencies"])
+        summary: Dict[str, Any] = dict(zip(group_by, values))
+        summary.update(
+            {
+                "calls": len(latencies),
+                "total_ms": round(sum(latencies) * 1000, 1),
+                "p50_ms": round(_percentile(latencies, 50) * 1000, 1),
+                "p90_ms": round(_percentile(latencies, 90) * 1000, 1),
+                "p99_ms": round(_percentile(latencies, 99) * 1000, 1),
+                "max_ms": round(latencies[-1] * 1000 if latencies else 0.0, 1),
+                "retries": group["retries"],
+                "throttles": group["throttles"],
+                "errors": group["errors"],
+            }
+        )
+        summaries.append(summary)
+    return sorted(summaries, key=lambda summary: -summary["total_ms"])
+
+
+def print_api_timings(records: List[Dict[str, Any]]) -> None:
+    """Print the calls of the run per service and operation, slowest first."""
+    if not records:
+        console.print("[yellow]No AWS API calls were recorded[/]")
+        return
+    table = Table(
+        title="AWS API Calls",
+        box=box.SIMPLE,
+        style="bright_cyan",
+        title_style="bold bright_cyan",
+    )
+    table.add_column("Service", style="bold")
+    table.add_column("Operation")
+    table.add_column("Calls", justify="right")
+    table.add_column("Total", justify="right")
+    table.add_column("p50", justify="right")
+    table.add_column("p90", justify="right")
+    table.add_column("p99", justify="right")
+    table.add_column("Retries", justify="right")
+    table.add_column("Throttled", justify="right")
+    table.add_column("Errors", justify="right")
+    for summary in summarize(records, ("service", "operation")):
+        table.add_row(
+            summary["service"],
+            summary["operation"],
+            str(summary["calls"]),
+            f"{summary['total_ms'] / 1000:.1f}s",
+            f"{summary['p50_ms']:.0f}ms",
+            f"{summary['p90_ms']:.0f}ms",
+            f"{summary['p99_ms']:.0f}ms",
+            str(summary["retries"]),
+            f"[bold red]{summary['throttles']}[/]" if summary["throttles"] else "0",
+            f"[bold red]{summary['errors']}[/]" if summary["errors"] else "0",
+        )
+    console.print(table)
+
+
+def write_api_timings(records: List[Dict[str, Any]], path: str) -> None:
+    """
+    Write the calls of the run as JSON: summaries per service and operation
+    and per service and region, and every (profile, service, operation,
+    region) with its own statistics.
+    """
+    document = {
+        "by_operation": summarize(records, ("service", "operation")),
+        "by_region": summarize(records, ("service", "region")),
+        "calls": summarize(records, ("profile", "service", "operation", "region")),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+
+
+def _latency_history_path() -> str:
+    return os.path.join(get_state_dir(), LATENCY_HISTORY_FILENAME)
+
+
+def load_latency_history(path: Optional[str] = None) -> Dict[str, float]:
+    """
+    Return the mean latency in seconds of each service.operation called by
+    previous runs; a missing or unreadable file is treated as no history.
+    """
+    try:
+        with open(path or _latency_history_path(), encoding="utf-8") as f:
+            history = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(history, dict):
+        return {}
+    return {
+        operation: float(entry["mean"])
+        for operation, entry in history.items()
+        if isinstance(entry, dict) and "mean" in entry
+    }
+
+
+def record_latency_history(
+    records: List[Dict[str, Any]], path: Optional[str] = None
+) -> None:
+    """Merge the mean latency of each operation of this run into the history."""
+    if not records:
+        return
+    path = path or _latency_history_path()
+    try:
+        with open(path, encoding="utf-8") as f:
+            history = json.load(f)
+        if not isinstance(history, dict):
+            history = {}
+    except (OSError, ValueError):
+        history = {}
+    for summary in summarize(records, ("service", "operation")):
+        operation = f"{summary['service']}.{summary['operation']}"
+        mean = summary["total_ms"] / 1000 / summary["calls"]
+        entry = history.get(operation)
+        previous = entry.get("mean") if isinstance(entry, dict) else None
+        if previous is not None:
+            mean = LATENCY_SMOOTHING * mean + (1 - LATENCY_SMOOTHING) * previous
+        history[operation] = {"mean": round(mean, 4), "calls": summary["calls"]}
+    atomic_write_json(path, history)
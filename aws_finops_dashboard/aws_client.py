@@ -1,18 +1,69 @@
+import hashlib
+import json
+import os
 from collections import defaultdict
-from typing import Dict, List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 
 import boto3
 from boto3.session import Session
 from botocore.exceptions import ClientError
 from rich.console import Console
 
+from aws_finops_dashboard.api_metrics import api_calls
+from aws_finops_dashboard.cassette import cassette
+from aws_finops_dashboard.ce_budget import ce_meter
+from aws_finops_dashboard.deadline import ProfileDeadline
+from aws_finops_dashboard.state import atomic_write_json, get_state_dir
+from aws_finops_dashboard.tracing import tracer
 from aws_finops_dashboard.types import BudgetInfo, EC2Summary, RegionName
 
 console = Console()
 
 
+def create_session(profile_name: Optional[str] = None) -> Session:
+    """
+    Create a boto3 session for a profile.
+
+    The calls of the session are recorded when API call timings or tracing
+    are enabled, and recorded to or replayed from the cassette when --record
+    or --replay is used. Cost Explorer requests are always counted by the run
+    meter.
+    """
+    session = cassette.replay_session(profile_name) if cassette.replaying else None
+    if session is None:
+        session = boto3.Session(profile_name=profile_name)
+    ce_meter.instrument(session)
+    if api_calls.enabled or tracer.enabled:
+        api_calls.instrument(session, profile_name)
+    if cassette.mode is not None:
+        cassette.install(session, profile_name)
+    return session
+
+
+def create_client(
+    session: Session,
+    service_name: str,
+    region_name: Optional[str] = None,
+    deadline: Optional[ProfileDeadline] = None,
+) -> Any:
+    """
+    Create a client from the session, bounded by the call budget left on the
+    optional deadline: create it just before its calls.
+    """
+    config = deadline.client_config() if deadline is not None else None
+    return session.client(  # type: ignore[call-overload]
+        service_name, region_name=region_name, config=config
+    )
+
+
 def get_aws_profiles() -> List[str]:
-    """Get all configured AWS profiles from the AWS CLI configuration."""
+    """
+    Get all configured AWS profiles from the AWS CLI configuration, or the
+    recorded profiles when replaying a cassette.
+    """
+    if cassette.replaying:
+        return cassette.profiles()
     try:
         session = boto3.Session()
         return session.available_profiles
@@ -21,17 +72,22 @@ def get_aws_profiles() -> List[str]:
         return []
 
 
-def get_account_id(session: Session) -> Optional[str]:
+def get_account_id(
+    session: Session, deadline: Optional[ProfileDeadline] = None
+) -> Optional[str]:
     """Get the AWS account ID for a session."""
     try:
-        account_id = session.client("sts").get_caller_identity().get("Account")
+        sts = create_client(session, "sts", deadline=deadline)
+        account_id = sts.get_caller_identity().get("Account")
         return str(account_id) if account_id is not None else None
     except Exception as e:
         console.log(f"[yellow]Warning: Could not get account ID: {str(e)}[/]")
         return None
 
 
-def get_all_regions(session: Session) -> List[RegionName]:
+def get_all_regions(
+    session: Session, deadline: Optional[ProfileDeadline] = None
+) -> List[RegionName]:
     """
     Get all available AWS regions.
     Using us-east-1 as a default region to get the list of all regions.
@@ -39,7 +95,7 @@ def get_all_regions(session: Session) -> List[RegionName]:
     If the call fails, it will return a hardcoded list of common regions.
     """
     try:
-        ec2_client = session.client("ec2", region_name="us-east-1")
+        ec2_client = create_client(session, "ec2", "us-east-1", deadline)
         regions = [
             region["RegionName"] for region in ec2_client.describe_regions()["Regions"]
         ]
@@ -59,14 +115,41 @@ def get_all_regions(session: Session) -> List[RegionName]:
         ]
 
 
-def get_accessible_regions(session: Session) -> List[RegionName]:
-    """Get regions that are accessible with the current credentials."""
-    all_regions = get_all_regions(session)
+def _regions_cache_path(profile: str) -> str:
+    name = hashlib.sha256(profile.encode()).hexdigest()[:16]
+    return os.path.join(get_state_dir(), "regions", f"{name}.json")
+
+
+def load_cached_regions(profile: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the regions found accessible for a profile by its last run, with
+    the number of regions probed to find them, or None if never probed.
+    """
+    try:
+        with open(_regions_cache_path(profile), encoding="utf-8") as f:
+            cached = json.load(f)
+        return {"regions": list(cached["regions"]), "probed": int(cached["probed"])}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def get_accessible_regions(
+    session: Session, deadline: Optional[ProfileDeadline] = None
+) -> List[RegionName]:
+    """
+    Get regions that are accessible with the current credentials.
+
+    Stops probing further regions once the optional deadline has expired.
+    A complete probe is cached for the profile, for --plan.
+    """
+    all_regions = get_all_regions(session, deadline)
     accessible_regions = []
 
     for region in all_regions:
+        if deadline is not None and deadline.expired():
+            break
         try:
-            ec2_client = session.client("ec2", region_name=region)
+            ec2_client = create_client(session, "ec2", region, deadline)
             ec2_client.describe_instances(MaxResults=5)
             accessible_regions.append(region)
         except Exception:
@@ -78,13 +161,31 @@ def get_accessible_regions(session: Session) -> List[RegionName]:
         console.log("[yellow]No accessible regions found. Using default regions.[/]")
         return ["us-east-1", "us-east-2", "us-west-1", "us-west-2"]
 
+    if deadline is None or not deadline.expired():
+        try:
+            atomic_write_json(
+                _regions_cache_path(session.profile_name or "default"),
+                {
+                    "regions": accessible_regions,
+                    "probed": len(all_regions),
+                    "saved": datetime.now().isoformat(timespec="seconds"),
+                },
+            )
+        except OSError:
+            pass
     return accessible_regions
 
 
 def ec2_summary(
-    session: Session, regions: Optional[List[RegionName]] = None
+    session: Session,
+    regions: Optional[List[RegionName]] = None,
+    deadline: Optional[ProfileDeadline] = None,
 ) -> EC2Summary:
-    """Get EC2 instance summary across specified regions or all regions."""
+    """
+    Get EC2 instance summary across specified regions or all regions.
+
+    Stops scanning further regions once the optional deadline has expired.
+    """
     if regions is None:
         regions = [
             "us-east-1",
@@ -101,8 +202,10 @@ def ec2_summary(
     instance_summary: EC2Summary = defaultdict(int)
 
     for region in regions:
+        if deadline is not None and deadline.expired():
+            break
         try:
-            ec2_regional = session.client("ec2", region_name=region)
+            ec2_regional = create_client(session, "ec2", region, deadline)
             instances = ec2_regional.describe_instances()
             for reservation in instances["Reservations"]:
                 for instance in reservation["Instances"]:
@@ -122,13 +225,21 @@ def ec2_summary(
 
 
 def get_stopped_instances(
-    session: Session, regions: List[RegionName]
+    session: Session,
+    regions: List[RegionName],
+    deadline: Optional[ProfileDeadline] = None,
 ) -> Dict[RegionName, List[str]]:
-    """Get stopped EC2 instances per region."""
+    """
+    Get stopped EC2 instances per region.
+
+    Stops scanning further regions once the optional deadline has expired.
+    """
     stopped = {}
     for region in regions:
+        if deadline is not None and deadline.expired():
+            break
         try:
-            ec2 = session.client("ec2", region_name=region)
+            ec2 = create_client(session, "ec2", region, deadline)
             response = ec2.describe_instances(
                 Filters=[{"Name": "instance-state-name", "Values": ["stopped"]}]
             )
@@ -147,13 +258,21 @@ def get_stopped_instances(
 
 
 def get_unused_volumes(
-    session: Session, regions: List[RegionName]
+    session: Session,
+    regions: List[RegionName],
+    deadline: Optional[ProfileDeadline] = None,
 ) -> Dict[RegionName, List[str]]:
-    """Get unattached EBS volumes per region."""
+    """
+    Get unattached EBS volumes per region.
+
+    Stops scanning further regions once the optional deadline has expired.
+    """
     unused = {}
     for region in regions:
+        if deadline is not None and deadline.expired():
+            break
         try:
-            ec2 = session.client("ec2", region_name=region)
+            ec2 = create_client(session, "ec2", region, deadline)
             response = ec2.describe_volumes(
                 Filters=[{"Name": "status", "Values": ["available"]}]
             )
@@ -168,13 +287,21 @@ def get_unused_volumes(
 
 
 def get_unused_eips(
-    session: Session, regions: List[RegionName]
+    session: Session,
+    regions: List[RegionName],
+    deadline: Optional[ProfileDeadline] = None,
 ) -> Dict[RegionName, List[str]]:
-    """Get unused Elastic IPs per region."""
+    """
+    Get unused Elastic IPs per region.
+
+    Stops scanning further regions once the optional deadline has expired.
+    """
     eips = {}
     for region in regions:
+        if deadline is not None and deadline.expired():
+            break
         try:
-            ec2 = session.client("ec2", region_name=region)
+            ec2 = create_client(session, "ec2", region, deadline)
             response = ec2.describe_addresses()
             free = [
                 addr["PublicIp"]
@@ -191,7 +318,9 @@ def get_unused_eips(
 
 
 def get_untagged_resources(
-    session: Session, regions: List[str]
+    session: Session,
+    regions: List[str],
+    deadline: Optional[ProfileDeadline] = None,
 ) -> Dict[str, Dict[str, List[str]]]:
     result: Dict[str, Dict[str, List[str]]] = {
         "EC2": {},
@@ -201,9 +330,11 @@ def get_untagged_resources(
     }
 
     for region in regions:
+        if deadline is not None and deadline.expired():
+            break
         # EC2
         try:
-            ec2 = session.client("ec2", region_name=region)
+            ec2 = create_client(session, "ec2", region, deadline)
             response = ec2.describe_instances()
             for reservation in response["Reservations"]:
                 for instance in reservation["Instances"]:
@@ -218,7 +349,7 @@ def get_untagged_resources(
 
         # RDS
         try:
-            rds = session.client("rds", region_name=region)
+            rds = create_client(session, "rds", region, deadline)
             response = rds.describe_db_instances()
             for db_instance in response["DBInstances"]:
                 arn = db_instance["DBInstanceArn"]
@@ -234,7 +365,7 @@ def get_untagged_resources(
 
         # Lambda
         try:
-            lambda_client = session.client("lambda", region_name=region)
+            lambda_client = create_client(session, "lambda", region, deadline)
             response = lambda_client.list_functions()
             for function in response["Functions"]:
                 arn = function["FunctionArn"]
@@ -250,7 +381,7 @@ def get_untagged_resources(
 
         # ELBv2
         try:
-            elbv2 = session.client("elbv2", region_name=region)
+            elbv2 = create_client(session, "elbv2", region, deadline)
             lbs = elbv2.describe_load_balancers().get("LoadBalancers", [])
 
             if lbs:
@@ -273,9 +404,11 @@ def get_untagged_resources(
     return result
 
 
-def get_budgets(session: Session) -> List[BudgetInfo]:
-    account_id = get_account_id(session)
-    budgets = session.client("budgets", region_name="us-east-1")
+def get_budgets(
+    session: Session, deadline: Optional[ProfileDeadline] = None
+) -> List[BudgetInfo]:
+    account_id = get_account_id(session, deadline)
+    budgets = create_client(session, "budgets", "us-east-1", deadline)
 
     budgets_data: List[BudgetInfo] = []
     try:
@@ -0,0 +1,321 @@
+"""Recording of AWS responses to a directory, and their replay without AWS."""
+
+import base64
+import functools
+import glob
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from io import BytesIO
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import boto3
+from boto3.session import Session
+from botocore.awsrequest import AWSResponse
+
+from aws_finops_dashboard.state import atomic_write_json
+
+CASSETTE_VERSION = 1
+CASSETTE_FILENAME = "cassette.json"
+# One file per process, so --processes workers never interleave their writes
+INTERACTIONS_PATTERN = "interactions-*.jsonl"
+# Uploads of the reports are outputs of a run, not data it fetches
+PASSTHROUGH_SERVICES = {"s3"}
+# Replay sessions sign requests, so they need credentials, but never real ones
+_REPLAY_CREDENTIALS = {
+    "aws_access_key_id": "REPLAY",
+    "aws_secret_access_key": "REPLAY",
+}
+
+
+class CassetteError(Exception):
+    """Raised when a cassette cannot be used or has no response for a request."""
+
+
+class _RawResponse(BytesIO):
+    """Recorded body in the shape botocore reads it from urllib3."""
+
+    def stream(self, **kwargs: Any) -> Iterator[bytes]:
+        yield self.getvalue()
+
+
+class ReplaySession(boto3.Session):
+    """Session of a replayed profile, which does not have to exist locally."""
+
+    def __init__(self, profile: str, region_name: Optional[str]):
+        super().__init__(region_name=region_name, **_REPLAY_CREDENTIALS)
+        self._replayed_profile = profile
+
+    @property
+    def profile_name(self) -> str:
+        return self._replayed_profile
+
+
+def _canonical_body(body: Any) -> Any:
+    """Return the request body in a form that ignores key and parameter order."""
+    if body is None:
+        return ""
+    if isinstance(body, bytes):
+        try:
+            body = body.decode("utf-8")
+        except UnicodeDecodeError:
+            return hashlib.sha256(body).hexdigest()
+    if not isinstance(body, str):
+        # Streaming uploads are not part of the key
+        return ""
+    try:
+        return json.loads(body) if body else ""
+    except ValueError:
+        return sorted(parse_qsl(body, keep_blank_values=True))
+
+
+def _hash(payload: List[Any]) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def request_key(profile: str, operation: str, request: Any) -> str:
+    """
+    Return the canonical hash of a request.
+
+    It covers the profile, operation, endpoint, path, query and body, but none
+    of the headers: signatures, dates and user agents change on every call.
+    """
+    parts = urlsplit(request.url)
+    query = sorted(parse_qsl(parts.query, keep_blank_values=True))
+    body = _canonical_body(request.body)
+    return _hash(
+        [profile, operation, request.method, parts.netloc, parts.path, query, body]
+    )
+
+
+def loose_request_key(profile: str, operation: str, request: Any) -> str:
+    """
+    Return the hash of a request without its query and body.
+
+    Used when the exact request was not recorded, e.g. Cost Explorer periods
+    that moved on since the recording.
+    """
+    parts = urlsplit(request.url)
+    return _hash([profile, operation, request.method, parts.netloc, parts.path])
+
+
+class Cassette:
+    """
+    Records the AWS responses of a run, or serves a recorded run instead of AWS.
+
+    Sessions are attached by aws_client.create_session. When recording, every
+    HTTP response, retries included, is appended with the canonical hash of
+    its request. When replaying, sessions get dummy credentials and each
+    request is answered with the responses recorded for the same hash, in the
+    recorded order; requests that were not recorded exactly fall back to the
+    responses of the same operation and endpoint for the same profile.
+    """
+
+    def __init__(self) -> None:
+        self.mode: Optional[str] = None
+        self.directory: Optional[str] = None
+        self.replay_latency = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._file: Any = None
+        self._profiles: Dict[str, Optional[str]] = {}
+        self._recorded_profiles: Set[str] = set()
+        self._exact: Dict[str, List[Dict[str, Any]]] = {}
+        self._loose: Dict[str, List[Dict[str, Any]]] = {}
+        self._served: Dict[Tuple[str, str], int] = {}
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    @property
+    def state(self) -> Optional[Tuple[str, str, bool]]:
+        """Settings to start the same cassette in a worker process."""
+        if self.mode is None or self.directory is None:
+            return None
+        return self.mode, self.directory, self.replay_latency
+
+    def start(self, mode: str, directory: str, replay_latency: bool = False) -> None:
+        """
+        Start recording to, or replaying from, a cassette directory.
+
+        Raises:
+            CassetteError: If the directory cannot be created, or holds no
+                cassette this version can replay
+        """
+        if self.state == (mode, directory, replay_latency):
+            return
+        self.mode = mode
+        self.directory = directory
+        self.replay_latency = replay_latency
+        if mode == "record":
+            metadata_path = os.path.join(directory, CASSETTE_FILENAME)
+            try:
+                if not os.path.exists(metadata_path):
+                    atomic_write_json(
+                        metadata_path,
+                        {
+                            "version": CASSETTE_VERSION,
+                            "recorded": datetime.now().isoformat(),
+                        },
+                    )
+            except OSError as e:
+                raise CassetteError(f"Cannot record to {directory}: {str(e)}")
+        else:
+            self._load()
+
+    def _load(self) -> None:
+        directory = self.directory or ""
+        try:
+            metadata_path = os.path.join(directory, CASSETTE_FILENAME)
+            with open(metadata_path, encoding="utf-8") as f:
+                metadata = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CassetteError(f"No cassette found in {directory}: {str(e)}")
+        if metadata.get("version") != CASSETTE_VERSION:
+            raise CassetteError(
+                f"Cassette {directory} has version {metadata.get('version')}, "
+                f"expected {CASSETTE_VERSION}"
+            )
+        for path in sorted(glob.glob(os.path.join(directory, INTERACTIONS_PATTERN))):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    if record["type"] == "profile":
+                        self._profiles[record["profile"]] = record["region"]
+                    else:
+                        self._exact.setdefault(record["key"], []).append(record)
+                        loose = self._loose.setdefault(record["loose_key"], [])
+                        loose.append(record)
+
+    def profiles(self) -> List[str]:
+        """Return the profiles of the replayed cassette."""
+        return sorted(self._profiles)
+
+    def replay_session(self, profile_name: Optional[str]) -> Optional[Session]:
+        """
+        Create a session for a recorded profile that needs no credentials.
+
+        Returns None for profiles that were not recorded, such as the profile
+        used to upload the reports to S3, which need a real session.
+        """
+        profile = profile_name or "default"
+        if profile not in self._profiles:
+            return None
+        return ReplaySession(profile, self._profiles[profile])
+
+    def install(self, session: Session, profile_name: Optional[str]) -> None:
+        """Record or replay the calls of every client created from the session."""
+        profile = profile_name or "default"
+        events = session.events
+        if self.recording:
+            if profile not in self._recorded_profiles:
+                self._recorded_profiles.add(profile)
+                self._write(
+                    {
+                        "type": "profile",
+                        "profile": profile,
+                        "region": session.region_name,
+                    }
+                )
+            events.register("before-send", functools.partial(self._record, profile))
+            events.register("response-received", self._response_received)
+        elif self.replaying:
+            events.register("before-send", functools.partial(self._replay, profile))
+
+    def _record(
+        self, profile: str, request: Any, event_name: str, **kwargs: Any
+    ) -> None:
+        # before-send.<service id>.<operation>
+        _, service, operation = event_name.split(".", 2)
+        if service in PASSTHROUGH_SERVICES:
+            return
+        self._local.pending = {
+            "type": "interaction",
+            "profile": profile,
+            "operation": f"{service}.{operation}",
+            "key": request_key(profile, operation, request),
+            "loose_key": loose_request_key(profile, operation, request),
+            "started": time.perf_counter(),
+        }
+
+    def _response_received(self, response_dict: Any = None, **kwargs: Any) -> None:
+        pending = getattr(self._local, "pending", None)
+        self._local.pending = None
+        if pending is None or response_dict is None:
+            return
+        body = response_dict.get("body")
+        if not isinstance(body, bytes):
+            # Streaming bodies are read by the caller, not recorded
+            return
+        pending["elapsed"] = round(time.perf_counter() - pending.pop("started"), 4)
+        pending["status"] = response_dict["status_code"]
+        pending["headers"] = {
+            name: value
+            for name, value in response_dict["headers"].items()
+            if name.lower() not in ("content-encoding", "content-length")
+        }
+        pending["body"] = base64.b64encode(body).decode("ascii")
+        self._write(pending)
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            if self._file is None:
+                path = os.path.join(
+                    self.directory or "", f"interactions-{os.getpid()}.jsonl"
+                )
+                self._file = open(path, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+
+    def _replay(
+        self, profile: str, request: Any, event_name: str, **kwargs: Any
+    ) -> Optional[AWSResponse]:
+        _, service, operation = event_name.split(".", 2)
+        if service in PASSTHROUGH_SERVICES:
+            return None
+        exact = request_key(profile, operation, request)
+        loose = loose_request_key(profile, operation, request)
+        with self._lock:
+            if exact in self._exact:
+                key, recorded = ("exact", exact), self._exact[exact]
+            elif loose in self._loose:
+                key, recorded = ("loose", loose), self._loose[loose]
+            else:
+                raise CassetteError(
+                    f"No recorded response for {service}.{operation} "
+                    f"of profile {profile}"
+                )
+            # Responses are served in the recorded order, the last one repeating
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+            record = recorded[min(served, len(recorded) - 1)]
+        if self.replay_latency:
+            time.sleep(record.get("elapsed", 0))
+        return AWSResponse(
+            request.url,
+            record["status"],
+            record["headers"],
+            _RawResponse(base64.b64decode(record["body"])),
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+# Shared by every session of the process
+cassette = Cassette()
@@ -0,0 +1,165 @@
+"""Run-wide meter and budget of the billed Cost Explorer requests."""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from rich.console import Console
+
+from aws_finops_dashboard.state import atomic_write_json, get_state_dir
+
+console = Console()
+
+# Cost Explorer bills every API request, in USD
+CE_REQUEST_PRICE = 0.01
+
+# Indexes of the run-wide counters
+_REQUESTS, _RESERVED, _REFUSED = 0, 1, 2
+
+
+class CostExplorerBudgetExceeded(Exception):
+    """Raised when the run has no Cost Explorer requests left for a fetch."""
+
+
+class CostExplorerMeter:
+    """
+    Counts the Cost Explorer requests of a run against an optional budget.
+
+    Every fetch reserves the requests it makes before making the first one,
+    so a profile either gets all its cost data or none of it; once the budget
+    cannot cover a fetch, reserve() raises CostExplorerBudgetExceeded and the
+    caller falls back to data cached by budgeted runs. The requests actually
+    sent are counted through the before-call event of the sessions made by
+    aws_client.create_session. With --processes, the counters are shared
+    with the worker processes, so the budget holds for the whole run.
+    """
+
+    def __init__(self) -> None:
+        self.max_requests: Optional[int] = None
+        self._counts: Any = [0, 0, 0]
+        self._lock: Any = threading.Lock()
+
+    def start(self, max_requests: Optional[int]) -> None:
+        self.max_requests = max_requests
+
+    def share(self) -> Tuple[Optional[int], Any]:
+        """
+        Move the counters to shared memory and return the arguments of
+        attach_worker(), to be passed as the initargs of a process pool.
+        """
+        if isinstance(self._counts, list):
+            import multiprocessing
+
+            counts = multiprocessing.get_context("spawn").Array("q", self._counts)
+            self._counts, self._lock = counts, counts.get_lock()
+        return self.max_requests, self._counts
+
+    def attach(self, max_requests: Optional[int], counts: Any) -> None:
+        """Count into the shared counters of the main process."""
+        self.max_requests = max_requests
+        self._counts, self._lock = counts, counts.get_lock()
+
+    def instrument(self, session: Any) -> None:
+        """Count the Cost Explorer requests of the clients made from the session."""
+        session.events.register("before-call.cost-explorer", self._before_call)
+
+    def _before_call(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._counts[_REQUESTS] += 1
+
+    def reserve(self, requests: int) -> None:
+        """
+        Reserve the requests of a fetch against the budget.
+
+        Raises:
+            CostExplorerBudgetExceeded: If the budget cannot cover them
+        """
+        with self._lock:
+            if (
+                self.max_requests is not None
+                and self._counts[_RESERVED] + requests > self.max_requests
+            ):
+                self._counts[_REFUSED] += 1
+                raise CostExplorerBudgetExceeded(
+                    f"Cost Explorer budget of {self.max_requests} requests exhausted"
+                )
+            self._counts[_RESERVED] += requests
+
+    @property
+    def requests(self) -> int:
+        return int(self._counts[_REQUESTS])
+
+    @property
+    def refused(self) -> int:
+        return int(self._counts[_REFUSED])
+
+    @property
+    def estimated_cost(self) -> float:
+        return self.requests * CE_REQUEST_PRICE
+
+
+# Shared by every session of the process
+ce_meter = CostExplorerMeter()
+
+
+def attach_worker(max_requests: Optional[int], counts: Any) -> None:
+    """Process pool initializer sharing the meter of the main process."""
+    ce_meter.attach(max_requests, counts)
+
+
+def _cache_path(kind: str, profile: str, params: List[Any]) -> str:
+    key = hashlib.sha256(
+        json.dumps([kind, profile, params], default=str).encode()
+    ).hexdigest()
+    return os.path.join(get_state_dir(), "ce-cache", f"{key}.json")
+
+
+def save_cached_response(
+    kind: str, profile: str, params: List[Any], data: Dict[str, Any]
+) -> None:
+    """Keep the last Cost Explorer data fetched for a profile and parameters."""
+    try:
+        atomic_write_json(
+            _cache_path(kind, profile, params),
+            {"saved": datetime.now().isoformat(timespec="seconds"), "data": data},
+        )
+    except (OSError, TypeError, ValueError):
+        # The cache is a fallback; failing to update it must not fail the run
+        pass
+
+
+def load_cached_response(
+    kind: str, profile: str, params: List[Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    Return the last cached data of a profile and parameters, with the time it
+    was saved, or None if there is none.
+    """
+    try:
+        with open(_cache_path(kind, profile, params), encoding="utf-8") as f:
+            cached = json.load(f)
+        return {"saved": str(cached["saved"]), "data": cached["data"]}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def print_ce_usage(replaying: bool = False) -> None:
+    """Print the Cost Explorer requests of the run and their estimated cost."""
+    if not ce_meter.requests and ce_meter.max_requests is None:
+        return
+    cost = "not billed, replayed" if replaying else f"~${ce_meter.estimated_cost:.2f}"
+    budget = (
+        f" of a budget of {ce_meter.max_requests}"
+        if ce_meter.max_requests is not None
+        else ""
+    )
+    console.print(
+        f"[bright_cyan]Cost Explorer requests: {ce_meter.requests}{budget} ({cost})[/]"
+    )
+    if ce_meter.refused:
+        console.print(
+            f"[yellow]Cost Explorer budget exhausted: {ce_meter.refused} fetches used cached data or failed[/]"
+        )
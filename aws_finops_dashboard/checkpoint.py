@@ -0,0 +1,156 @@
+"""Checkpoint journal that lets long multi-account runs be resumed."""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, cast
+
+from aws_finops_dashboard.state import atomic_write_json, get_state_dir
+from aws_finops_dashboard.types import ProfileData
+
+# Completed runs older than this are removed when a new run is started
+RUN_RETENTION_SECONDS = 7 * 24 * 60 * 60
+# Runs that never completed are kept longer, so they can still be resumed
+INCOMPLETE_RUN_RETENTION_SECONDS = 30 * 24 * 60 * 60
+
+
+class JournalError(Exception):
+    """Raised when a run journal cannot be opened or does not match the run."""
+
+
+def get_runs_dir() -> str:
+    """Return the directory holding one sub-directory per run."""
+    runs_dir = os.path.join(get_state_dir(), "runs")
+    os.makedirs(runs_dir, exist_ok=True)
+    return runs_dir
+
+
+class RunJournal:
+    """
+    Journal of the profiles completed by a run.
+
+    Each finished profile (or combined account) is stored as its own JSON file,
+    written atomically, so a run that dies part-way keeps everything it fetched.
+    Resuming the run skips the journaled entries and builds the final reports
+    from the combined journal.
+    """
+
+    def __init__(self, run_id: str, run_dir: str, metadata: Dict[str, Any]):
+        self.run_id = run_id
+        self.run_dir = run_dir
+        self.metadata = metadata
+        self.entries_dir = os.path.join(run_dir, "entries")
+
+    @classmethod
+    def create(cls, mode: str, params: Dict[str, Any]) -> "RunJournal":
+        """Start a new journal for a run of the given mode and parameters."""
+        _prune_old_runs()
+        run_id = f"{datetime.now():%Y%m%d_%H%M%S}_{os.urandom(2).hex()}"
+        run_dir = os.path.join(get_runs_dir(), run_id)
+        os.makedirs(os.path.join(run_dir, "entries"))
+        metadata = {
+            "run_id": run_id,
+            "mode": mode,
+            "params": params,
+            "created": time.time(),
+            "completed": False,
+        }
+        journal = cls(run_id, run_dir, metadata)
+        journal._write_metadata()
+        return journal
+
+    @classmethod
+    def resume(cls, run_id: str, mode: str, params: Dict[str, Any]) -> "RunJournal":
+        """Reopen the journal of a previous run, checking it matches this run."""
+        run_dir = os.path.join(get_runs_dir(), run_id)
+        try:
+            with open(os.path.join(run_dir, "run.json"), encoding="utf-8") as f:
+                metadata = json.load(f)
+        except FileNotFoundError:
+            raise JournalError(f"No run journal found for run ID '{run_id}'")
+        except (OSError, json.JSONDecodeError) as e:
+            raise JournalError(f"Could not read run journal '{run_id}': {e}")
+
+        if metadata.get("mode") != mode:
+            raise JournalError(
+                f"Run '{run_id}' was a {metadata.get('mode')} run, not a {mode} run"
+            )
+        mismatched = sorted(
+            key
+            for key in set(params) | set(metadata.get("params", {}))
+            if params.get(key) != metadata.get("params", {}).get(key)
+        )
+        if mismatched:
+            raise JournalError(
+                f"Run '{run_id}' used different options: {', '.join(mismatched)}"
+            )
+        return cls(run_id, run_dir, metadata)
+
+    def _write_metadata(self) -> None:
+        atomic_write_json(os.path.join(self.run_dir, "run.json"), self.metadata)
+
+    def _entry_path(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.entries_dir, f"{digest}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the journaled entry for a profile or account key, if any."""
+        try:
+            with open(self._entry_path(key), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        return entry.get("data") if entry.get("key") == key else None
+
+    def record(self, key: str, data: Dict[str, Any]) -> None:
+        """Atomically store the finished entry for a profile or account key."""
+        atomic_write_json(self._entry_path(key), {"key": key, "data": data})
+
+    def get_value(self, name: str) -> Any:
+        """Return a run-wide value stored with set_value."""
+        return self.metadata.get("values", {}).get(name)
+
+    def set_value(self, name: str, value: Any) -> None:
+        """Store a run-wide value, such as the reporting period, in the journal."""
+        self.metadata.setdefault("values", {})[name] = value
+        self._write_metadata()
+
+    def mark_completed(self) -> None:
+        """Mark the run as completed, to be pruned after RUN_RETENTION_SECONDS."""
+        self.metadata["completed"] = True
+        self._write_metadata()
+
+
+def load_profile_data(data: Dict[str, Any]) -> ProfileData:
+    """Restore a ProfileData entry read back from JSON (lists into tuples)."""
+    data["service_costs"] = [tuple(item) for item in data["service_costs"]]
+    data["previous_service_costs"] = [
+        tuple(item) for item in data["previous_service_costs"]
+    ]
+    return cast(ProfileData, data)
+
+
+def _prune_old_runs() -> None:
+    """
+    Remove journals of completed runs past the retention period, and of runs
+    that never completed past the longer incomplete-run retention period.
+    """
+    runs_dir = get_runs_dir()
+    now = time.time()
+    for run_id in os.listdir(runs_dir):
+        run_dir = os.path.join(runs_dir, run_id)
+        try:
+            with open(os.path.join(run_dir, "run.json"), encoding="utf-8") as f:
+                metadata = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+        retention = (
+            RUN_RETENTION_SECONDS
+            if metadata.get("completed")
+            else INCOMPLETE_RUN_RETENTION_SECONDS
+        )
+        if metadata.get("created", 0) < now - retention:
+            shutil.rmtree(run_dir, ignore_errors=True)
@@ -1,12 +1,16 @@
 import argparse
 import sys
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
-import requests
-from packaging import version
 from rich.console import Console
 
-from aws_finops_dashboard.helpers import load_config_file
+from aws_finops_dashboard.export_handler import (
+    EXPORT_COMPRESSIONS,
+    S3_CHECKSUM_ALGORITHMS,
+    S3_LAYOUTS,
+)
+from aws_finops_dashboard.sharding import parse_shard
+from aws_finops_dashboard.version_check import DISABLE_ENV, VersionCheck
 
 
 def parse_time_range(value: str):
@@ -20,6 +24,40 @@ def parse_time_range(value: str):
             "time-range must be an integer number of days or 'last-month'"
         ) from exc
 
+
+def positive_float(value: str) -> float:
+    """Parse a number of seconds that must be greater than zero."""
+    try:
+        number = float(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"invalid number: {value!r}") from exc
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+
+def positive_int(value: str) -> int:
+    """Parse a count that must be at least 1."""
+    try:
+        number = int(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"invalid integer: {value!r}") from exc
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def non_negative_int(value: str) -> int:
+    """Parse a count that may be 0."""
+    try:
+        number = int(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"invalid integer: {value!r}") from exc
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be at least 0, got {value}")
+    return number
+
+
 console = Console()
 
 __version__ = "2.3.0"
@@ -45,29 +83,187 @@ def welcome_banner() -> None:
     console.print(banner)
 
 
-def check_latest_version() -> None:
-    """Check for the latest version of the AWS FinOps Dashboard (CLI)."""
-    try:
-        response = requests.get(
-            "https://pypi.org/pypi/aws-finops-dashboard/json", timeout=3
+def add_version_check_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--no-version-check",
+        action="store_true",
+        help=f"Do not check PyPI for a newer version (or set {DISABLE_ENV}=1)",
+    )
+
+
+def add_export_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the report export options shared by the dashboard and merge commands."""
+    parser.add_argument(
+        "--report-name",
+        "-n",
+        help="Specify the base name for the report file (without extension)",
+        default=None,
+        type=str,
+    )
+    parser.add_argument(
+        "--report-type",
+        "-y",
+        nargs="+",
+        choices=["csv", "json", "ndjson", "pdf", "parquet"],
+        help="Specify one or more report types: csv, json, ndjson, pdf and/or parquet (space-separated)",
+        type=str,
+        default=["csv"],
+    )
+    parser.add_argument(
+        "--dir",
+        "-d",
+        help="Directory to save the report files (default: current directory)",
+        type=str,
+    )
+    parser.add_argument(
+        "--s3-bucket",
+        "-s3",
+        help="S3 bucket to export the report files to",
+        type=str,
+    )
+    parser.add_argument(
+        "--s3-prefix",
+        "-s3p",
+        help="S3 prefix to export the report files to",
+        type=str,
+    )
+    parser.add_argument(
+        "--s3-profile",
+        "-s3s",
+        help="CLI profile to use for S3 uploads",
+        type=str,
+    )
+    parser.add_argument(
+        "--s3-part-size",
+        help="Part size in MiB for multipart S3 uploads (default: 8, minimum: 5)",
+        type=int,
+    )
+    parser.add_argument(
+        "--s3-concurrency",
+        help="Number of parts uploaded to S3 in parallel (default: 10)",
+        type=int,
+    )
+    parser.add_argument(
+        "--s3-checksum",
+        choices=S3_CHECKSUM_ALGORITHMS,
+        help="Checksum algorithm S3 uses to verify every uploaded part",
+        type=str,
+    )
+    parser.add_argument(
+        "--s3-layout",
+        choices=S3_LAYOUTS,
+        default="flat",
+        help="Layout of the S3 exports: flat files under the prefix (default) or Hive-style report=/format=/date=/account= partitions",
+        type=str,
+    )
+    parser.add_argument(
+        "--compress",
+        choices=EXPORT_COMPRESSIONS,
+        help="Compress CSV and JSON exports while they are written (zstd requires the zstandard package)",
+        type=str,
+    )
+    parser.add_argument(
+        "--compact-json",
+        action="store_true",
+        help="Write JSON exports without indentation",
+    )
+    parser.add_argument(
+        "--skip-unchanged",
+        action="store_true",
+        help="Do not export reports again when their content is unchanged since the last export to the same destination",
+    )
+    parser.add_argument(
+        "--slack",
+        help="Send reports to Slack channel. Provide channel identifier: --slack #channel-name or --slack C1234567890",
+        type=str,
+    )
+
+
+def validate_export_args(args: argparse.Namespace) -> bool:
+    """Validate the S3 and Slack export options, printing any error."""
+    # Validate S3 arguments
+    if args.s3_bucket and args.report_name and not args.s3_profile:
+        console.print(
+            "[bold red]Error: --s3-profile is required when --s3-bucket is specified[/]"
         )
-        latest = response.json()["info"]["version"]
-        if version.parse(latest) > version.parse(__version__):
+        console.print(
+            "[yellow]Please specify which AWS profile to use for S3 upload[/]"
+        )
+        return False
+    if args.s3_part_size is not None and args.s3_part_size < 5:
+        console.print("[bold red]Error: --s3-part-size must be at least 5 (MiB)[/]")
+        return False
+    if args.s3_concurrency is not None and args.s3_concurrency < 1:
+        console.print("[bold red]Error: --s3-concurrency must be at least 1[/]")
+        return False
+    if args.compress and args.compress not in EXPORT_COMPRESSIONS:
+        console.print(
+            f"[bold red]Error: --compress must be one of: {', '.join(EXPORT_COMPRESSIONS)}[/]"
+        )
+        return False
+    if args.compress == "zstd":
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            console.print(
+                "[bold red]Error: zstandard not installed. Please install it with: pip install zstandard[/]"
+            )
+            return False
+    if args.s3_layout not in S3_LAYOUTS:
+        console.print(
+            f"[bold red]Error: --s3-layout must be one of: {', '.join(S3_LAYOUTS)}[/]"
+        )
+        return False
+
+    # Validate Slack arguments
+    if args.slack:
+        # Check if token is provided via environment variable
+        import os
+        slack_token = os.getenv("SLACK_BOT_TOKEN")
+        if not slack_token:
             console.print(
-                f"[bold red]A new version of AWS FinOps Dashboard is available: {latest}[/]"
+                "[bold red]Error: SLACK_BOT_TOKEN environment variable is required when --slack is used[/]"
             )
             console.print(
-                "[bold bright_yellow]Please update using:\npipx upgrade aws-finops-dashboard\nor\npip install --upgrade aws-finops-dashboard\n[/]"
+                "[yellow]Please set SLACK_BOT_TOKEN environment variable with your Slack bot token[/]"
             )
-    except Exception:
-        pass
+            return False
+
+    return True
+
+
+def merge_main(argv: List[str]) -> int:
+    """Entry point of the merge command, which combines sharded run outputs."""
+    from aws_finops_dashboard.dashboard_runner import run_merge
+
+    parser = argparse.ArgumentParser(
+        prog="aws-finops merge",
+        description="Merge the outputs of runs started with --shard into a single report",
+    )
+    parser.add_argument(
+        "shard_files",
+        nargs="+",
+        help="Shard output files written by 'aws-finops --shard i/N' (one per shard)",
+        metavar="SHARD_FILE",
+    )
+    add_export_arguments(parser)
+    add_version_check_argument(parser)
+
+    args = parser.parse_args(argv)
+    version_check = VersionCheck(__version__, args.no_version_check).start()
+    if not validate_export_args(args):
+        return 1
+
+    result = run_merge(args)
+    version_check.notify()
+    return 0 if result == 0 else 1
 
 
 def main() -> int:
     """Command-line interface entry point."""
     welcome_banner()
-    check_latest_version()
-    from aws_finops_dashboard.main import run_dashboard
+    if len(sys.argv) > 1 and sys.argv[1] == "merge":
+        return merge_main(sys.argv[2:])
 
     # Create the parser instance to be accessible for get_default
     parser = argparse.ArgumentParser(description="AWS FinOps Dashboard CLI")
@@ -101,28 +297,7 @@ def main() -> int:
         action="store_true",
         help="Combine profiles from the same AWS account",
     )
-    parser.add_argument(
-        "--report-name",
-        "-n",
-        help="Specify the base name for the report file (without extension)",
-        default=None,
-        type=str,
-    )
-    parser.add_argument(
-        "--report-type",
-        "-y",
-        nargs="+",
-        choices=["csv", "json", "pdf"],
-        help="Specify one or more report types: csv and/or json and/or pdf (space-separated)",
-        type=str,
-        default=["csv"],
-    )
-    parser.add_argument(
-        "--dir",
-        "-d",
-        help="Directory to save the report files (default: current directory)",
-        type=str,
-    )
+    add_export_arguments(parser)
     parser.add_argument(
         "--time-range",
         "-t",
@@ -150,33 +325,93 @@ def main() -> int:
         help="Display an audit report with cost anomalies, stopped EC2 instances, unused EBS volumes, budget alerts, and more",
     )
     parser.add_argument(
-        "--s3-bucket",
-        "-s3",
-        help="S3 bucket to export the report files to",
+        "--profile-timeout",
+        help="Time budget in seconds for each profile; profiles that run out of time are reported as partial",
+        type=positive_float,
+    )
+    parser.add_argument(
+        "--call-timeout",
+        help="Time budget in seconds for each AWS API call (connect and read timeout)",
+        type=positive_float,
+    )
+    parser.add_argument(
+        "--processes",
+        help="Number of worker processes used to fetch profiles in parallel (default: 1, in-process)",
+        type=positive_int,
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print the count, latency percentiles, retries and throttles of the AWS API calls of the run",
+    )
+    parser.add_argument(
+        "--timings-file",
+        help="Save the AWS API call timings of the run, per profile, service, operation and region, to a JSON file",
         type=str,
     )
     parser.add_argument(
-        "--s3-prefix",
-        "-s3p",
-        help="S3 prefix to export the report files to",
+        "--trace-file",
+        help="Save the phases of the run, per process and thread, to a Chrome trace JSON file (chrome://tracing, Perfetto, speedscope)",
         type=str,
     )
     parser.add_argument(
-        "--s3-profile",
-        "-s3s",
-        help="CLI profile to use for S3 uploads",
+        "--plan",
+        help="Print the expected AWS API calls, Cost Explorer spend and wall time of the run, without calling AWS; with --resume, only the profiles left to fetch are counted (all of them with --combine)",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--max-ce-requests",
+        help="Maximum number of billed Cost Explorer requests of the run; once spent, profiles use the cost data cached for them by earlier budgeted runs, or are reported as failed; 0 only uses cached data",
+        type=non_negative_int,
+    )
+    parser.add_argument(
+        "--memory-profile",
+        help="Trace Python memory allocations and print the retained and peak memory, and top allocation sites, of each phase (fetch, table, each export)",
+        action="store_true",
+    )
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument(
+        "--record",
+        help="Record every AWS response of the run to a cassette directory, for --replay",
         type=str,
+        metavar="DIR",
+    )
+    cassette_group.add_argument(
+        "--replay",
+        help="Serve the AWS responses recorded in a cassette directory instead of calling AWS; no credentials or network needed",
+        type=str,
+        metavar="DIR",
     )
     parser.add_argument(
-        "--slack",
-        help="Send reports to Slack channel. Provide channel identifier: --slack #channel-name or --slack C1234567890",
+        "--replay-latency",
+        action="store_true",
+        help="With --replay, wait as long as each call took when it was recorded",
+    )
+    parser.add_argument(
+        "--resume",
+        help="Resume an interrupted run by its run ID, skipping the profiles it already completed",
         type=str,
+        metavar="RUN_ID",
     )
+    parser.add_argument(
+        "--shard",
+        help="Process only shard i of N of the selected profiles (e.g. 2/4) and write a shard output for 'aws-finops merge'",
+        type=parse_shard,
+        metavar="i/N",
+    )
+    parser.add_argument(
+        "--shard-weights",
+        help="JSON file mapping profiles to historical durations in seconds, used to balance --shard",
+        type=str,
+    )
+    add_version_check_argument(parser)
 
     args = parser.parse_args()
 
     config_data: Optional[Dict[str, Any]] = None
     if args.config_file:
+        from aws_finops_dashboard.helpers import load_config_file
+
         config_data = load_config_file(args.config_file)
         if config_data is None:
             return 1  # Exit if config file loading failed
@@ -200,31 +435,54 @@ def main() -> int:
                 )
                 return 1
 
-    # Validate S3 arguments after config file is loaded
-    if args.s3_bucket and args.report_name and not args.s3_profile:
+    # Normalize shard to support config files providing strings
+    if isinstance(args.shard, str):
+        try:
+            args.shard = parse_shard(args.shard)
+        except argparse.ArgumentTypeError as e:
+            console.print(f"[bold red]Error: {str(e)}[/]")
+            return 1
+
+    # Config files bypass the argument types
+    for option, parse in (
+        ("profile_timeout", positive_float),
+        ("call_timeout", positive_float),
+        ("processes", positive_int),
+        ("max_ce_requests", non_negative_int),
+    ):
+        value = getattr(args, option)
+        if value is None:
+            continue
+        try:
+            setattr(args, option, parse(str(value)))
+        except argparse.ArgumentTypeError as e:
+            flag = "--" + option.replace("_", "-")
+            console.print(f"[bold red]Error: {flag} {str(e)}[/]")
+            return 1
+
+    # Validate S3 and Slack arguments after config file is loaded
+    if not validate_export_args(args):
+        return 1
+
+    if args.plan and (args.record or args.replay):
         console.print(
-            "[bold red]Error: --s3-profile is required when --s3-bucket is specified[/]"
+            "[bold red]Error: --plan makes no AWS calls and cannot be used with --record or --replay[/]"
         )
+        return 1
+
+    if args.shard and args.combine:
         console.print(
-            "[yellow]Please specify which AWS profile to use for S3 upload[/]"
+            "[bold red]Error: --shard cannot be used with --combine, profiles of one account could end up in different shards[/]"
         )
         return 1
 
-    # Validate Slack arguments
-    if args.slack:
-        # Check if token is provided via environment variable
-        import os
-        slack_token = os.getenv("SLACK_BOT_TOKEN")
-        if not slack_token:
-            console.print(
-                "[bold red]Error: SLACK_BOT_TOKEN environment variable is required when --slack is used[/]"
-            )
-            console.print(
-                "[yellow]Please set SLACK_BOT_TOKEN environment variable with your Slack bot token[/]"
-            )
-            return 1
+    # Imported once the arguments are valid, so --help and argument errors
+    # never load boto3
+    from aws_finops_dashboard.main import run_dashboard
 
+    version_check = VersionCheck(__version__, args.no_version_check).start()
     result = run_dashboard(args)
+    version_check.notify()
     return 0 if result == 0 else 1
 
 
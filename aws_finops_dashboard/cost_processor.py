@@ -1,19 +1,24 @@
 import csv
-import json
 import os
 from collections import defaultdict
 from datetime import date, datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple, Union
-from io import StringIO
 
 from boto3.session import Session
 from rich.console import Console
 
-from aws_finops_dashboard.aws_client import get_account_id
+from aws_finops_dashboard.aws_client import create_client, get_account_id
+from aws_finops_dashboard.ce_budget import ce_meter
+from aws_finops_dashboard.deadline import ProfileDeadline
+from aws_finops_dashboard.helpers import row_status
 from aws_finops_dashboard.types import BudgetInfo, CostData, EC2Summary, ProfileData
 
 console = Console()
 
+# Cost Explorer requests of get_trend and get_cost_data
+TREND_CE_REQUESTS = 1
+COST_DATA_CE_REQUESTS = 4
+
 
 def get_trend(session: Session, tag: Optional[List[str]] = None) -> Dict[str, Any]:
     """
@@ -23,7 +28,10 @@ def get_trend(session: Session, tag: Optional[List[str]] = None) -> Dict[str, An
         session: The boto3 session to use
         tag: Optional list of tags in "Key=Value" format to filter resources.
 
+    Raises:
+        CostExplorerBudgetExceeded: If the run has no Cost Explorer requests left
     """
+    ce_meter.reserve(TREND_CE_REQUESTS)
     ce = session.client("ce")
     tag_filters: List[Dict[str, Any]] = []
     if tag:
@@ -93,11 +101,70 @@ def get_trend(session: Session, tag: Optional[List[str]] = None) -> Dict[str, An
     }
 
 
+def get_cost_periods(
+    time_range: Optional[Union[int, str]] = None, today: Optional[date] = None
+) -> Tuple[date, date, date, date]:
+    """
+    Return the start and end dates of the current and previous cost periods.
+
+    End dates are exclusive, as Cost Explorer expects them.
+    """
+    today = today or date.today()
+    if time_range == "last-month":
+        # Current period is the previous calendar month
+        end_date = today.replace(day=1)
+        start_date = (end_date - timedelta(days=1)).replace(day=1)
+
+        # Previous period is the month before last
+        previous_period_end = start_date
+        previous_period_start = (start_date - timedelta(days=1)).replace(day=1)
+
+    elif time_range:
+        end_date = today
+        start_date = today - timedelta(days=time_range)
+        previous_period_end = start_date
+        previous_period_start = (start_date - timedelta(days=time_range))
+
+    else:
+        start_date = today.replace(day=1)
+        end_date = today
+
+        # Edge case when user runs the tool on the first day of the month
+        if start_date == end_date:
+            end_date += timedelta(days=1)
+
+        # Last calendar month
+        previous_period_end = start_date
+        previous_period_start = (start_date - timedelta(days=1)).replace(day=1)
+
+    return start_date, end_date, previous_period_start, previous_period_end
+
+
+def get_period_names(time_range: Optional[Union[int, str]] = None) -> Tuple[str, str]:
+    """Return the names of the current and previous cost periods."""
+    if time_range == "last-month":
+        return "Last month's cost", "Prior month's cost"
+    if time_range:
+        return f"Current {time_range} days cost", f"Previous {time_range} days cost"
+    return "Current month's cost", "Last month's cost"
+
+
+def _cost_explorer_client(
+    session: Session, deadline: Optional[ProfileDeadline]
+) -> Any:
+    """Create a Cost Explorer client for the next call, within the deadline."""
+    if deadline is not None:
+        deadline.check("cost data")
+    return create_client(session, "ce", deadline=deadline)
+
+
 def get_cost_data(
     session: Session,
     time_range: Optional[Union[int, str]] = None,
     tag: Optional[List[str]] = None,
     get_trend: bool = False,
+    deadline: Optional[ProfileDeadline] = None,
+    today: Optional[date] = None,
 ) -> CostData:
     """
     Get cost data for an AWS account.
@@ -107,11 +174,16 @@ def get_cost_data(
         time_range: Optional time range in days for cost data (default: current month)
         tag: Optional list of tags in "Key=Value" format to filter resources.
         get_trend: Optional boolean to get trend data for last 6 months (default).
+        deadline: Optional profile deadline, checked before each Cost Explorer call
+        today: Date the periods are resolved from (default: today), so a resumed
+            run queries the periods of the run it resumes
 
+    Raises:
+        CostExplorerBudgetExceeded: If the run has no Cost Explorer requests left
+        ProfileDeadlineExceeded: If the deadline runs out before a Cost Explorer call
     """
-    ce = session.client("ce")
-    budgets = session.client("budgets", region_name="us-east-1")
-    today = date.today()
+    ce_meter.reserve(COST_DATA_CE_REQUESTS)
+    today = today or date.today()
 
     tag_filters: List[Dict[str, Any]] = []
     if tag:
@@ -147,35 +219,13 @@ def get_cost_data(
     if filter_param:
         kwargs["Filter"] = filter_param
 
-    if time_range == "last-month":
-        # Current period is the previous calendar month
-        end_date = today.replace(day=1)
-        start_date = (end_date - timedelta(days=1)).replace(day=1)
-
-        # Previous period is the month before last
-        previous_period_end = start_date
-        previous_period_start = (start_date - timedelta(days=1)).replace(day=1)
-
-    elif time_range:
-        end_date = today
-        start_date = today - timedelta(days=time_range)
-        previous_period_end = start_date
-        previous_period_start = (start_date - timedelta(days=time_range))
-
-    else:
-        start_date = today.replace(day=1)
-        end_date = today
-
-        # Edge case when user runs the tool on the first day of the month
-        if start_date == end_date:
-            end_date += timedelta(days=1)
-
-        # Last calendar month
-        previous_period_end = start_date
-        previous_period_start = (start_date - timedelta(days=1)).replace(day=1)
+    start_date, end_date, previous_period_start, previous_period_end = (
+        get_cost_periods(time_range, today)
+    )
 
-    account_id = get_account_id(session)
+    account_id = get_account_id(session, deadline)
 
+    ce = _cost_explorer_client(session, deadline)
     try:
         this_period = ce.get_cost_and_usage(
             TimePeriod={"Start": start_date.isoformat(), "End": end_date.isoformat()},
@@ -187,6 +237,7 @@ def get_cost_data(
         console.log(f"[yellow]Error getting current period cost: {e}[/]")
         this_period = {"ResultsByTime": [{"Total": {"UnblendedCost": {"Amount": 0}}}]}
 
+    ce = _cost_explorer_client(session, deadline)
     try:
         previous_period = ce.get_cost_and_usage(
             TimePeriod={
@@ -205,6 +256,7 @@ def get_cost_data(
 
     granularity = "DAILY" if isinstance(time_range, int) and time_range else "MONTHLY"
 
+    ce = _cost_explorer_client(session, deadline)
     try:
         current_period_cost_by_service = ce.get_cost_and_usage(
             TimePeriod={"Start": start_date.isoformat(), "End": end_date.isoformat()},
@@ -217,6 +269,7 @@ def get_cost_data(
         console.log(f"[yellow]Error getting current period cost by service: {e}[/]")
         current_period_cost_by_service = {"ResultsByTime": [{"Groups": []}]}
 
+    ce = _cost_explorer_client(session, deadline)
     try:
         previous_period_cost_by_service = ce.get_cost_and_usage(
             TimePeriod={
@@ -259,6 +312,7 @@ def get_cost_data(
 
     budgets_data: List[BudgetInfo] = []
     try:
+        budgets = create_client(session, "budgets", "us-east-1", deadline)
         response = budgets.describe_budgets(AccountId=account_id)
         for budget in response["Budgets"]:
             budgets_data.append(
@@ -287,15 +341,7 @@ def get_cost_data(
         if "Total" in period and "UnblendedCost" in period["Total"]:
             previous_period_cost += float(period["Total"]["UnblendedCost"]["Amount"])
 
-    if time_range == "last-month":
-        current_period_name = "Last month's cost"
-        previous_period_name = "Prior month's cost"
-    elif time_range:
-        current_period_name = f"Current {time_range} days cost"
-        previous_period_name = f"Previous {time_range} days cost"
-    else:
-        current_period_name = "Current month's cost"
-        previous_period_name = "Last month's cost"
+    current_period_name, previous_period_name = get_period_names(time_range)
 
     return {
         "account_id": account_id,
@@ -394,13 +440,15 @@ def export_to_csv(
     export_handler=None,
 ) -> Optional[str]:
     """Export dashboard data to a CSV file or S3."""
-    from aws_finops_dashboard.export_handler import ExportHandler
+    from aws_finops_dashboard.export_handler import ExportHandler, report_export_error
 
     try:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M")
         base_filename = f"{filename}_{timestamp}.csv"
 
-        csv_buffer = StringIO()
+        # Use export handler if provided, otherwise create default
+        if export_handler is None:
+            export_handler = ExportHandler(local_dir=output_dir)
 
         previous_period_header = f"Cost for period\n({previous_period_dates})"
         current_period_header = f"Cost for period\n({current_period_dates})"
@@ -414,61 +462,62 @@ def export_to_csv(
             "Current Period Cost By Service",
             "Budget Status",
             "EC2 Instances",
+            "Status",
         ]
-        writer = csv.DictWriter(csv_buffer, fieldnames=fieldnames)
-        writer.writeheader()
-        for row in data:
-            prev_services_data = "\n".join(
-                [
-                    f"{service}: ${cost:.2f}"
-                    for service, cost in row["previous_service_costs"]
-                ]
-            )
-            services_data = "\n".join(
-                [
-                    f"{service}: ${cost:.2f}"
-                    for service, cost in row["service_costs"]
-                ]
-            )
-
-            budgets_data = (
-                "\n".join(row["budget_info"])
-                if row["budget_info"]
-                else "No budgets"
-            )
-
-            ec2_data_summary = "\n".join(
-                [
-                    f"{state}: {count}"
-                    for state, count in row["ec2_summary"].items()
-                    if count > 0
-                ]
-            )
-
-            writer.writerow(
-                {
-                    "CLI Profile": row["profile"],
-                    "AWS Account ID": row["account_id"],
-                    previous_period_header: f"${row['last_month']:.2f}",
-                    current_period_header: f"${row['current_month']:.2f}",
-                    "Previous Period Cost By Service": prev_services_data or "No costs",
-                    "Current Period Cost By Service": services_data or "No costs",
-                    "Budget Status": budgets_data or "No budgets",
-                    "EC2 Instances": ec2_data_summary or "No instances",
-                }
-            )
-
-        # Use export handler if provided, otherwise create default
-        if export_handler is None:
-            export_handler = ExportHandler(local_dir=output_dir)
-
-        csv_content = csv_buffer.getvalue().encode("utf-8")
-        saved_path = export_handler.save(csv_content, base_filename, "text/csv")
+        # Rows are written to the destination one at a time
+        with export_handler.open_stream(
+            base_filename, "text/csv", encoding="utf-8"
+        ) as stream:
+            writer = csv.DictWriter(stream, fieldnames=fieldnames)
+            writer.writeheader()
+            for row in data:
+                prev_services_data = "\n".join(
+                    [
+                        f"{service}: ${cost:.2f}"
+                        for service, cost in row["previous_service_costs"]
+                    ]
+                )
+                services_data = "\n".join(
+                    [
+                        f"{service}: ${cost:.2f}"
+                        for service, cost in row["service_costs"]
+                    ]
+                )
+
+                budgets_data = (
+                    "\n".join(row["budget_info"])
+                    if row["budget_info"]
+                    else "No budgets"
+                )
+
+                ec2_data_summary = "\n".join(
+                    [
+                        f"{state}: {count}"
+                        for state, count in row["ec2_summary"].items()
+                        if count > 0
+                    ]
+                )
+
+                status = row_status(row)
+
+                writer.writerow(
+                    {
+                        "CLI Profile": row["profile"],
+                        "AWS Account ID": row["account_id"],
+                        previous_period_header: f"${row['last_month']:.2f}",
+                        current_period_header: f"${row['current_month']:.2f}",
+                        "Previous Period Cost By Service": prev_services_data or "No costs",
+                        "Current Period Cost By Service": services_data or "No costs",
+                        "Budget Status": budgets_data or "No budgets",
+                        "EC2 Instances": ec2_data_summary or "No instances",
+                        "Status": status,
+                    }
+                )
 
-        return saved_path
+        return stream.destination
 
     except Exception as e:
-        console.print(f"[bold red]Error exporting to CSV: {str(e)}[/]")
+        report_export_error(export_handler, f"Error exporting to CSV: {str(e)}")
         return None
 
 
@@ -477,24 +526,33 @@ def export_to_json(
     filename: str,
     output_dir: Optional[str] = None,
     export_handler=None,
+    ndjson: bool = False,
 ) -> Optional[str]:
-    """Export dashboard data to a JSON file or S3."""
-    from aws_finops_dashboard.export_handler import ExportHandler
+    """
+    Export dashboard data to a JSON file or S3.
+
+    With ndjson set, the file is newline-delimited JSON with one record per
+    profile, which consumers can parse as a stream.
+    """
+    from aws_finops_dashboard.export_handler import ExportHandler, report_export_error
 
     try:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M")
-        base_filename = f"{filename}_{timestamp}.json"
-
-        json_content = json.dumps(data, indent=4).encode("utf-8")
+        extension = "ndjson" if ndjson else "json"
+        base_filename = f"{filename}_{timestamp}.{extension}"
 
         # Use export handler if provided, otherwise create default
         if export_handler is None:
             export_handler = ExportHandler(local_dir=output_dir)
 
-        saved_path = export_handler.save(json_content, base_filename, "application/json")
+        with export_handler.open_stream(base_filename, encoding="utf-8") as stream:
+            if ndjson:
+                stream.write_ndjson(data)
+            else:
+                stream.write_json(data)
 
-        return saved_path
+        return stream.destination
 
     except Exception as e:
-        console.print(f"[bold red]Error exporting to JSON: {str(e)}[/]")
+        report_export_error(export_handler, f"Error exporting to JSON: {str(e)}")
         return None
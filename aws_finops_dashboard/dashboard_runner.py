@@ -1,16 +1,48 @@
 import argparse
+import functools
+import multiprocessing
 import os
+import time
 from collections import defaultdict
-from typing import Any, Dict, List, Optional, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, timedelta
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
 
-import boto3
+from boto3.session import Session
 from rich import box
 from rich.console import Console
-from rich.progress import track
+from rich.progress import (
+    BarColumn,
+    Progress,
+    ProgressColumn,
+    Task,
+    TaskProgressColumn,
+    TextColumn,
+)
 from rich.status import Status
 from rich.table import Column, Table
+from rich.text import Text
 
+from aws_finops_dashboard.api_metrics import (
+    api_calls,
+    print_api_timings,
+    record_latency_history,
+    write_api_timings,
+)
 from aws_finops_dashboard.aws_client import (
+    create_session,
     get_accessible_regions,
     get_account_id,
     get_aws_profiles,
@@ -20,12 +52,24 @@ from aws_finops_dashboard.aws_client import (
     get_unused_eips,
     get_unused_volumes,
 )
+from aws_finops_dashboard.cassette import CassetteError, cassette
+from aws_finops_dashboard.ce_budget import (
+    CostExplorerBudgetExceeded,
+    attach_worker,
+    ce_meter,
+    load_cached_response,
+    print_ce_usage,
+    save_cached_response,
+)
+from aws_finops_dashboard.checkpoint import JournalError, RunJournal, load_profile_data
 from aws_finops_dashboard.cost_processor import (
     export_to_csv,
     export_to_json,
-    get_cost_data,
+    get_cost_periods,
+    get_period_names,
     get_trend,
 )
+from aws_finops_dashboard.deadline import ProfileDeadline
 from aws_finops_dashboard.helpers import (
     clean_rich_tags,
     export_audit_report_to_pdf,
@@ -33,12 +77,49 @@ from aws_finops_dashboard.helpers import (
     export_audit_report_to_csv,
     export_audit_report_to_json,
     export_trend_data_to_json,
+    row_status,
+)
+from aws_finops_dashboard.export_handler import (
+    ExportHandler,
+    canonical_digest,
+    generate_slack_message,
 )
-from aws_finops_dashboard.export_handler import ExportHandler, generate_slack_message
+from aws_finops_dashboard.export_pipeline import (
+    Exporter,
+    print_export_summary,
+    run_export_pipeline,
+    snapshot,
+)
+from aws_finops_dashboard.memory_profile import memory_profiler, print_memory_profile
+from aws_finops_dashboard.parquet_export import (
+    audit_findings_columns,
+    dashboard_budgets_columns,
+    dashboard_costs_columns,
+    dashboard_ec2_columns,
+    export_table_to_parquet,
+    trend_monthly_costs_columns,
+)
+from aws_finops_dashboard.planner import plan_run, print_plan
 from aws_finops_dashboard.profile_processor import (
-    process_combined_profiles,
-    process_single_profile,
+    error_profile_data,
+    process_profile_group,
+)
+from aws_finops_dashboard.run_stats import (
+    estimate_durations,
+    estimate_wall_time,
+    get_profile_durations,
+    longest_first,
+    record_profile_stats,
 )
+from aws_finops_dashboard.sharding import (
+    ShardError,
+    get_shard_output_path,
+    load_shard_weights,
+    merge_shard_outputs,
+    partition_profiles,
+    write_shard_output,
+)
+from aws_finops_dashboard.tracing import tracer
 from aws_finops_dashboard.types import ProfileData
 from aws_finops_dashboard.visualisations import create_trend_bars
 
@@ -84,10 +165,121 @@ def _initialize_profiles(
     return profiles_to_use, args.regions, args.time_range
 
 
-def _run_audit_report(profiles_to_use: List[str], args: argparse.Namespace) -> None:
-    """Generate and export an audit report."""
-    console.print("[bold bright_cyan]Preparing your audit report...[/]")
-    table = Table(
+def _fetch_audit_data(
+    profile: str,
+    user_regions: Optional[List[str]],
+    profile_timeout: Optional[float] = None,
+    call_timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Fetch the raw audit findings for a single profile.
+
+    Once the profile_timeout budget runs out, the remaining checks skip their
+    regions and the row is marked with the reason it is partial.
+    """
+    deadline = ProfileDeadline(profile_timeout, call_timeout)
+    session = create_session(profile)
+    account_id = get_account_id(session, deadline) or "Unknown"
+    regions = user_regions or get_accessible_regions(session, deadline)
+
+    raw_audit_row: Dict[str, Any] = {"profile": profile, "account_id": account_id}
+    try:
+        raw_audit_row["untagged_resources"] = get_untagged_resources(
+            session, regions, deadline
+        )
+    except Exception as e:
+        raw_audit_row["untagged_resources"] = {}
+        raw_audit_row["untagged_resources_error"] = str(e)
+    raw_audit_row["stopped_instances"] = get_stopped_instances(
+        session, regions, deadline
+    )
+    raw_audit_row["unused_volumes"] = get_unused_volumes(session, regions, deadline)
+    raw_audit_row["unused_eips"] = get_unused_eips(session, regions, deadline)
+    raw_audit_row["budget_alerts"] = (
+        [] if deadline.expired() else get_budgets(session, deadline)
+    )
+    raw_audit_row["partial_reason"] = (
+        f"{deadline.describe()}; audit incomplete" if deadline.expired() else None
+    )
+    return raw_audit_row
+
+
+def _format_audit_row(
+    raw_audit_row: Dict[str, Any],
+) -> Tuple[List[str], Dict[str, str]]:
+    """Format raw audit findings into a table row and a flat export row."""
+    nl = "\n"
+    comma_nl = ",\n"
+
+    untagged = raw_audit_row["untagged_resources"]
+    if raw_audit_row.get("untagged_resources_error"):
+        anomalies = [f"Error: {raw_audit_row['untagged_resources_error']}"]
+    else:
+        anomalies = []
+        for service, region_map in untagged.items():
+            if region_map:
+                service_block = f"[bright_yellow]{service}[/]:\n"
+                for region, ids in region_map.items():
+                    if ids:
+                        ids_block = "\n".join(f"[orange1]{res_id}[/]" for res_id in ids)
+                        service_block += f"\n{region}:\n{ids_block}\n"
+                anomalies.append(service_block)
+        if not any(region_map for region_map in untagged.values()):
+            anomalies = ["None"]
+
+    stopped_list = [
+        f"{r}:\n[gold1]{nl.join(ids)}[/]"
+        for r, ids in raw_audit_row["stopped_instances"].items()
+    ] or ["None"]
+
+    vols_list = [
+        f"{r}:\n[dark_orange]{nl.join(ids)}[/]"
+        for r, ids in raw_audit_row["unused_volumes"].items()
+    ] or ["None"]
+
+    eips_list = [
+        f"{r}:\n{comma_nl.join(ids)}" for r, ids in raw_audit_row["unused_eips"].items()
+    ] or ["None"]
+
+    alerts = []
+    for b in raw_audit_row["budget_alerts"]:
+        if b["actual"] > b["limit"]:
+            alerts.append(
+                f"[red1]{b['name']}[/]: ${b['actual']:.2f} > ${b['limit']:.2f}"
+            )
+    if not alerts:
+        alerts = ["No budgets exceeded"]
+
+    profile_cell = f"[dark_magenta]{raw_audit_row['profile']}[/]"
+    if raw_audit_row.get("partial_reason"):
+        profile_cell += (
+            f"\n\n[bold yellow]⚠ Partial: {raw_audit_row['partial_reason']}[/]"
+        )
+    table_row = [
+        profile_cell,
+        raw_audit_row["account_id"],
+        "\n".join(anomalies),
+        "\n".join(stopped_list),
+        "\n".join(vols_list),
+        "\n".join(eips_list),
+        "\n".join(alerts),
+    ]
+    audit_row = {
+        "profile": raw_audit_row["profile"],
+        "account_id": raw_audit_row["account_id"],
+        "untagged_resources": clean_rich_tags("\n".join(anomalies)),
+        "stopped_instances": clean_rich_tags("\n".join(stopped_list)),
+        "unused_volumes": clean_rich_tags("\n".join(vols_list)),
+        "unused_eips": clean_rich_tags("\n".join(eips_list)),
+        "budget_alerts": clean_rich_tags("\n".join(alerts)),
+        "status": row_status(raw_audit_row),
+    }
+    return table_row, audit_row
+
+
+def create_audit_table() -> Table:
+    """Create and configure the audit report table."""
+    return Table(
         Column("Profile", justify="center"),
         Column("Account ID", justify="center"),
         Column("Untagged Resources"),
@@ -101,186 +293,322 @@ def _run_audit_report(profiles_to_use: List[str], args: argparse.Namespace) -> N
         style="bright_cyan",
     )
 
+
+@tracer.traced("_run_audit_report")
+def _run_audit_report(
+    profiles_to_use: List[str],
+    args: argparse.Namespace,
+    journal: Optional[RunJournal] = None,
+) -> List[Dict[str, Any]]:
+    """Generate and export an audit report, returning the raw audit data."""
+    console.print("[bold bright_cyan]Preparing your audit report...[/]")
+    table = create_audit_table()
+
     audit_data = []
     raw_audit_data = []
-    nl = "\n"
-    comma_nl = ",\n"
 
-    for profile in profiles_to_use:
-        session = boto3.Session(profile_name=profile)
-        account_id = get_account_id(session) or "Unknown"
-        regions = args.regions or get_accessible_regions(session)
+    with memory_profiler.phase("fetch"):
+        for profile in profiles_to_use:
+            raw_audit_row = journal.get(profile) if journal else None
+            if raw_audit_row is None:
+                with tracer.span("fetch_audit_data", profile=profile):
+                    raw_audit_row = _fetch_audit_data(
+                        profile,
+                        args.regions,
+                        args.profile_timeout,
+                        args.call_timeout,
+                    )
+                # Partial rows are fetched again on resume
+                if not raw_audit_row.get("partial_reason"):
+                    _record_journal_entry(journal, profile, raw_audit_row)
+
+            table_row, audit_row = _format_audit_row(raw_audit_row)
+            audit_data.append(audit_row)
+            # Data for JSON which includes raw audit data
+            raw_audit_data.append(raw_audit_row)
+            table.add_row(*table_row)
+
+    with memory_profiler.phase("table"):
+        console.print(table)
+    console.print(
+        "[bold bright_cyan]Note: The dashboard only lists untagged EC2, RDS, Lambda, ELBv2.\n[/]"
+    )
+
+    if not args.shard:
+        _export_audit_reports(audit_data, raw_audit_data, profiles_to_use, args)
+    return raw_audit_data
+
 
+def _create_export_handler(
+    args: argparse.Namespace,
+    report_type: str,
+    profiles: List[str],
+    time_period: Optional[str] = None,
+) -> Optional[ExportHandler]:
+    """
+    Create the export handler for the destination selected on the command line.
+
+    Returns None, after printing the reason, if the destination is unusable.
+    """
+    if args.slack:
+        slack_token = os.getenv("SLACK_BOT_TOKEN")
+        if not slack_token:
+            console.print(
+                "[bold red]Error: SLACK_BOT_TOKEN environment variable not found[/]"
+            )
+            return None
+        console.print(f"[bright_cyan]Sending reports to Slack channel: {args.slack}[/]")
+        slack_msg = generate_slack_message(
+            report_type=report_type,
+            report_name=args.report_name,
+            profiles=profiles,
+            time_period=time_period,
+        )
+        return ExportHandler(
+            slack_token=slack_token,
+            slack_channel=args.slack,
+            slack_message=slack_msg,
+            skip_unchanged=args.skip_unchanged,
+            compression=args.compress,
+            compact_json=args.compact_json,
+        )
+    if args.s3_bucket and args.s3_profile:
         try:
-            untagged = get_untagged_resources(session, regions)
-            anomalies = []
-            for service, region_map in untagged.items():
-                if region_map:
-                    service_block = f"[bright_yellow]{service}[/]:\n"
-                    for region, ids in region_map.items():
-                        if ids:
-                            ids_block = "\n".join(
-                                f"[orange1]{res_id}[/]" for res_id in ids
-                            )
-                            service_block += f"\n{region}:\n{ids_block}\n"
-                    anomalies.append(service_block)
-            if not any(region_map for region_map in untagged.values()):
-                anomalies = ["None"]
+            session = create_session(args.s3_profile)
         except Exception as e:
-            anomalies = [f"Error: {str(e)}"]
-
-        stopped = get_stopped_instances(session, regions)
-        stopped_list = [
-            f"{r}:\n[gold1]{nl.join(ids)}[/]" for r, ids in stopped.items()
-        ] or ["None"]
-
-        unused_vols = get_unused_volumes(session, regions)
-        vols_list = [
-            f"{r}:\n[dark_orange]{nl.join(ids)}[/]" for r, ids in unused_vols.items()
-        ] or ["None"]
-
-        unused_eips = get_unused_eips(session, regions)
-        eips_list = [
-            f"{r}:\n{comma_nl.join(ids)}" for r, ids in unused_eips.items()
-        ] or ["None"]
-
-        budget_data = get_budgets(session)
-        alerts = []
-        for b in budget_data:
-            if b["actual"] > b["limit"]:
-                alerts.append(
-                    f"[red1]{b['name']}[/]: ${b['actual']:.2f} > ${b['limit']:.2f}"
-                )
-        if not alerts:
-            alerts = ["No budgets exceeded"]
-
-        audit_data.append(
-            {
-                "profile": profile,
-                "account_id": account_id,
-                "untagged_resources": clean_rich_tags("\n".join(anomalies)),
-                "stopped_instances": clean_rich_tags("\n".join(stopped_list)),
-                "unused_volumes": clean_rich_tags("\n".join(vols_list)),
-                "unused_eips": clean_rich_tags("\n".join(eips_list)),
-                "budget_alerts": clean_rich_tags("\n".join(alerts)),
-            }
+            console.print(
+                f"[bold red]Error creating session for S3 upload: {str(e)}[/]"
+            )
+            return None
+        console.print(
+            f"[bright_cyan]Using profile '{args.s3_profile}' for S3 upload[/]"
         )
-
-        # Data for JSON which includes raw audit data
-        raw_audit_data.append(
-            {
-                "profile": profile,
-                "account_id": account_id,
-                "untagged_resources": untagged,
-                "stopped_instances": stopped,
-                "unused_volumes": unused_vols,
-                "unused_eips": unused_eips,
-                "budget_alerts": budget_data,
-            }
+        return ExportHandler(
+            s3_bucket=args.s3_bucket,
+            s3_prefix=args.s3_prefix,
+            session=session,
+            s3_part_size=args.s3_part_size * 1024 * 1024 if args.s3_part_size else None,
+            s3_max_concurrency=args.s3_concurrency,
+            s3_checksum_algorithm=args.s3_checksum,
+            skip_unchanged=args.skip_unchanged,
+            s3_layout=args.s3_layout,
+            compression=args.compress,
+            compact_json=args.compact_json,
         )
+    return ExportHandler(
+        local_dir=args.dir,
+        skip_unchanged=args.skip_unchanged,
+        compression=args.compress,
+        compact_json=args.compact_json,
+    )
 
-        table.add_row(
-            f"[dark_magenta]{profile}[/]",
-            account_id,
-            "\n".join(anomalies),
-            "\n".join(stopped_list),
-            "\n".join(vols_list),
-            "\n".join(eips_list),
-            "\n".join(alerts),
-        )
-    console.print(table)
-    console.print(
-        "[bold bright_cyan]Note: The dashboard only lists untagged EC2, RDS, Lambda, ELBv2.\n[/]"
+
+def _run_exports(
+    report_type: str,
+    exporters: List[Tuple[str, Exporter]],
+    export_handler: ExportHandler,
+    report_name: str,
+    digests: Dict[str, str],
+) -> None:
+    """Export all requested formats concurrently and print their outcomes."""
+    try:
+        with Status(
+            f"[bright_cyan]Exporting {report_type} report...",
+            spinner="aesthetic",
+            speed=0.4,
+        ), tracer.span(f"export {report_type}", "export"):
+            outcomes = run_export_pipeline(
+                report_type,
+                exporters,
+                export_handler,
+                report_name=report_name,
+                digests=digests,
+            )
+            manifest_path = export_handler.write_run_manifest(
+                report_name, report_type, outcomes
+            )
+    finally:
+        export_handler.close()
+    print_export_summary(outcomes)
+    if manifest_path:
+        console.print(f"[bright_cyan]Run manifest: {manifest_path}[/]")
+
+
+def _partition_exporter(
+    exporter: Exporter, report_name: str, report_format: str, account_id: str
+) -> Exporter:
+    return lambda handler: exporter(
+        handler.in_partition(report_name, report_format, account_id)
     )
 
-    if args.report_name:  # Ensure report_name is provided for any export
-        # Create export handler
-        export_handler = None
-        if args.slack:
-            # Slack export
-            slack_token = os.getenv("SLACK_BOT_TOKEN")
-            if slack_token:
-                console.print(
-                    f"[bright_cyan]Sending reports to Slack channel: {args.slack}[/]"
-                )
-                # Generate message for audit report
-                slack_msg = generate_slack_message(
-                    report_type="audit",
-                    report_name=args.report_name,
-                    profiles=profiles_to_use,
-                )
-                export_handler = ExportHandler(
-                    slack_token=slack_token,
-                    slack_channel=args.slack,
-                    slack_message=slack_msg,
-                )
-            else:
-                console.print(
-                    "[bold red]Error: SLACK_BOT_TOKEN environment variable not found[/]"
-                )
-                return
-        elif args.s3_bucket and args.s3_profile:
-            try:
-                session = boto3.Session(profile_name=args.s3_profile)
-                console.print(
-                    f"[bright_cyan]Using profile '{args.s3_profile}' for S3 upload[/]"
-                )
-                export_handler = ExportHandler(
-                    s3_bucket=args.s3_bucket,
-                    s3_prefix=args.s3_prefix,
-                    session=session,
-                )
-            except Exception as e:
-                console.print(
-                    f"[bold red]Error creating session for S3 upload: {str(e)}[/]"
+
+def _layout_exporters(
+    export_handler: ExportHandler,
+    report_name: str,
+    accounts: List[Optional[str]],
+    build_exporters: Callable[[List[int]], List[Tuple[str, Exporter]]],
+    digest_rows: Callable[[List[int]], str],
+) -> Tuple[List[Tuple[str, Exporter]], Dict[str, str]]:
+    """
+    Return the exporters of a report for the layout of the export destination,
+    with the digest of the content of each.
+
+    build_exporters returns the exporters of the report rows at the given
+    indexes, and digest_rows the canonical_digest of those rows. With the
+    partitioned S3 layout the rows of each account are exported to the
+    account's own partition, so an unchanged partition is skipped even when
+    others changed; otherwise every format is exported once with all rows.
+
+    Args:
+        export_handler: Destination of the report
+        report_name: Base name of the report
+        accounts: Account ID of each report row
+        build_exporters: Builds the exporters of a subset of the rows
+        digest_rows: Digests the content of a subset of the rows
+    """
+    if not export_handler.partitioned:
+        indexes = list(range(len(accounts)))
+        exporters = build_exporters(indexes)
+        digest = digest_rows(indexes)
+        return exporters, {report_format: digest for report_format, _ in exporters}
+
+    rows_by_account: Dict[str, List[int]] = defaultdict(list)
+    for index, account_id in enumerate(accounts):
+        rows_by_account[account_id or "Unknown"].append(index)
+    exporters = []
+    digests = {}
+    for account_id, indexes in rows_by_account.items():
+        digest = digest_rows(indexes)
+        for report_format, exporter in build_exporters(indexes):
+            label = f"{report_format} ({account_id})"
+            exporters.append(
+                (
+                    label,
+                    _partition_exporter(
+                        exporter, report_name, report_format, account_id
+                    ),
                 )
-                return
-        else:
-            export_handler = ExportHandler(local_dir=args.dir)
-
-        if args.report_type:
-            for report_type in args.report_type:
-                if report_type == "csv":
-                    csv_path = export_audit_report_to_csv(
-                        audit_data, args.report_name,
-                        path=args.dir if not args.s3_bucket and not args.slack else None,
-                        export_handler=export_handler,
-                    )
-                    if csv_path and not args.s3_bucket and not args.slack:
-                        console.print(
-                            f"[bright_green]Successfully exported to CSV format: {csv_path}[/]"
-                        )
-                elif report_type == "json":
-                    json_path = export_audit_report_to_json(
-                        raw_audit_data, args.report_name,
-                        path=args.dir if not args.s3_bucket and not args.slack else None,
-                        export_handler=export_handler,
-                    )
-                    if json_path and not args.s3_bucket and not args.slack:
-                        console.print(
-                            f"[bright_green]Successfully exported to JSON format: {json_path}[/]"
-                        )
-                elif report_type == "pdf":
-                    pdf_path = export_audit_report_to_pdf(
-                        audit_data, args.report_name,
-                        path=args.dir if not args.s3_bucket and not args.slack else None,
-                        export_handler=export_handler,
-                    )
-                    if pdf_path and not args.s3_bucket and not args.slack:
-                        console.print(
-                            f"[bright_green]Successfully exported to PDF format: {pdf_path}[/]"
-                        )
-                
-
-def _run_trend_analysis(profiles_to_use: List[str], args: argparse.Namespace) -> None:
-    """Analyze and display cost trends."""
+            )
+            digests[label] = digest
+    return exporters, digests
+
+
+def _parquet_exporters(
+    tables: Dict[str, Callable[[], Dict[str, List[Any]]]], report_name: str
+) -> List[Tuple[str, Exporter]]:
+    """Return one exporter per Parquet table of a report."""
+
+    def table_exporter(
+        table: str, build_columns: Callable[[], Dict[str, List[Any]]]
+    ) -> Exporter:
+        return lambda handler: export_table_to_parquet(
+            table, build_columns, report_name, export_handler=handler
+        )
+
+    return [
+        (f"parquet:{table}", table_exporter(table, build_columns))
+        for table, build_columns in tables.items()
+    ]
+
+
+def _export_audit_reports(
+    audit_data: List[Dict[str, str]],
+    raw_audit_data: List[Dict[str, Any]],
+    profiles_to_use: List[str],
+    args: argparse.Namespace,
+) -> None:
+    """Export the audit report to the specified formats."""
+    if not args.report_name or not args.report_type:
+        return
+    export_handler = _create_export_handler(args, "audit", profiles_to_use)
+    if export_handler is None:
+        return
+
+    audit_data, raw_audit_data = snapshot((audit_data, raw_audit_data))
+
+    def build_exporters(indexes: List[int]) -> List[Tuple[str, Exporter]]:
+        rows = [audit_data[i] for i in indexes]
+        raw_rows = [raw_audit_data[i] for i in indexes]
+        report_exporters = {
+            "csv": lambda handler: export_audit_report_to_csv(
+                rows, args.report_name, export_handler=handler
+            ),
+            "json": lambda handler: export_audit_report_to_json(
+                raw_rows, args.report_name, export_handler=handler
+            ),
+            "ndjson": lambda handler: export_audit_report_to_json(
+                raw_rows, args.report_name, export_handler=handler, ndjson=True
+            ),
+            "pdf": lambda handler: export_audit_report_to_pdf(
+                rows, args.report_name, export_handler=handler
+            ),
+        }
+        exporters = [
+            (report_format, report_exporters[report_format])
+            for report_format in args.report_type
+            if report_format in report_exporters
+        ]
+        if "parquet" in args.report_type:
+            exporters += _parquet_exporters(
+                {"findings": lambda: audit_findings_columns(raw_rows)},
+                args.report_name,
+            )
+        return exporters
+
+    exporters, digests = _layout_exporters(
+        export_handler,
+        args.report_name,
+        [row.get("account_id") for row in raw_audit_data],
+        build_exporters,
+        lambda indexes: canonical_digest(
+            [raw_audit_data[i] for i in indexes],
+            table=[audit_data[i] for i in indexes],
+        ),
+    )
+    _run_exports("audit", exporters, export_handler, args.report_name, digests)
+
+
+def _fetch_trend(
+    session: Session, profile: str, tag: Optional[List[str]]
+) -> Dict[str, Any]:
+    """
+    Fetch the cost trend of a profile within the Cost Explorer request budget.
+
+    With --max-ce-requests, the trend of each profile is cached, and once the
+    budget is spent the trend last cached for the profile, by this or an
+    earlier run, is used instead; without one, the trend is empty.
+    """
+    params = [sorted(tag or [])]
+    try:
+        cost_data = get_trend(session, tag)
+    except CostExplorerBudgetExceeded as e:
+        cached = load_cached_response("trend", profile, params)
+        if cached is None:
+            console.print(f"[yellow]{str(e)}; trend of {profile} not fetched[/]")
+            return {"monthly_costs": [], "account_id": None, "profile": profile}
+        console.print(
+            f"[yellow]{str(e)}; trend of {profile} cached on {cached['saved']}[/]"
+        )
+        return cast(Dict[str, Any], cached["data"])
+    if ce_meter.max_requests is not None and cost_data.get("monthly_costs"):
+        save_cached_response("trend", profile, params, cost_data)
+    return cost_data
+
+
+@tracer.traced("_run_trend_analysis")
+def _run_trend_analysis(
+    profiles_to_use: List[str],
+    args: argparse.Namespace,
+    journal: Optional[RunJournal] = None,
+) -> List[Dict[str, Any]]:
+    """Analyze and display cost trends, returning the raw trend data."""
     console.print("[bold bright_cyan]Analysing cost trends...[/]")
     raw_trend_data = []
     if args.combine:
         account_profiles = defaultdict(list)
         for profile in profiles_to_use:
             try:
-                session = boto3.Session(profile_name=profile)
+                session = create_session(profile)
                 account_id = get_account_id(session)
                 if account_id:
                     account_profiles[account_id].append(profile)
@@ -291,9 +619,14 @@ def _run_trend_analysis(profiles_to_use: List[str], args: argparse.Namespace) ->
 
         for account_id, profiles in account_profiles.items():
             try:
-                primary_profile = profiles[0]
-                session = boto3.Session(profile_name=primary_profile)
-                cost_data = get_trend(session, args.tag)
+                cost_data = journal.get(account_id) if journal else None
+                if cost_data is None:
+                    primary_profile = profiles[0]
+                    with memory_profiler.phase("fetch"):
+                        session = create_session(primary_profile)
+                        cost_data = _fetch_trend(session, primary_profile, args.tag)
+                    if cost_data.get("monthly_costs"):
+                        _record_journal_entry(journal, account_id, cost_data)
                 trend_data = cost_data.get("monthly_costs")
 
                 if not trend_data:
@@ -307,7 +640,8 @@ def _run_trend_analysis(profiles_to_use: List[str], args: argparse.Namespace) ->
                     f"\n[bright_yellow]Account: {account_id} (Profiles: {profile_list})[/]"
                 )
                 raw_trend_data.append(cost_data)
-                create_trend_bars(trend_data)
+                with memory_profiler.phase("table"):
+                    create_trend_bars(trend_data)
             except Exception as e:
                 console.print(
                     f"[red]Error getting trend for account {account_id}: {str(e)}[/]"
@@ -316,8 +650,13 @@ def _run_trend_analysis(profiles_to_use: List[str], args: argparse.Namespace) ->
     else:
         for profile in profiles_to_use:
             try:
-                session = boto3.Session(profile_name=profile)
-                cost_data = get_trend(session, args.tag)
+                cost_data = journal.get(profile) if journal else None
+                if cost_data is None:
+                    with memory_profiler.phase("fetch"):
+                        session = create_session(profile)
+                        cost_data = _fetch_trend(session, profile, args.tag)
+                    if cost_data.get("monthly_costs"):
+                        _record_journal_entry(journal, profile, cost_data)
                 trend_data = cost_data.get("monthly_costs")
                 account_id = cost_data.get("account_id", "Unknown")
 
@@ -331,93 +670,96 @@ def _run_trend_analysis(profiles_to_use: List[str], args: argparse.Namespace) ->
                     f"\n[bright_yellow]Account: {account_id} (Profile: {profile})[/]"
                 )
                 raw_trend_data.append(cost_data)
-                create_trend_bars(trend_data)
+                with memory_profiler.phase("table"):
+                    create_trend_bars(trend_data)
             except Exception as e:
                 console.print(
                     f"[red]Error getting trend for profile {profile}: {str(e)}[/]"
                 )
 
-    if raw_trend_data and args.report_name and args.report_type:
-        # Create export handler
-        export_handler = None
-        if args.slack:
-            # Slack export
-            slack_token = os.getenv("SLACK_BOT_TOKEN")
-            if slack_token:
-                console.print(
-                    f"[bright_cyan]Sending reports to Slack channel: {args.slack}[/]"
-                )
-                # Generate message for trend report
-                slack_msg = generate_slack_message(
-                    report_type="trend",
-                    report_name=args.report_name,
-                    profiles=profiles_to_use,
-                )
-                export_handler = ExportHandler(
-                    slack_token=slack_token,
-                    slack_channel=args.slack,
-                    slack_message=slack_msg,
-                )
-            else:
-                console.print(
-                    "[bold red]Error: SLACK_BOT_TOKEN environment variable not found[/]"
-                )
-                return
-        elif args.s3_bucket and args.s3_profile:
-            try:
-                session = boto3.Session(profile_name=args.s3_profile)
-                console.print(
-                    f"[bright_cyan]Using profile '{args.s3_profile}' for S3 upload[/]"
-                )
-                export_handler = ExportHandler(
-                    s3_bucket=args.s3_bucket,
-                    s3_prefix=args.s3_prefix,
-                    session=session,
-                )
-            except Exception as e:
-                console.print(
-                    f"[bold red]Error creating session for S3 upload: {str(e)}[/]"
-                )
-                return
-        else:
-            export_handler = ExportHandler(local_dir=args.dir)
+    if not args.shard:
+        _export_trend_reports(raw_trend_data, profiles_to_use, args)
+    return raw_trend_data
+
+
+def _export_trend_reports(
+    raw_trend_data: List[Dict[str, Any]],
+    profiles_to_use: List[str],
+    args: argparse.Namespace,
+) -> None:
+    """Export trend data to the specified formats."""
+    if not raw_trend_data or not args.report_name or not args.report_type:
+        return
+    # Trends are only exported as data, not as tables or documents
+    if not {"json", "ndjson", "parquet"} & set(args.report_type):
+        return
+    export_handler = _create_export_handler(args, "trend", profiles_to_use)
+    if export_handler is None:
+        return
+
+    raw_trend_data = snapshot(raw_trend_data)
 
-        if "json" in args.report_type:
-            json_path = export_trend_data_to_json(
-                raw_trend_data, args.report_name,
-                path=args.dir if not args.s3_bucket and not args.slack else None,
-                export_handler=export_handler,
+    def build_exporters(indexes: List[int]) -> List[Tuple[str, Exporter]]:
+        rows = [raw_trend_data[i] for i in indexes]
+        report_exporters = {
+            "json": lambda handler: export_trend_data_to_json(
+                rows, args.report_name, export_handler=handler
+            ),
+            "ndjson": lambda handler: export_trend_data_to_json(
+                rows, args.report_name, export_handler=handler, ndjson=True
+            ),
+        }
+        exporters = [
+            (report_format, report_exporters[report_format])
+            for report_format in args.report_type
+            if report_format in report_exporters
+        ]
+        if "parquet" in args.report_type:
+            exporters += _parquet_exporters(
+                {"monthly_costs": lambda: trend_monthly_costs_columns(rows)},
+                args.report_name,
             )
-            if json_path and not args.s3_bucket and not args.slack:
-                console.print(
-                    f"[bright_green]Successfully exported trend data to JSON format: {json_path}[/]"
-                )
+        return exporters
+
+    exporters, digests = _layout_exporters(
+        export_handler,
+        args.report_name,
+        [row.get("account_id") for row in raw_trend_data],
+        build_exporters,
+        lambda indexes: canonical_digest([raw_trend_data[i] for i in indexes]),
+    )
+    _run_exports("trend", exporters, export_handler, args.report_name, digests)
 
 
 def _get_display_table_period_info(
-    profiles_to_use: List[str], time_range: Optional[Union[int, str]]
+    profiles_to_use: List[str],
+    time_range: Optional[Union[int, str]],
+    report_date: Optional[date] = None,
 ) -> Tuple[str, str, str, str]:
-    """Get period information for the display table."""
+    """
+    Get period information for the display table.
+
+    The periods are computed locally, the way get_cost_data queries them, so
+    naming the table columns costs no Cost Explorer request.
+    """
     if profiles_to_use:
-        try:
-            sample_session = boto3.Session(profile_name=profiles_to_use[0])
-            sample_cost_data = get_cost_data(sample_session, time_range)
-            previous_period_name = sample_cost_data.get(
-                "previous_period_name", "Last Month Due"
-            )
-            current_period_name = sample_cost_data.get(
-                "current_period_name", "Current Month Cost"
-            )
-            previous_period_dates = f"{sample_cost_data['previous_period_start']} to {sample_cost_data['previous_period_end']}"
-            current_period_dates = f"{sample_cost_data['current_period_start']} to {sample_cost_data['current_period_end']}"
-            return (
-                previous_period_name,
-                current_period_name,
-                previous_period_dates,
-                current_period_dates,
-            )
-        except Exception:
-            pass  # Fall through to default values
+        start_date, end_date, previous_start, previous_end = get_cost_periods(
+            time_range, report_date
+        )
+        current_period_name, previous_period_name = get_period_names(time_range)
+        last_day = timedelta(days=1)
+        previous_period_dates = (
+            f"{previous_start.isoformat()} to {(previous_end - last_day).isoformat()}"
+        )
+        current_period_dates = (
+            f"{start_date.isoformat()} to {(end_date - last_day).isoformat()}"
+        )
+        return (
+            previous_period_name,
+            current_period_name,
+            previous_period_dates,
+            current_period_dates,
+        )
     return "Last Month Due", "Current Month Cost", "N/A", "N/A"
 
 
@@ -470,8 +812,14 @@ def add_profile_to_table(table: Table, profile_data: ProfileData) -> None:
             f"[bold red]${profile_data['current_month']:.2f}[/]{change_text}"
         )
 
+        profile_text = f"[bright_magenta]Profile: {profile_data['profile']}\nAccount: {profile_data['account_id']}[/]"
+        if profile_data.get("partial"):
+            profile_text += (
+                f"\n\n[bold yellow]⚠ Partial: {profile_data['partial_reason']}[/]"
+            )
+
         table.add_row(
-            f"[bright_magenta]Profile: {profile_data['profile']}\nAccount: {profile_data['account_id']}[/]",
+            profile_text,
             f"[bold red]${profile_data['last_month']:.2f}[/]",
             current_month_with_change,
             "[bright_green]"
@@ -495,20 +843,161 @@ def add_profile_to_table(table: Table, profile_data: ProfileData) -> None:
         )
 
 
+class HistoricalETAColumn(ProgressColumn):
+    """
+    Time remaining, estimated from the recorded durations of the pending rows.
+
+    The estimate is refreshed each time a row completes and counts down in
+    between. Without any history it falls back to the rate of completed rows.
+    """
+
+    max_refresh = 0.5
+
+    def render(self, task: Task) -> Text:
+        estimate = task.fields.get("eta")
+        if estimate is not None:
+            remaining = max(estimate - (time.monotonic() - task.fields["eta_at"]), 0)
+        else:
+            remaining = task.time_remaining
+        if remaining is None:
+            return Text("-:--:--", style="progress.remaining")
+        return Text(str(timedelta(seconds=int(remaining))), style="progress.remaining")
+
+
+def _process_group_in_worker(
+    process_group: Callable[[str, List[str]], Tuple[ProfileData, Dict[str, float]]],
+    record_calls: bool,
+    trace: bool,
+    cassette_state: Optional[Tuple[str, str, bool]],
+    key: str,
+    profiles: List[str],
+) -> Tuple[
+    Tuple[ProfileData, Dict[str, float]], List[Dict[str, Any]], List[Dict[str, Any]]
+]:
+    """
+    Process a row in a worker process.
+
+    Returns the row, the API calls and the spans it recorded, if requested.
+    """
+    if record_calls:
+        api_calls.enable()
+    if trace:
+        tracer.enable(f"worker {os.getpid()}")
+    if cassette_state is not None:
+        cassette.start(*cassette_state)
+    result = process_group(key, profiles)
+    return result, api_calls.drain(), tracer.drain()
+
+
+def _fetch_profile_groups(
+    process_group: Callable[[str, List[str]], Tuple[ProfileData, Dict[str, float]]],
+    groups: List[Tuple[str, List[str]]],
+    processes: Optional[int],
+    total: int,
+    durations: Optional[Dict[str, float]] = None,
+) -> Iterator[Tuple[str, ProfileData, Dict[str, float]]]:
+    """
+    Process dashboard rows, yielding (key, data, phase timings) as each completes.
+
+    Rows are processed one after another in this process, or by a pool of
+    worker processes when more than one process is requested. Workers use the
+    spawn start method so they never inherit locks held by the progress display.
+    Rows are started in the order given; the progress bar shows an ETA based on
+    the historical durations of the rows still pending.
+    """
+    parallel = bool(processes and processes > 1 and len(groups) > 1)
+    workers = min(processes or 1, len(groups)) if parallel else 1
+    expected = dict(
+        zip(
+            [key for key, _ in groups],
+            estimate_durations([key for key, _ in groups], durations or {}),
+        )
+    )
+    pending = dict(expected)
+
+    progress = Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TaskProgressColumn(),
+        HistoricalETAColumn(),
+        console=console,
+    )
+    with progress:
+        task_id = progress.add_task(
+            "[bright_cyan]Fetching cost data...",
+            total=total,
+            completed=total - len(groups),
+            eta=estimate_wall_time(list(pending.values()), workers),
+            eta_at=time.monotonic(),
+        )
+
+        def advance(key: str) -> None:
+            pending.pop(key, None)
+            progress.update(
+                task_id,
+                advance=1,
+                eta=estimate_wall_time(list(pending.values()), workers),
+                eta_at=time.monotonic(),
+            )
+
+        if not parallel:
+            for key, profiles in groups:
+                profile_data, timings = process_group(key, profiles)
+                advance(key)
+                yield key, profile_data, timings
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            # Workers count their Cost Explorer requests against the run budget
+            initializer=attach_worker,
+            initargs=ce_meter.share(),
+        ) as executor:
+            # Workers record their API calls and spans themselves and send
+            # them back with each row
+            futures = {
+                executor.submit(
+                    _process_group_in_worker,
+                    process_group,
+                    api_calls.enabled,
+                    tracer.enabled,
+                    cassette.state,
+                    key,
+                    profiles,
+                ): (key, profiles)
+                for key, profiles in groups
+            }
+            for future in as_completed(futures):
+                key, profiles = futures[future]
+                advance(key)
+                try:
+                    (profile_data, timings), calls, spans = future.result()
+                    api_calls.merge(calls)
+                    tracer.merge(spans)
+                except Exception as e:
+                    profile_data = error_profile_data(", ".join(profiles), str(e))
+                    timings = {}
+                yield key, profile_data, timings
+
+
+@tracer.traced("_generate_dashboard_data")
 def _generate_dashboard_data(
     profiles_to_use: List[str],
     user_regions: Optional[List[str]],
     time_range: Optional[Union[int, str]],
     args: argparse.Namespace,
     table: Table,
+    journal: Optional[RunJournal] = None,
+    report_date: Optional[date] = None,
 ) -> List[ProfileData]:
     """Fetch, process, and prepare the main dashboard data."""
-    export_data: List[ProfileData] = []
+    groups: List[Tuple[str, List[str]]]
     if args.combine:
         account_profiles = defaultdict(list)
         for profile in profiles_to_use:
             try:
-                session = boto3.Session(profile_name=profile)
+                session = create_session(profile)
                 current_account_id = get_account_id(
                     session
                 )  # Renamed to avoid conflict
@@ -522,31 +1011,53 @@ def _generate_dashboard_data(
                 console.log(
                     f"[bold red]Error checking account ID for profile {profile}: {str(e)}[/]"
                 )
-
-        for account_id_key, profiles_list in track(  # Renamed loop variables
-            account_profiles.items(), description="[bright_cyan]Fetching cost data..."
-        ):
-            # account_id_key here is known to be a string because it's a key from account_profiles
-            # where None keys were filtered out when populating it.
-            if len(profiles_list) > 1:
-                profile_data = process_combined_profiles(
-                    account_id_key, profiles_list, user_regions, time_range, args.tag
-                )
-            else:
-                profile_data = process_single_profile(
-                    profiles_list[0], user_regions, time_range, args.tag
-                )
-            export_data.append(profile_data)
-            add_profile_to_table(table, profile_data)
+        groups = list(account_profiles.items())
     else:
-        for profile in track(
-            profiles_to_use, description="[bright_cyan]Fetching cost data..."
-        ):
-            profile_data = process_single_profile(
-                profile, user_regions, time_range, args.tag
-            )
-            export_data.append(profile_data)
-            add_profile_to_table(table, profile_data)
+        groups = [(profile, [profile]) for profile in profiles_to_use]
+
+    # Rows completed by the run being resumed are read back from the journal
+    results: Dict[str, ProfileData] = {}
+    pending_groups = []
+    for key, profiles in groups:
+        entry = journal.get(key) if journal else None
+        if entry is not None:
+            results[key] = load_profile_data(entry)
+        else:
+            pending_groups.append((key, profiles))
+
+    # The slowest profiles of previous runs are started first
+    durations = get_profile_durations()
+    pending_groups = longest_first(pending_groups, durations)
+
+    process_group = functools.partial(
+        process_profile_group,
+        user_regions=user_regions,
+        time_range=time_range,
+        tag=args.tag,
+        profile_timeout=args.profile_timeout,
+        call_timeout=args.call_timeout,
+        report_date=report_date,
+    )
+    run_timings: Dict[str, Dict[str, float]] = {}
+    for key, profile_data, timings in _fetch_profile_groups(
+        process_group, pending_groups, args.processes, len(groups), durations
+    ):
+        results[key] = profile_data
+        # Only complete results are journaled and timed, failed and partial
+        # rows are retried and their durations are not representative
+        if profile_data["success"] and not profile_data["partial"]:
+            run_timings[key] = timings
+            _record_journal_entry(journal, key, dict(profile_data))
+
+    try:
+        record_profile_stats(run_timings)
+    except OSError as e:
+        console.log(f"[yellow]Warning: Could not save profile statistics: {str(e)}[/]")
+
+    export_data: List[ProfileData] = []
+    for key, _ in groups:
+        export_data.append(results[key])
+        add_profile_to_table(table, results[key])
     return export_data
 
 
@@ -557,123 +1068,359 @@ def _export_dashboard_reports(
     current_period_dates: str,
 ) -> None:
     """Export dashboard data to specified formats."""
-    if args.report_name and args.report_type:
-        # Create export handler
-        export_handler = None
-        if args.slack:
-            # Slack export
-            slack_token = os.getenv("SLACK_BOT_TOKEN")
-            if slack_token:
-                console.print(
-                    f"[bright_cyan]Sending reports to Slack channel: {args.slack}[/]"
-                )
-                # Extract profiles from export_data (handle both single and combined profiles)
-                all_profiles = []
-                for data in export_data:
-                    profile_str = data["profile"]
-                    # Split comma-separated profiles (for combined profiles)
-                    profiles = [p.strip() for p in profile_str.split(",")]
-                    all_profiles.extend(profiles)
-                profiles_list = list(set(all_profiles))
-                # Format time period
-                time_period_str = f"{previous_period_dates} → {current_period_dates}"
-                # Generate message for dashboard report
-                slack_msg = generate_slack_message(
-                    report_type="dashboard",
-                    report_name=args.report_name,
-                    profiles=profiles_list,
-                    time_period=time_period_str,
-                )
-                export_handler = ExportHandler(
-                    slack_token=slack_token,
-                    slack_channel=args.slack,
-                    slack_message=slack_msg,
-                )
-            else:
-                console.print(
-                    "[bold red]Error: SLACK_BOT_TOKEN environment variable not found[/]"
-                )
-                return
-        elif args.s3_bucket and args.s3_profile:
-            try:
-                session = boto3.Session(profile_name=args.s3_profile)
-                console.print(
-                    f"[bright_cyan]Using profile '{args.s3_profile}' for S3 upload[/]"
-                )
-                export_handler = ExportHandler(
-                    s3_bucket=args.s3_bucket,
-                    s3_prefix=args.s3_prefix,
-                    session=session,
-                )
-            except Exception as e:
-                console.print(
-                    f"[bold red]Error creating session for S3 upload: {str(e)}[/]"
-                )
-                return
-        else:
-            export_handler = ExportHandler(local_dir=args.dir)
-
-        for report_type in args.report_type:
-            if report_type == "csv":
-                csv_path = export_to_csv(
-                    export_data,
-                    args.report_name,
-                    output_dir=args.dir if not args.s3_bucket and not args.slack else None,
-                    previous_period_dates=previous_period_dates,
-                    current_period_dates=current_period_dates,
-                    export_handler=export_handler,
-                )
-                if csv_path and not args.s3_bucket and not args.slack:
-                    console.print(
-                        f"[bright_green]Successfully exported to CSV format: {csv_path}[/]"
-                    )
-            elif report_type == "json":
-                json_path = export_to_json(
-                    export_data, args.report_name,
-                    output_dir=args.dir if not args.s3_bucket and not args.slack else None,
-                    export_handler=export_handler,
-                )
-                if json_path and not args.s3_bucket and not args.slack:
-                    console.print(
-                        f"[bright_green]Successfully exported to JSON format: {json_path}[/]"
-                    )
-            elif report_type == "pdf":
-                pdf_path = export_cost_dashboard_to_pdf(
-                    export_data,
-                    args.report_name,
-                    output_dir=args.dir if not args.s3_bucket and not args.slack else None,
-                    previous_period_dates=previous_period_dates,
-                    current_period_dates=current_period_dates,
-                    export_handler=export_handler,
-                )
-                if pdf_path and not args.s3_bucket and not args.slack:
-                    console.print(
-                        f"[bright_green]Successfully exported to PDF format: {pdf_path}[/]"
-                    )
+    if not args.report_name or not args.report_type:
+        return
+    # Split comma-separated profiles (for combined profiles)
+    profiles_list = list(
+        {
+            profile.strip()
+            for data in export_data
+            for profile in data["profile"].split(",")
+        }
+    )
+    export_handler = _create_export_handler(
+        args,
+        "dashboard",
+        profiles_list,
+        time_period=f"{previous_period_dates} → {current_period_dates}",
+    )
+    if export_handler is None:
+        return
+
+    export_data = snapshot(export_data)
+
+    def build_exporters(indexes: List[int]) -> List[Tuple[str, Exporter]]:
+        rows = [export_data[i] for i in indexes]
+        report_exporters = {
+            "csv": lambda handler: export_to_csv(
+                rows,
+                args.report_name,
+                previous_period_dates=previous_period_dates,
+                current_period_dates=current_period_dates,
+                export_handler=handler,
+            ),
+            "json": lambda handler: export_to_json(
+                rows, args.report_name, export_handler=handler
+            ),
+            "ndjson": lambda handler: export_to_json(
+                rows, args.report_name, export_handler=handler, ndjson=True
+            ),
+            "pdf": lambda handler: export_cost_dashboard_to_pdf(
+                rows,
+                args.report_name,
+                previous_period_dates=previous_period_dates,
+                current_period_dates=current_period_dates,
+                export_handler=handler,
+            ),
+        }
+        exporters = [
+            (report_format, report_exporters[report_format])
+            for report_format in args.report_type
+            if report_format in report_exporters
+        ]
+        if "parquet" in args.report_type:
+            exporters += _parquet_exporters(
+                {
+                    "costs": lambda: dashboard_costs_columns(
+                        rows, previous_period_dates, current_period_dates
+                    ),
+                    "ec2": lambda: dashboard_ec2_columns(rows),
+                    "budgets": lambda: dashboard_budgets_columns(rows),
+                },
+                args.report_name,
+            )
+        return exporters
+
+    exporters, digests = _layout_exporters(
+        export_handler,
+        args.report_name,
+        [row["account_id"] for row in export_data],
+        build_exporters,
+        lambda indexes: canonical_digest(
+            [export_data[i] for i in indexes],
+            previous_period_dates=previous_period_dates,
+            current_period_dates=current_period_dates,
+        ),
+    )
+    _run_exports("dashboard", exporters, export_handler, args.report_name, digests)
+
+
+def _get_run_mode(args: argparse.Namespace) -> str:
+    """Return the type of run requested: dashboard, audit or trend."""
+    return "audit" if args.audit else "trend" if args.trend else "dashboard"
+
+
+def _select_shard_profiles(
+    profiles_to_use: List[str], args: argparse.Namespace
+) -> List[str]:
+    """Return the profiles of the shard given with --shard."""
+    index, count = args.shard
+    durations = load_shard_weights(args.shard_weights) if args.shard_weights else None
+    shard_profiles = partition_profiles(profiles_to_use, index, count, durations)
+    console.print(
+        f"[bright_cyan]Shard {index}/{count}: processing {len(shard_profiles)} of {len(profiles_to_use)} profiles[/]"
+    )
+    return shard_profiles
+
+
+def _write_shard_output(
+    args: argparse.Namespace,
+    all_profiles: List[str],
+    records: Sequence[Mapping[str, Any]],
+    values: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Write the records produced by this shard for the merge command."""
+    positions = {profile: order for order, profile in enumerate(all_profiles)}
+    path = write_shard_output(
+        get_shard_output_path(args.dir, args.report_name, args.shard),
+        _get_run_mode(args),
+        args.shard,
+        all_profiles,
+        [(positions[record["profile"]], record) for record in records],
+        values,
+        _journal_params(args, all_profiles),
+    )
+    console.print(f"[bright_green]Shard output written to: {path}[/]")
+    console.print(
+        "[bright_cyan]Combine all shard outputs with: aws-finops merge <files...>[/]"
+    )
+
+
+def _record_journal_entry(
+    journal: Optional[RunJournal], key: str, data: Dict[str, Any]
+) -> None:
+    """Journal a finished entry; an entry that cannot be written is refetched."""
+    if journal is None:
+        return
+    try:
+        journal.record(key, data)
+    except OSError as e:
+        console.log(
+            f"[yellow]Warning: Could not journal {key}, it will be fetched again on resume: {str(e)}[/]"
+        )
+
+
+def _mark_journal_completed(journal: Optional[RunJournal]) -> None:
+    """Mark the run as completed; failing to do so must not fail the run."""
+    if journal is None:
+        return
+    try:
+        journal.mark_completed()
+    except OSError as e:
+        console.log(
+            f"[yellow]Warning: Could not mark run {journal.run_id} as completed: {str(e)}[/]"
+        )
+
+
+def _journal_report_date(journal: Optional[RunJournal]) -> date:
+    """
+    Return the date the reporting periods of the run are resolved from.
+
+    The date a run started is stored in its journal, so resuming it, even
+    after a month boundary, fetches the pending rows for the same periods as
+    the rows it already completed.
+    """
+    today = date.today()
+    if journal is None:
+        return today
+    stored = journal.get_value("report_date")
+    if stored is not None:
+        return date.fromisoformat(stored)
+    try:
+        journal.set_value("report_date", today.isoformat())
+    except OSError as e:
+        console.log(
+            f"[yellow]Warning: Could not journal the report date, a resumed run will use its own: {str(e)}[/]"
+        )
+    return today
+
+
+def _journal_params(
+    args: argparse.Namespace, profiles_to_use: List[str]
+) -> Dict[str, Any]:
+    """Return the options a resumed run must share with the run it resumes."""
+    return {
+        "profiles": profiles_to_use,
+        "regions": args.regions,
+        "combine": args.combine,
+        "time_range": args.time_range,
+        "tag": args.tag,
+    }
+
+
+def _open_run_journal(
+    args: argparse.Namespace, profiles_to_use: List[str]
+) -> Optional[RunJournal]:
+    """Start a new run journal, or reopen the one given with --resume."""
+    mode = _get_run_mode(args)
+    params = _journal_params(args, profiles_to_use)
+    if args.resume:
+        journal = RunJournal.resume(args.resume, mode, params)
+        console.print(f"[bright_cyan]Resuming run {journal.run_id}[/]")
+        return journal
+
+    try:
+        journal = RunJournal.create(mode, params)
+    except OSError as e:
+        console.print(
+            f"[yellow]Warning: Could not create run journal, this run cannot be resumed: {str(e)}[/]"
+        )
+        return None
+    console.print(
+        f"[bright_cyan]Run ID: {journal.run_id} (resume an interrupted run with --resume {journal.run_id})[/]"
+    )
+    return journal
 
 
 def run_dashboard(args: argparse.Namespace) -> int:
     """Main function to run the AWS FinOps dashboard."""
+    if getattr(args, "plan", False):
+        return _run_plan(args)
+    timings_file = getattr(args, "timings_file", None)
+    if getattr(args, "timings", False) or timings_file:
+        api_calls.enable()
+    trace_file = getattr(args, "trace_file", None)
+    if trace_file:
+        tracer.enable()
+    if getattr(args, "memory_profile", False):
+        memory_profiler.enable()
+    ce_meter.start(getattr(args, "max_ce_requests", None))
+    try:
+        if getattr(args, "record", None):
+            cassette.start("record", args.record)
+            console.print(f"[bright_cyan]Recording AWS responses to {args.record}[/]")
+        elif getattr(args, "replay", None):
+            replay_latency = getattr(args, "replay_latency", False)
+            cassette.start("replay", args.replay, replay_latency)
+            console.print(
+                f"[bright_cyan]Replaying AWS responses from {args.replay}[/]"
+            )
+    except CassetteError as e:
+        console.print(f"[bold red]Error: {str(e)}[/]")
+        return 1
+    with tracer.span("run_dashboard", mode=_get_run_mode(args)):
+        result = _run_dashboard(args)
+    cassette.close()
+    print_ce_usage(replaying=cassette.replaying)
+    if getattr(args, "timings", False) or timings_file:
+        _report_api_timings(getattr(args, "timings", False), timings_file)
+    if api_calls.enabled and not cassette.replaying:
+        # Kept for the estimates of --plan; replayed calls take no time and
+        # would skew the history
+        try:
+            record_latency_history(api_calls.snapshot())
+        except OSError as e:
+            console.log(f"[yellow]Warning: Could not save API latencies: {str(e)}[/]")
+    if trace_file:
+        try:
+            tracer.write(trace_file)
+            console.print(
+                f"[bright_green]Trace saved to {os.path.abspath(trace_file)}[/]"
+            )
+        except OSError as e:
+            console.print(f"[bold red]Error saving trace: {str(e)}[/]")
+    if memory_profiler.enabled:
+        print_memory_profile(memory_profiler.report())
+    return result
+
+
+def _run_plan(args: argparse.Namespace) -> int:
+    """Print the expected calls, spend and duration of the run, without AWS calls."""
+    profiles_to_use, user_regions, _ = _initialize_profiles(args)
+    if args.shard:
+        try:
+            profiles_to_use = _select_shard_profiles(profiles_to_use, args)
+        except ShardError as e:
+            console.print(f"[bold red]Error: {str(e)}[/]")
+            return 1
+    completed = 0
+    if args.resume:
+        mode = _get_run_mode(args)
+        try:
+            journal = RunJournal.resume(
+                args.resume, mode, _journal_params(args, profiles_to_use)
+            )
+        except JournalError as e:
+            console.print(f"[bold red]Error: {str(e)}[/]")
+            return 1
+        # Combined rows are journaled by account ID, unknown without AWS calls
+        if not (args.combine and mode != "audit"):
+            remaining = [p for p in profiles_to_use if journal.get(p) is None]
+            completed = len(profiles_to_use) - len(remaining)
+            profiles_to_use = remaining
+    plan = plan_run(
+        _get_run_mode(args),
+        profiles_to_use,
+        user_regions,
+        combine=args.combine,
+        processes=args.processes,
+        completed=completed,
+    )
+    print_plan(plan, getattr(args, "max_ce_requests", None))
+    return 0
+
+
+def _report_api_timings(show: bool, timings_file: Optional[str]) -> None:
+    """Print and/or save the AWS API calls recorded during the run."""
+    records = api_calls.snapshot()
+    if show:
+        print_api_timings(records)
+    if timings_file:
+        try:
+            write_api_timings(records, timings_file)
+            console.print(
+                f"[bright_green]API call timings saved to {os.path.abspath(timings_file)}[/]"
+            )
+        except OSError as e:
+            console.print(f"[bold red]Error saving API call timings: {str(e)}[/]")
+
+
+def _run_dashboard(args: argparse.Namespace) -> int:
     with Status("[bright_cyan]Initialising...", spinner="aesthetic", speed=0.4):
         profiles_to_use, user_regions, time_range = _initialize_profiles(args)
 
+    all_profiles = profiles_to_use
+    if args.shard:
+        try:
+            profiles_to_use = _select_shard_profiles(all_profiles, args)
+        except ShardError as e:
+            console.print(f"[bold red]Error: {str(e)}[/]")
+            return 1
+
+    try:
+        journal = _open_run_journal(args, profiles_to_use)
+    except JournalError as e:
+        console.print(f"[bold red]Error: {str(e)}[/]")
+        return 1
+
     if args.audit:
-        _run_audit_report(profiles_to_use, args)
+        raw_audit_data = _run_audit_report(profiles_to_use, args, journal)
+        if args.shard:
+            _write_shard_output(args, all_profiles, raw_audit_data)
+        if journal:
+            _mark_journal_completed(journal)
         return 0
 
     if args.trend:
-        _run_trend_analysis(profiles_to_use, args)
+        raw_trend_data = _run_trend_analysis(profiles_to_use, args, journal)
+        if args.shard:
+            _write_shard_output(args, all_profiles, raw_trend_data)
+        _mark_journal_completed(journal)
         return 0
 
     with Status(
         "[bright_cyan]Initialising dashboard...", spinner="aesthetic", speed=0.4
     ):
+        report_date = _journal_report_date(journal)
+        period_info = _get_display_table_period_info(
+            profiles_to_use, time_range, report_date
+        )
         (
             previous_period_name,
             current_period_name,
             previous_period_dates,
             current_period_dates,
-        ) = _get_display_table_period_info(profiles_to_use, time_range)
+        ) = period_info
 
         table = create_display_table(
             previous_period_dates,
@@ -682,12 +1429,78 @@ def run_dashboard(args: argparse.Namespace) -> int:
             current_period_name,
         )
 
-    export_data = _generate_dashboard_data(
-        profiles_to_use, user_regions, time_range, args, table
-    )
-    console.print(table)
-    _export_dashboard_reports(
-        export_data, args, previous_period_dates, current_period_dates
+    with memory_profiler.phase("fetch"):
+        export_data = _generate_dashboard_data(
+            profiles_to_use,
+            user_regions,
+            time_range,
+            args,
+            table,
+            journal,
+            report_date,
+        )
+    with memory_profiler.phase("table"):
+        console.print(table)
+    if args.shard:
+        _write_shard_output(
+            args, all_profiles, export_data, {"period_info": list(period_info)}
+        )
+    else:
+        _export_dashboard_reports(
+            export_data, args, previous_period_dates, current_period_dates
+        )
+    _mark_journal_completed(journal)
+
+    return 0
+
+
+def run_merge(args: argparse.Namespace) -> int:
+    """Merge the outputs of sharded runs and export them as a single report."""
+    try:
+        mode, records, values = merge_shard_outputs(args.shard_files)
+    except ShardError as e:
+        console.print(f"[bold red]Error: {str(e)}[/]")
+        return 1
+
+    profiles = [record["profile"] for record in records]
+    console.print(
+        f"[bright_cyan]Merged {len(args.shard_files)} shard outputs: {len(records)} {mode} records[/]"
     )
 
+    if mode == "audit":
+        table = create_audit_table()
+        audit_data = []
+        for raw_audit_row in records:
+            table_row, audit_row = _format_audit_row(raw_audit_row)
+            audit_data.append(audit_row)
+            table.add_row(*table_row)
+        console.print(table)
+        _export_audit_reports(audit_data, records, profiles, args)
+    elif mode == "trend":
+        for cost_data in records:
+            console.print(
+                f"\n[bright_yellow]Account: {cost_data.get('account_id', 'Unknown')} (Profile: {cost_data['profile']})[/]"
+            )
+            create_trend_bars(cost_data["monthly_costs"])
+        _export_trend_reports(records, profiles, args)
+    else:
+        (
+            previous_period_name,
+            current_period_name,
+            previous_period_dates,
+            current_period_dates,
+        ) = values["period_info"]
+        table = create_display_table(
+            previous_period_dates,
+            current_period_dates,
+            previous_period_name,
+            current_period_name,
+        )
+        export_data = [load_profile_data(record) for record in records]
+        for profile_data in export_data:
+            add_profile_to_table(table, profile_data)
+        console.print(table)
+        _export_dashboard_reports(
+            export_data, args, previous_period_dates, current_period_dates
+        )
     return 0
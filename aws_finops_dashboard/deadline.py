@@ -0,0 +1,91 @@
+"""Time budgets for processing a single AWS profile."""
+
+import time
+from typing import Optional
+
+from botocore.config import Config
+
+# Attempts of a call, first one included, of botocore's default retry mode
+DEFAULT_MAX_ATTEMPTS = 5
+
+
+class ProfileDeadlineExceeded(Exception):
+    """Raised when the time budget of a profile runs out before an AWS call."""
+
+
+class ProfileDeadline:
+    """
+    Tracks the time budget of one profile and bounds the AWS calls made for it.
+
+    The profile budget is checked before each phase, region and Cost Explorer
+    call, while the call budget is enforced by botocore through the
+    connect/read timeouts and retry count of the clients created with
+    client_config(). Each call timeout is capped
+    by the time left on the profile budget, and retries by the number of call
+    timeouts that still fit in it, so a single slow call cannot overrun it.
+    Clients are created just before their calls, so they get the budget left
+    at that time.
+    """
+
+    def __init__(
+        self,
+        profile_timeout: Optional[float] = None,
+        call_timeout: Optional[float] = None,
+    ):
+        """
+        Initialize the deadline.
+
+        Args:
+            profile_timeout: Seconds allowed for the whole profile (None for no limit)
+            call_timeout: Seconds allowed for a single AWS API call (None for botocore default)
+        """
+        self.profile_timeout = profile_timeout
+        self.call_timeout = call_timeout
+        self.expires_at = (
+            time.monotonic() + profile_timeout if profile_timeout else None
+        )
+
+    def remaining(self) -> Optional[float]:
+        """Return the seconds left on the profile budget, or None if unlimited."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """Return True once the profile budget has run out."""
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def client_config(self) -> Optional[Config]:
+        """Build the botocore client config for the current call budget."""
+        remaining = self.remaining()
+        timeouts = [t for t in (self.call_timeout, remaining) if t is not None]
+        if not timeouts:
+            return None
+        # botocore rejects a zero timeout, keep a small floor once the budget is spent
+        timeout = max(min(timeouts), 1.0)
+        if remaining is None:
+            return Config(connect_timeout=timeout, read_timeout=timeout)
+        # Only the attempts that can still time out within the profile budget
+        attempts = max(1, min(DEFAULT_MAX_ATTEMPTS, int(remaining // timeout)))
+        return Config(
+            connect_timeout=timeout,
+            read_timeout=timeout,
+            retries={"total_max_attempts": attempts},
+        )
+
+    def check(self, what: str) -> None:
+        """
+        Raise if the profile budget has run out before the given step.
+
+        Raises:
+            ProfileDeadlineExceeded: If the budget has run out
+        """
+        if self.expired():
+            raise ProfileDeadlineExceeded(f"{self.describe()}; {what} not fetched")
+
+    def describe(self) -> str:
+        """Describe the exhausted budget for partial-result messages."""
+        if self.profile_timeout:
+            return f"time budget of {self.profile_timeout:g}s exceeded"
+        return "time budget exceeded"
@@ -1,16 +1,48 @@
 """Export handler for managing export destinations (local file, S3, or Slack)."""
+import copy
+import hashlib
+import io
+import json
 import os
+import queue
+import re
+import tempfile
+import threading
+import zlib
 from datetime import datetime
-from typing import Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Union,
+)
 
-from boto3.session import Session
-from botocore.exceptions import ClientError
 from rich.console import Console
 
-from aws_finops_dashboard.helpers import upload_to_s3
+from aws_finops_dashboard.state import atomic_write_json, get_state_dir
+
+# boto3 is only imported once something is exported to S3 (or the S3 export
+# manifest is read), as importing it is a noticeable part of CLI startup
+if TYPE_CHECKING:
+    from boto3.session import Session
+
 
 console = Console()
 
+DEFAULT_S3_PART_SIZE = 8 * 1024 * 1024
+DEFAULT_S3_MAX_CONCURRENCY = 10
+S3_CHECKSUM_ALGORITHMS = ["CRC32", "CRC32C", "SHA1", "SHA256"]
+S3_LAYOUTS = ["flat", "partitioned"]
+EXPORT_COMPRESSIONS = ["gzip", "zstd"]
+COMPRESSION_EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+# PDF and Parquet files are compressed internally and are never compressed again
+COMPRESSIBLE_CONTENT_TYPES = ["text/csv", "application/json", "application/x-ndjson"]
+EXPORT_MANIFEST_NAME = "export_manifest.json"
+
 
 def generate_slack_message(
     report_type: str,
@@ -65,6 +97,276 @@ def generate_slack_message(
     return message
 
 
+def report_export_error(export_handler: Optional["ExportHandler"], message: str) -> None:
+    """Print an export error, or record it on a quiet export handler."""
+    if export_handler is not None and export_handler.quiet:
+        export_handler.errors.append(message)
+    else:
+        console.print(f"[bold red]{message}[/]")
+
+
+def get_export_manifest_path() -> str:
+    """Return the path of the local manifest of published local and Slack exports."""
+    return os.path.join(get_state_dir(), EXPORT_MANIFEST_NAME)
+
+
+def canonical_digest(data: Any, **context: Any) -> str:
+    """
+    Return a digest of report data that only changes when the report does.
+
+    The data and context (such as the reporting period) are serialized as
+    canonical JSON; generation timestamps and file names are not part of it.
+    """
+    document = json.dumps(
+        {"data": data, "context": context},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(document.encode("utf-8")).hexdigest()
+
+
+def _partition_value(value: str) -> str:
+    """Make a value safe to use in a Hive-style name=value partition."""
+    return re.sub(r"[^A-Za-z0-9._-]", "_", str(value)) or "unknown"
+
+
+def _detect_content_type(filename: str) -> Optional[str]:
+    """Return the MIME type of an export file from its extension."""
+    if filename.endswith(".pdf"):
+        return "application/pdf"
+    if filename.endswith(".csv"):
+        return "text/csv"
+    if filename.endswith(".json"):
+        return "application/json"
+    if filename.endswith(".ndjson"):
+        return "application/x-ndjson"
+    return None
+
+
+def _load_orjson() -> Any:
+    """Return the optional orjson module, or None if it is not installed."""
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+
+class _UploadPipe:
+    """
+    Bounded pipe between an export stream and a transfer manager upload.
+
+    The export writes into the pipe while the transfer manager reads from it
+    on its own thread, uploading parts as they fill up. Writes block while the
+    pipe is full, so memory use is bounded by the pipe and the parts in flight.
+    """
+
+    def __init__(self, max_chunks: int = 64):
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=max_chunks)
+        self._pending = b""
+        self._eof = False
+        self._aborted = False
+        self.future: Any = None
+
+    def read(self, size: int = -1) -> bytes:
+        """Reader side, called by the transfer manager."""
+        chunks = [self._pending]
+        length = len(self._pending)
+        while not self._eof and (size < 0 or length < size):
+            chunk = self._queue.get()
+            if chunk is None:
+                self._eof = True
+                if self._aborted:
+                    raise IOError("Export aborted")
+                break
+            chunks.append(chunk)
+            length += len(chunk)
+        data = b"".join(chunks)
+        if size < 0:
+            self._pending = b""
+            return data
+        self._pending = data[size:]
+        return data[:size]
+
+    def put(self, data: bytes) -> None:
+        """Writer side; raises the upload error if the upload has failed."""
+        while True:
+            try:
+                self._queue.put(data, timeout=0.1)
+                return
+            except queue.Full:
+                if self.future is not None and self.future.done():
+                    self.future.result()
+                    raise IOError("Upload finished before all data was written")
+
+    def close(self) -> None:
+        """Signal the end of the data."""
+        self.put(None)  # type: ignore[arg-type]
+
+    def abort(self) -> None:
+        """Make the upload fail, so the transfer manager aborts it."""
+        self._aborted = True
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._queue.put(None)
+
+
+class _PipeWriter(io.RawIOBase):
+    """Binary sink writing into an upload pipe."""
+
+    def __init__(self, pipe: _UploadPipe):
+        super().__init__()
+        self.pipe = pipe
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self.pipe.put(bytes(data))
+        return len(data)
+
+
+def _new_compressor(compression: str) -> Any:
+    """
+    Return a streaming compressor with compress() and flush() methods.
+
+    zstd requires the optional zstandard package.
+    """
+    if compression == "gzip":
+        # wbits=31 writes a gzip header, with no file name or timestamp
+        return zlib.compressobj(6, zlib.DEFLATED, 31)
+    if compression == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=3).compressobj()
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+class _CompressingWriter(io.RawIOBase):
+    """Binary sink compressing the data written to it before passing it on."""
+
+    def __init__(self, sink: Any, compressor: Any):
+        super().__init__()
+        self._sink = sink
+        self._compressor = compressor
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        compressed = self._compressor.compress(bytes(data))
+        if compressed:
+            self._sink.write(compressed)
+        return len(data)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            self._sink.write(self._compressor.flush())
+        finally:
+            self._sink.close()
+            super().close()
+
+
+_COMPACT_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+
+class ExportStream:
+    """
+    Writable stream for one export artifact, returned by ExportHandler.open_stream.
+
+    Data is passed on to the destination as it is written instead of being
+    collected in memory first. The artifact is saved when the ``with`` block
+    exits, after which ``destination`` holds its local path, S3 URI or Slack
+    file ID (None if saving failed). If the block raises, the partial artifact
+    is discarded.
+    """
+
+    def __init__(
+        self,
+        sink: io.IOBase,
+        finish: Callable[[], Optional[str]],
+        abort: Callable[[], None],
+        encoding: Optional[str] = None,
+        compact_json: bool = False,
+    ):
+        self._sink = sink
+        self._finish = finish
+        self._abort = abort
+        self.file: Any = sink
+        if encoding:
+            if not isinstance(sink, io.BufferedIOBase):
+                sink = io.BufferedWriter(sink)  # type: ignore[arg-type]
+            # newline="" writes line endings exactly as given (csv needs this)
+            self.file = io.TextIOWrapper(sink, encoding=encoding, newline="")
+        self.compact_json = compact_json
+        self.destination: Optional[str] = None
+
+    def write(self, data: Union[str, bytes, memoryview]) -> int:
+        written: int = self.file.write(data)
+        return written
+
+    def write_json(self, data: Any) -> None:
+        """
+        Encode data as JSON piece by piece, as json.dumps would.
+
+        The JSON is indented by 4 spaces, or written without any whitespace
+        when the stream is compact. Compact JSON is encoded with orjson when
+        it is installed; it cannot indent by 4 spaces.
+        """
+        if self.compact_json:
+            self._write_compact_json(data)
+            return
+        for chunk in json.JSONEncoder(indent=4).iterencode(data):
+            self.file.write(chunk)
+
+    def write_ndjson(self, records: Iterable[Any]) -> None:
+        """Write each record as one line of compact JSON (newline-delimited JSON)."""
+        for record in records:
+            self._write_compact_json(record)
+            self._write_bytes(b"\n")
+
+    def _write_compact_json(self, data: Any) -> None:
+        orjson = _load_orjson()
+        if orjson is not None:
+            try:
+                self._write_bytes(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+                return
+            except TypeError:
+                # Types orjson does not handle (e.g. integers over 64 bits)
+                pass
+        for chunk in _COMPACT_ENCODER.iterencode(data):
+            self.file.write(chunk)
+
+    def _write_bytes(self, data: bytes) -> None:
+        if isinstance(self.file, io.TextIOWrapper):
+            # Pass encoded JSON straight to the binary layer, after pending text
+            self.file.flush()
+            self.file.buffer.write(data)
+        else:
+            self.file.write(data)
+
+    def __enter__(self) -> "ExportStream":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:  # type: ignore[no-untyped-def]
+        try:
+            self.file.close()
+        except Exception:
+            if exc_type is None:
+                self._abort()
+                raise
+        if exc_type is not None:
+            self._abort()
+            return
+        self.destination = self._finish()
+
+
 class ExportHandler:
     """Handles export destination (local file, S3, or Slack)."""
 
@@ -72,11 +374,19 @@ class ExportHandler:
         self,
         s3_bucket: Optional[str] = None,
         s3_prefix: Optional[str] = None,
-        session: Optional[Session] = None,
+        session: Optional["Session"] = None,
         local_dir: Optional[str] = None,
         slack_token: Optional[str] = None,
         slack_channel: Optional[str] = None,
         slack_message: Optional[str] = None,
+        quiet: bool = False,
+        s3_part_size: Optional[int] = None,
+        s3_max_concurrency: Optional[int] = None,
+        s3_checksum_algorithm: Optional[str] = None,
+        skip_unchanged: bool = False,
+        s3_layout: str = "flat",
+        compression: Optional[str] = None,
+        compact_json: bool = False,
     ):
         """
         Initialize export handler.
@@ -89,6 +399,18 @@ class ExportHandler:
             slack_token: Slack bot token for Slack exports
             slack_channel: Slack channel/user identifier for Slack exports
             slack_message: Message to include with Slack file upload
+            quiet: Record errors in self.errors instead of printing them
+            s3_part_size: Part size in bytes for multipart S3 uploads
+            s3_max_concurrency: Number of parts uploaded to S3 in parallel
+            s3_checksum_algorithm: Checksum S3 verifies each upload with
+                (CRC32, CRC32C, SHA1 or SHA256)
+            skip_unchanged: Skip exports whose report content is identical to
+                the last one published to this destination
+            s3_layout: "flat" writes every file under the S3 prefix; "partitioned"
+                writes Hive-style report=/format=/date=/account= partitions
+            compression: Compress CSV and JSON exports with gzip or zstd while
+                they are written
+            compact_json: Write JSON without indentation or whitespace
         """
         self.s3_bucket = s3_bucket
         self.s3_prefix = s3_prefix
@@ -99,6 +421,268 @@ class ExportHandler:
         self.slack_message = slack_message
         self.use_slack = bool(slack_token and slack_channel)
         self.use_s3 = bool(s3_bucket and session)
+        self.quiet = quiet
+        self.errors: List[str] = []
+        self.s3_part_size = s3_part_size or DEFAULT_S3_PART_SIZE
+        self.s3_max_concurrency = s3_max_concurrency or DEFAULT_S3_MAX_CONCURRENCY
+        self.s3_checksum_algorithm = s3_checksum_algorithm
+        self.skip_unchanged = skip_unchanged
+        self.s3_layout = s3_layout
+        self.compression = compression
+        self.compact_json = compact_json
+        self.partition: Optional[Dict[str, str]] = None
+        # All files of a run share one date partition and part name
+        self.run_started = datetime.now()
+        # Clients and the export manifest are shared with the handlers
+        # returned by for_artifact()
+        self._shared: Dict[str, Any] = {}
+        self._shared_lock = threading.RLock()
+
+    def for_artifact(self) -> "ExportHandler":
+        """
+        Return a quiet handler for exporting one artifact.
+
+        It saves to the same destination and shares this handler's clients, but
+        collects its own errors, so concurrent exports can each report theirs.
+        """
+        handler = copy.copy(self)
+        handler.quiet = True
+        handler.errors = []
+        return handler
+
+    @property
+    def partitioned(self) -> bool:
+        """Whether files are written to Hive-style partitions on S3."""
+        return self.use_s3 and self.s3_layout == "partitioned"
+
+    def in_partition(
+        self, report_name: str, report_format: str, account_id: str
+    ) -> "ExportHandler":
+        """
+        Write the files of this handler to the partition of one account.
+
+        Only applies with the partitioned S3 layout; the handler is returned so
+        the call can be chained.
+        """
+        self.partition = {
+            "report": report_name,
+            "format": report_format.replace(":", "_"),
+            "date": self.run_started.strftime("%Y-%m-%d"),
+            "account": account_id,
+        }
+        return self
+
+    def _partition_prefix(self, partition: Dict[str, str]) -> str:
+        """Return the S3 prefix of a Hive-style partition."""
+        path = "/".join(
+            f"{name}={_partition_value(value)}" for name, value in partition.items()
+        )
+        return f"{self.s3_prefix}/{path}" if self.s3_prefix else path
+
+    def write_run_manifest(
+        self, report_name: str, report_type: str, outcomes: List[Any]
+    ) -> Optional[str]:
+        """
+        Write the manifest of a partitioned run listing every file it exported.
+
+        It is stored under report=<name>/_manifests/, which query engines skip
+        as it starts with an underscore.
+        """
+        if not self.partitioned:
+            return None
+        prefix = self._partition_prefix({"report": report_name})
+        key = (
+            f"{prefix}/_manifests/date={self.run_started:%Y-%m-%d}/"
+            f"run-{self.run_started:%H%M%S}-{report_type}.json"
+        ).lstrip("/")
+        manifest = {
+            "report_name": report_name,
+            "report_type": report_type,
+            "generated": self.run_started.isoformat(timespec="seconds"),
+            "artifacts": outcomes,
+        }
+        try:
+            self._get_transfer_manager().client.put_object(
+                Bucket=self.s3_bucket,
+                Key=key,
+                Body=json.dumps(manifest, indent=2, default=str).encode("utf-8"),
+                ContentType="application/json",
+            )
+        except Exception as e:
+            report_export_error(self, f"Error saving run manifest: {str(e)}")
+            return None
+        return f"s3://{self.s3_bucket}/{key}"
+
+    def _get_transfer_manager(self) -> Any:
+        """
+        Return the S3 transfer manager of the handler, creating it on first use.
+
+        The manager and its client live as long as the handler and are shared by
+        all uploads, which are split into parts uploaded in parallel, each
+        retried on its own.
+        """
+        if self.session is None:
+            raise ValueError(f"No AWS session to upload to s3://{self.s3_bucket}")
+        # boto3 sessions are not thread-safe, clients are: create it only once
+        with self._shared_lock:
+            if "s3_transfer" not in self._shared:
+                from boto3.s3.transfer import TransferConfig, create_transfer_manager
+
+                config = TransferConfig(
+                    multipart_threshold=self.s3_part_size,
+                    multipart_chunksize=self.s3_part_size,
+                    max_concurrency=self.s3_max_concurrency,
+                    preferred_transfer_client="classic",
+                )
+                self._shared["s3_transfer"] = create_transfer_manager(
+                    self.session.client("s3"), config
+                )
+            return self._shared["s3_transfer"]
+
+    def close(self) -> None:
+        """
+        Save the export manifest, if it changed, wait for pending uploads and
+        release the S3 transfer manager.
+        """
+        try:
+            self._save_manifest()
+        finally:
+            with self._shared_lock:
+                manager = self._shared.pop("s3_transfer", None)
+            if manager is not None:
+                manager.shutdown()
+
+    def _manifest_key(self) -> str:
+        """Return the S3 key of the export manifest kept next to the reports."""
+        key = EXPORT_MANIFEST_NAME
+        if self.s3_prefix:
+            key = f"{self.s3_prefix}/{key}"
+        return key.lstrip("/")
+
+    def _manifest_scope(self) -> str:
+        """Identify the destination in the local manifest shared by all destinations."""
+        if self.use_slack:
+            return f"slack:{self.slack_channel}"
+        return f"local:{os.path.abspath(self.local_dir or '.')}"
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        """
+        Return the manifest of the artifacts last published to the destination.
+
+        S3 exports keep it in the bucket next to the reports, so every host
+        publishing there shares it; local and Slack exports keep it in the state
+        directory. Must be called with the shared lock held.
+        """
+        from botocore.exceptions import ClientError
+
+        if "manifest" in self._shared:
+            return self._shared["manifest"]
+        manifest: Dict[str, Any] = {}
+        try:
+            if self.use_s3:
+                response = self._get_transfer_manager().client.get_object(
+                    Bucket=self.s3_bucket, Key=self._manifest_key()
+                )
+                manifest = json.loads(response["Body"].read())
+            else:
+                with open(get_export_manifest_path(), encoding="utf-8") as f:
+                    manifest = json.load(f).get(self._manifest_scope(), {})
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") not in ("NoSuchKey", "404"):
+                report_export_error(self, f"Error reading export manifest: {str(e)}")
+        except (OSError, ValueError):
+            pass
+        self._shared["manifest"] = manifest if isinstance(manifest, dict) else {}
+        self._shared["manifest_changed"] = False
+        return self._shared["manifest"]
+
+    def _output_digest(self, digest: str) -> str:
+        """Combine a content digest with the options that change the exported bytes."""
+        if not self.compression and not self.compact_json:
+            return digest
+        return canonical_digest(
+            digest, compression=self.compression, compact_json=self.compact_json
+        )
+
+    def find_published(self, artifact: str, digest: str) -> Optional[str]:
+        """
+        Return where an artifact with this content digest was last published.
+
+        Returns None unless skip_unchanged is set and the last published version
+        of the artifact (e.g. "report.csv") has the same digest.
+        """
+        if not self.skip_unchanged:
+            return None
+        with self._shared_lock:
+            entry = self._load_manifest().get(artifact)
+        if entry and entry.get("digest") == self._output_digest(digest):
+            return entry.get("destination")
+        return None
+
+    def record_published(self, artifact: str, digest: str, destination: str) -> None:
+        """Record the content digest of an artifact that was just published."""
+        if not self.skip_unchanged:
+            return
+        with self._shared_lock:
+            self._load_manifest()[artifact] = {
+                "digest": self._output_digest(digest),
+                "destination": destination,
+                "published": datetime.now().isoformat(timespec="seconds"),
+            }
+            self._shared["manifest_changed"] = True
+
+    def _save_manifest(self) -> None:
+        with self._shared_lock:
+            if not self._shared.get("manifest_changed"):
+                return
+            manifest = self._shared["manifest"]
+            self._shared["manifest_changed"] = False
+        try:
+            if self.use_s3:
+                self._get_transfer_manager().client.put_object(
+                    Bucket=self.s3_bucket,
+                    Key=self._manifest_key(),
+                    Body=json.dumps(manifest, indent=2).encode("utf-8"),
+                    ContentType="application/json",
+                )
+            else:
+                path = get_export_manifest_path()
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        manifests = json.load(f)
+                except (OSError, ValueError):
+                    manifests = {}
+                manifests[self._manifest_scope()] = manifest
+                atomic_write_json(path, manifests)
+        except Exception as e:
+            report_export_error(self, f"Error saving export manifest: {str(e)}")
+
+    def _s3_upload_args(
+        self,
+        filename: str,
+        content_type: Optional[str],
+        content_encoding: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Return the S3 key and extra upload arguments of an export file."""
+        if self.partitioned and self.partition:
+            base, extension = os.path.splitext(filename)
+            if content_encoding:
+                # Keep the format extension in front of .gz / .zst
+                extension = os.path.splitext(base)[1] + extension
+            s3_key = (
+                f"{self._partition_prefix(self.partition)}/"
+                f"part-{self.run_started:%H%M%S}{extension}"
+            )
+        else:
+            s3_key = f"{self.s3_prefix}/{filename}" if self.s3_prefix else filename
+        extra_args = {}
+        if content_type:
+            extra_args["ContentType"] = content_type
+        if content_encoding:
+            extra_args["ContentEncoding"] = content_encoding
+        if self.s3_checksum_algorithm:
+            extra_args["ChecksumAlgorithm"] = self.s3_checksum_algorithm
+        return {"key": s3_key.lstrip("/"), "extra_args": extra_args}
 
     def save(
         self,
@@ -124,47 +708,144 @@ class ExportHandler:
         else:
             return self._save_to_local(content, filename)
 
+    def open_stream(
+        self,
+        filename: str,
+        content_type: Optional[str] = None,
+        encoding: Optional[str] = None,
+    ) -> ExportStream:
+        """
+        Open a stream that writes an artifact incrementally to the destination.
+
+        Local exports are written straight to the output file, S3 exports are
+        uploaded as a multipart upload while they are written, and Slack
+        exports are spooled to a temporary file that is uploaded when the
+        stream is finished. Memory use does not grow with the artifact size.
+
+        With compression set, CSV and JSON artifacts are compressed as they are
+        written: the filename gets a .gz or .zst extension and S3 objects get
+        the matching Content-Encoding.
+
+        Args:
+            filename: Base filename (will have timestamp added)
+            content_type: MIME type (auto-detected if not provided)
+            encoding: Text encoding; when given the stream accepts str, else bytes
+
+        Returns:
+            An ExportStream, to be used as a context manager
+        """
+        content_type = content_type or _detect_content_type(filename)
+        compressor = None
+        content_encoding = None
+        if self.compression and content_type in COMPRESSIBLE_CONTENT_TYPES:
+            # Created before anything is opened, so a missing package fails early
+            compressor = _new_compressor(self.compression)
+            content_encoding = self.compression
+            filename += COMPRESSION_EXTENSIONS[self.compression]
+
+        def stream(
+            sink: Any, finish: Callable[[], Optional[str]], abort: Callable[[], None]
+        ) -> ExportStream:
+            if compressor is not None:
+                sink = _CompressingWriter(sink, compressor)
+            return ExportStream(sink, finish, abort, encoding, self.compact_json)
+
+        if self.use_slack:
+            fd, tmp_path = tempfile.mkstemp(suffix=f"-{filename}")
+            tmp_file = os.fdopen(fd, "wb")
+
+            def finish_slack() -> Optional[str]:
+                try:
+                    return self._save_to_slack(tmp_path, filename, content_type)
+                finally:
+                    os.remove(tmp_path)
+
+            return stream(tmp_file, finish_slack, lambda: os.remove(tmp_path))
+
+        if self.use_s3:
+            upload_args = self._s3_upload_args(
+                filename, content_type, content_encoding
+            )
+            pipe = _UploadPipe()
+            pipe.future = self._get_transfer_manager().upload(
+                pipe, self.s3_bucket, upload_args["key"], upload_args["extra_args"]
+            )
+
+            def finish_s3() -> Optional[str]:
+                s3_path = f"s3://{self.s3_bucket}/{upload_args['key']}"
+                try:
+                    pipe.close()
+                    pipe.future.result()
+                except Exception as e:
+                    report_export_error(self, f"Error saving to S3: {str(e)}")
+                    return None
+                if not self.quiet:
+                    console.print(
+                        f"[bright_green]Successfully exported to S3: {s3_path}[/]"
+                    )
+                return s3_path
+
+            def abort_s3() -> None:
+                pipe.abort()
+                try:
+                    pipe.future.result()
+                except Exception:
+                    pass
+
+            return stream(_PipeWriter(pipe), finish_s3, abort_s3)
+
+        output_filename = filename
+        if self.local_dir:
+            os.makedirs(self.local_dir, exist_ok=True)
+            output_filename = os.path.join(self.local_dir, filename)
+        local_file = open(output_filename, "wb")
+
+        def abort_local() -> None:
+            local_file.close()
+            os.remove(output_filename)
+
+        return stream(local_file, lambda: os.path.abspath(output_filename), abort_local)
+
     def _save_to_s3(
         self, content: bytes, filename: str, content_type: Optional[str] = None
     ) -> Optional[str]:
         """Save content to S3."""
         try:
-            # Build S3 key
-            s3_key = f"{self.s3_prefix}/{filename}" if self.s3_prefix else filename
-            s3_key = s3_key.lstrip("/")  # Remove leading slash
-
             # Auto-detect content type if not provided
-            if not content_type:
-                if filename.endswith(".pdf"):
-                    content_type = "application/pdf"
-                elif filename.endswith(".csv"):
-                    content_type = "text/csv"
-                elif filename.endswith(".json"):
-                    content_type = "application/json"
-
-            # Upload to S3
-            s3_path = upload_to_s3(
-                content, self.s3_bucket, s3_key, self.session, content_type
-            )
-            if s3_path:
+            content_type = content_type or _detect_content_type(filename)
+
+            # Upload to S3 with the transfer manager shared by concurrent exports
+            upload_args = self._s3_upload_args(filename, content_type)
+            self._get_transfer_manager().upload(
+                io.BytesIO(content),
+                self.s3_bucket,
+                upload_args["key"],
+                upload_args["extra_args"],
+            ).result()
+            s3_path = f"s3://{self.s3_bucket}/{upload_args['key']}"
+            if not self.quiet:
                 console.print(
                     f"[bright_green]Successfully exported to S3: {s3_path}[/]"
                 )
             return s3_path
         except Exception as e:
-            console.print(f"[bold red]Error saving to S3: {str(e)}[/]")
+            report_export_error(self, f"Error saving to S3: {str(e)}")
             return None
 
     def _save_to_slack(
-        self, content: bytes, filename: str, content_type: Optional[str] = None
+        self,
+        content: Union[bytes, str],
+        filename: str,
+        content_type: Optional[str] = None,
     ) -> Optional[str]:
-        """Save content to Slack."""
+        """Save content (bytes, or the path of a file to upload) to Slack."""
         try:
             from slack_sdk import WebClient
             from slack_sdk.errors import SlackApiError
         except ImportError:
-            console.print(
-                "[bold red]Error: slack-sdk not installed. Please install it with: pip install slack-sdk[/]"
+            report_export_error(
+                self,
+                "Error: slack-sdk not installed. Please install it with: pip install slack-sdk",
             )
             return None
 
@@ -197,7 +878,7 @@ class ExportHandler:
             response = client.files_upload_v2(**upload_params)
 
             file_id = response.get("file", {}).get("id")
-            if file_id:
+            if file_id and not self.quiet:
                 console.print(
                     f"[bright_green]Successfully exported to Slack: {filename} (File ID: {file_id})[/]"
                 )
@@ -205,12 +886,10 @@ class ExportHandler:
 
         except SlackApiError as e:
             error_message = e.response.get("error", "Unknown error") if e.response else str(e)
-            console.print(
-                f"[bold red]Error uploading to Slack: {error_message}[/]"
-            )
+            report_export_error(self, f"Error uploading to Slack: {error_message}")
             return None
         except Exception as e:
-            console.print(f"[bold red]Error saving to Slack: {str(e)}[/]")
+            report_export_error(self, f"Error saving to Slack: {str(e)}")
             return None
 
     def _save_to_local(self, content: bytes, filename: str) -> Optional[str]:
@@ -234,7 +913,7 @@ class ExportHandler:
 
             return os.path.abspath(output_filename)
         except Exception as e:
-            console.print(f"[bold red]Error saving to local file: {str(e)}[/]")
+            report_export_error(self, f"Error saving to local file: {str(e)}")
             return None
 
     def get_pdf_output(self, base_filename: str):
@@ -0,0 +1,151 @@
+"""Concurrent export of a report to several formats and destinations."""
+
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from aws_finops_dashboard.export_handler import ExportHandler
+from aws_finops_dashboard.memory_profile import memory_profiler
+from aws_finops_dashboard.tracing import tracer
+from aws_finops_dashboard.types import ExportOutcome
+
+console = Console()
+
+# An exporter renders one format and saves it through the given handler,
+# returning the local path, S3 URI or Slack file ID of the artifact
+Exporter = Callable[[ExportHandler], Optional[str]]
+
+
+def snapshot(data: Any) -> Any:
+    """
+    Return a deep copy of report data for the exporters to share.
+
+    Exporters run concurrently and only read their input; copying it once
+    guarantees none of them sees later changes made by the caller.
+    """
+    return copy.deepcopy(data)
+
+
+def _export_artifact(
+    report: str,
+    report_format: str,
+    exporter: Exporter,
+    export_handler: ExportHandler,
+    artifact: str,
+    digest: Optional[str],
+) -> ExportOutcome:
+    handler = export_handler.for_artifact()
+    start = time.perf_counter()
+    outcome: ExportOutcome = {
+        "report": report,
+        "format": report_format,
+        "destination": None,
+        "error": None,
+        "skipped": False,
+        "seconds": 0.0,
+    }
+    if digest is not None:
+        previous = handler.find_published(artifact, digest)
+        if previous is not None:
+            # Same content as the last published artifact: nothing to render
+            outcome["destination"] = previous
+            outcome["skipped"] = True
+            return outcome
+    try:
+        name = f"export {report} {report_format}"
+        with tracer.span(name, "export"), memory_profiler.phase(name):
+            outcome["destination"] = exporter(handler)
+    except Exception as e:
+        handler.errors.append(str(e))
+    if outcome["destination"] is None:
+        outcome["error"] = "; ".join(handler.errors) or "Export failed"
+    elif digest is not None:
+        handler.record_published(artifact, digest, outcome["destination"])
+    outcome["seconds"] = time.perf_counter() - start
+    return outcome
+
+
+def run_export_pipeline(
+    report: str,
+    exporters: List[Tuple[str, Exporter]],
+    export_handler: ExportHandler,
+    max_workers: Optional[int] = None,
+    report_name: Optional[str] = None,
+    digests: Optional[Dict[str, str]] = None,
+) -> List[ExportOutcome]:
+    """
+    Export a report to several formats concurrently.
+
+    Each exporter renders its format and saves it through its own quiet copy of
+    the export handler, so rendering one format overlaps with uploading
+    another. Errors are collected instead of printed.
+
+    Args:
+        report: Type of report being exported (dashboard, audit, trend)
+        exporters: (format, exporter) pairs
+        export_handler: Destination shared by all formats
+        max_workers: Maximum number of formats exported at the same time
+        report_name: Base name of the report files
+        digests: canonical_digest of the content exported by each format, by
+            format; formats already published with the same digest are
+            skipped when the handler has skip_unchanged set
+
+    Returns:
+        The outcome of each artifact, in the order of the exporters
+    """
+    if not exporters:
+        return []
+    if memory_profiler.enabled:
+        # Snapshots are process-wide: one format at a time keeps them apart
+        max_workers = 1
+    with ThreadPoolExecutor(
+        max_workers=max_workers or len(exporters), thread_name_prefix="export"
+    ) as executor:
+        futures = [
+            executor.submit(
+                _export_artifact,
+                report,
+                report_format,
+                exporter,
+                export_handler,
+                f"{report_name or report}.{report_format}",
+                digests.get(report_format) if digests else None,
+            )
+            for report_format, exporter in exporters
+        ]
+        return [future.result() for future in futures]
+
+
+def print_export_summary(outcomes: List[ExportOutcome]) -> None:
+    """Print the outcome of every exported artifact as a single table."""
+    if not outcomes:
+        return
+    table = Table(
+        title="Exports",
+        box=box.SIMPLE,
+        style="bright_cyan",
+        title_style="bold bright_cyan",
+    )
+    table.add_column("Report", style="bold")
+    table.add_column("Format")
+    table.add_column("Destination / Error", overflow="fold")
+    table.add_column("Time", justify="right")
+    for outcome in outcomes:
+        if outcome["skipped"]:
+            result = f"[dim]Unchanged, not exported again (last: {outcome['destination']})[/]"
+        elif outcome["error"] is None:
+            result = f"[bright_green]{outcome['destination']}[/]"
+        else:
+            result = f"[bold red]{outcome['error']}[/]"
+        table.add_row(
+            outcome["report"],
+            outcome["format"].upper(),
+            result,
+            f"{outcome['seconds']:.1f}s",
+        )
+    console.print(table)
@@ -1,69 +1,46 @@
 import csv
+import functools
 import json
 import os
 import re
 import sys
 from datetime import datetime
-from typing import Any, Dict, List, Optional
-from io import BytesIO, StringIO
-from boto3.session import Session
-from botocore.exceptions import ClientError
-
-if sys.version_info >= (3, 11):
-    import tomllib
-else:
-    try:
-        import tomli as tomllib
-    except ImportError:
-        tomllib = None
-
-import yaml
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import portrait, letter
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-from reportlab.platypus import (
-    Flowable,
-    Paragraph,
-    SimpleDocTemplate,
-    Spacer,
-    Table,
-    TableStyle,
-)
-from reportlab.lib.units import inch
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional
+
 from rich.console import Console
 
 from aws_finops_dashboard.types import ProfileData
-from aws_finops_dashboard.pdf_utils import (
-    paragraphStyling,
-    miniHeader,
-    keyValueTable,
-    bulletList,
-    formatServicesForList,
-    split_to_items,
-)
+
+# boto3, reportlab and the config file parsers are imported where they are
+# used, so that commands which never need them (--help, --version) start fast
+if TYPE_CHECKING:
+    from boto3.session import Session
+    from reportlab.platypus import Flowable
 
 console = Console()
 
 
-styles = getSampleStyleSheet()
+def row_status(row: Mapping[str, Any]) -> str:
+    """
+    Return the status of a dashboard or audit row, as exported: "OK",
+    "Partial: <reason>" or "Error: <reason>".
+    """
+    if row.get("error") or row.get("success") is False:
+        return f"Error: {row.get('error')}"
+    if row.get("partial_reason"):
+        return f"Partial: {row['partial_reason']}"
+    return "OK"
 
-# Custom style for the footer
-pdf_footer_style = ParagraphStyle(
-    name="PDF_Footer",
-    parent=styles["Normal"],
-    fontSize=8,
-    textColor=colors.grey,
-    alignment=1,
-    leading=10,
-)
 
 def upload_to_s3(
     content: bytes,
     bucket: str,
     key: str,
-    session: Session,
+    session: "Session",
     content_type: Optional[str] = None,
 ) -> Optional[str]:
+    from botocore.exceptions import ClientError
+
     try:
         s3_client = session.client("s3")
 
@@ -92,6 +69,70 @@ def upload_to_s3(
         console.print(f"[bold red]Error uploading to S3: {str(e)}[/]")
         return None
 
+def _audit_report_elements(
+    generated: str,
+    audit_data_list: List[Dict[str, str]],
+    width: float,
+    first: bool,
+    last: bool,
+) -> List["Flowable"]:
+    """Flowables of a block of audit rows, with the title first and footer last."""
+    from reportlab.platypus import Paragraph, Spacer
+
+    from aws_finops_dashboard.pdf_utils import (
+        bulletList,
+        headerCard,
+        miniHeader,
+        pdf_footer_style,
+        split_to_items,
+        styles,
+    )
+
+    elements: List["Flowable"] = []
+    if first:
+        elements.append(Paragraph("AWS FinOps Dashboard (Audit Report)", styles["Title"]))
+        elements.append(Spacer(1, 8))
+
+    for idx, row in enumerate(audit_data_list):
+        # Header card per profile
+        header_text = (
+            f"<b>Profile:</b> {row['profile']}  &nbsp;&nbsp;&nbsp; "
+            f"<b>Account:</b> {row['account_id']}"
+        )
+        status, _, reason = row.get("status", "OK").partition(": ")
+        if status != "OK":
+            header_text += (
+                f"<br/><font color='darkorange'><b>{status}:</b> {reason}</font>"
+            )
+        elements.append(headerCard(header_text, width))
+        elements.append(Spacer(1, 6))
+
+        # Sections (each as a bulleted list)
+        sections = [
+            ("Untagged Resources", split_to_items(row.get("untagged_resources", ""))),
+            ("Stopped EC2 Instances", split_to_items(row.get("stopped_instances", ""))),
+            ("Unused Volumes", split_to_items(row.get("unused_volumes", ""))),
+            ("Unused EIPs", split_to_items(row.get("unused_eips", ""))),
+            ("Budget Alerts", split_to_items(row.get("budget_alerts", ""))),
+        ]
+
+        for title, items in sections:
+            elements.append(miniHeader(title))
+            elements.append(bulletList(items))
+            elements.append(Spacer(1, 6))
+
+        if idx < len(audit_data_list) - 1:
+            elements.append(Spacer(1, 10))
+
+    if last:
+        elements.append(Spacer(1, 8))
+        footer_note = "Note: This report lists untagged EC2, RDS, Lambda, ELBv2 only."
+        elements.append(Paragraph(footer_note, pdf_footer_style))
+        footer_text = f"This audit report is generated using AWS FinOps Dashboard (CLI) \u00a9 2025 on {generated}"
+        elements.append(Paragraph(footer_text, pdf_footer_style))
+    return elements
+
+
 def export_audit_report_to_pdf(
     audit_data_list: List[Dict[str, str]],
     file_name: str = "audit_report",
@@ -100,9 +141,11 @@ def export_audit_report_to_pdf(
 ) -> Optional[str]:
     """
     Text-mode audit report: one section per profile with small flowables (lists/paras),
-    so content wraps and paginates cleanly.
+    so content wraps and paginates cleanly. Large reports are laid out in
+    parallel, see render_report_pdf.
     """
-    from aws_finops_dashboard.export_handler import ExportHandler
+    from aws_finops_dashboard.export_handler import ExportHandler, report_export_error
+    from aws_finops_dashboard.pdf_render import render_report_pdf
 
     try:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M")
@@ -115,69 +158,16 @@ def export_audit_report_to_pdf(
         # Get output destination (BytesIO for S3, file path for local)
         pdf_output = export_handler.get_pdf_output(base_filename)
 
-        doc = SimpleDocTemplate(
-            pdf_output,
-            pagesize=portrait(letter),
-            leftMargin=0.5*inch,
-            rightMargin=0.5*inch,
-            topMargin=0.5*inch,
-            bottomMargin=0.5*inch,
-            allowSplitting=True,
+        build_elements = functools.partial(
+            _audit_report_elements, f"{datetime.now():%Y-%m-%d %H:%M:%S}"
         )
-
-        elements: List[Flowable] = []
-        elements.append(Paragraph("AWS FinOps Dashboard (Audit Report)", styles["Title"]))
-        elements.append(Spacer(1, 8))
-
-        for idx, row in enumerate(audit_data_list):
-            # Header card per profile
-            header_tbl = Table(
-                [[paragraphStyling(f"<b>Profile:</b> {row['profile']}  &nbsp;&nbsp;&nbsp; "
-                     f"<b>Account:</b> {row['account_id']}")]],
-                colWidths=[doc.width],
-                hAlign="LEFT",
-            )
-            header_tbl.setStyle(TableStyle([
-                ("BACKGROUND", (0, 0), (-1, -1), colors.whitesmoke),
-                ("BOX", (0, 0), (-1, -1), 0.25, colors.grey),
-                ("LEFTPADDING", (0, 0), (-1, -1), 6),
-                ("RIGHTPADDING", (0, 0), (-1, -1), 6),
-                ("TOPPADDING", (0, 0), (-1, -1), 4),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-            ]))
-            elements.append(header_tbl)
-            elements.append(Spacer(1, 6))
-
-            # Sections (each as a bulleted list)
-            sections = [
-                ("Untagged Resources", split_to_items(row.get("untagged_resources", ""))),
-                ("Stopped EC2 Instances", split_to_items(row.get("stopped_instances", ""))),
-                ("Unused Volumes", split_to_items(row.get("unused_volumes", ""))),
-                ("Unused EIPs", split_to_items(row.get("unused_eips", ""))),
-                ("Budget Alerts", split_to_items(row.get("budget_alerts", ""))),
-            ]
-
-            for title, items in sections:
-                elements.append(miniHeader(title))
-                elements.append(bulletList(items))
-                elements.append(Spacer(1, 6))
-
-            if idx < len(audit_data_list) - 1:
-                elements.append(Spacer(1, 10))
-
-        elements.append(Spacer(1, 8))
-        footer_note = "Note: This report lists untagged EC2, RDS, Lambda, ELBv2 only."
-        elements.append(Paragraph(footer_note, pdf_footer_style))
-        footer_text = f"This audit report is generated using AWS FinOps Dashboard (CLI) \u00a9 2025 on {datetime.now():%Y-%m-%d %H:%M:%S}"
-        elements.append(Paragraph(footer_text, pdf_footer_style))
-
-        doc.build(elements)
+        render_report_pdf(pdf_output, build_elements, audit_data_list)
 
         # Finalize PDF export
         return export_handler.finalize_pdf(pdf_output, base_filename)
 
     except Exception as e:
-        console.print(f"[bold red]Error exporting audit report to PDF: {str(e)}[/]")
+        report_export_error(export_handler, f"Error exporting audit report to PDF: {str(e)}")
         return None
 
 
@@ -198,14 +188,12 @@ def export_audit_report_to_csv(
     export_handler=None,
 ) -> Optional[str]:
     """Export the audit report to a CSV file or S3."""
-    from aws_finops_dashboard.export_handler import ExportHandler
+    from aws_finops_dashboard.export_handler import ExportHandler, report_export_error
 
     try:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M")
         base_filename = f"{file_name}_{timestamp}.csv"
 
-        csv_buffer = StringIO()
-
         headers = [
             "Profile",
             "Account ID",
@@ -214,6 +202,7 @@ def export_audit_report_to_csv(
             "Unused Volumes",
             "Unused EIPs",
             "Budget Alerts",
+            "Status",
         ]
         data_keys = [
             "profile",
@@ -223,23 +212,25 @@ def export_audit_report_to_csv(
             "unused_volumes",
             "unused_eips",
             "budget_alerts",
+            "status",
         ]
 
-        writer = csv.writer(csv_buffer)
-        writer.writerow(headers)
-        for item in audit_data_list:
-            writer.writerow([item.get(key, "") for key in data_keys])
-
         # Use export handler if provided, otherwise create default
         if export_handler is None:
             export_handler = ExportHandler(local_dir=path)
 
-        csv_content = csv_buffer.getvalue().encode("utf-8")
-        saved_path = export_handler.save(csv_content, base_filename, "text/csv")
+        # Rows are written to the destination one at a time
+        with export_handler.open_stream(
+            base_filename, "text/csv", encoding="utf-8"
+        ) as stream:
+            writer = csv.writer(stream)
+            writer.writerow(headers)
+            for item in audit_data_list:
+                writer.writerow([item.get(key, "") for key in data_keys])
 
-        return saved_path
+        return stream.destination
     except Exception as e:
-        console.print(f"[bold red]Error exporting audit report to CSV: {str(e)}[/]")
+        report_export_error(export_handler, f"Error exporting audit report to CSV: {str(e)}")
         return None
 
 def export_audit_report_to_json(
@@ -247,25 +238,34 @@ def export_audit_report_to_json(
     file_name: str = "audit_report",
     path: Optional[str] = None,
     export_handler=None,
+    ndjson: bool = False,
 ) -> Optional[str]:
-    """Export the audit report to a JSON file or S3."""
-    from aws_finops_dashboard.export_handler import ExportHandler
+    """
+    Export the audit report to a JSON file or S3.
+
+    With ndjson set, the file is newline-delimited JSON with one record per
+    audit row, which consumers can parse as a stream.
+    """
+    from aws_finops_dashboard.export_handler import ExportHandler, report_export_error
 
     try:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M")
-        base_filename = f"{file_name}_{timestamp}.json"
-
-        json_content = json.dumps(raw_audit_data, indent=4).encode("utf-8")
+        extension = "ndjson" if ndjson else "json"
+        base_filename = f"{file_name}_{timestamp}.{extension}"
 
         # Use export handler if provided, otherwise create default
         if export_handler is None:
             export_handler = ExportHandler(local_dir=path)
 
-        saved_path = export_handler.save(json_content, base_filename, "application/json")
+        with export_handler.open_stream(base_filename, encoding="utf-8") as stream:
+            if ndjson:
+                stream.write_ndjson(raw_audit_data)
+            else:
+                stream.write_json(raw_audit_data)
 
-        return saved_path
+        return stream.destination
     except Exception as e:
-        console.print(f"[bold red]Error exporting audit report to JSON: {str(e)}[/]")
+        report_export_error(export_handler, f"Error exporting audit report to JSON: {str(e)}")
         return None
     
 def export_trend_data_to_json(
@@ -273,27 +273,116 @@ def export_trend_data_to_json(
     file_name: str = "trend_data",
     path: Optional[str] = None,
     export_handler=None,
+    ndjson: bool = False,
 ) -> Optional[str]:
-    """Export trend data to a JSON file or S3."""
-    from aws_finops_dashboard.export_handler import ExportHandler
+    """
+    Export trend data to a JSON file or S3.
+
+    With ndjson set, the file is newline-delimited JSON with one record per
+    profile, which consumers can parse as a stream.
+    """
+    from aws_finops_dashboard.export_handler import ExportHandler, report_export_error
 
     try:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M")
-        base_filename = f"{file_name}_{timestamp}.json"
-
-        json_content = json.dumps(trend_data, indent=4).encode("utf-8")
+        extension = "ndjson" if ndjson else "json"
+        base_filename = f"{file_name}_{timestamp}.{extension}"
 
         # Use export handler if provided, otherwise create default
         if export_handler is None:
             export_handler = ExportHandler(local_dir=path)
 
-        saved_path = export_handler.save(json_content, base_filename, "application/json")
+        with export_handler.open_stream(base_filename, encoding="utf-8") as stream:
+            if ndjson:
+                stream.write_ndjson(trend_data)
+            else:
+                stream.write_json(trend_data)
 
-        return saved_path
+        return stream.destination
     except Exception as e:
-        console.print(f"[bold red]Error exporting trend data to JSON: {str(e)}[/]")
+        report_export_error(export_handler, f"Error exporting trend data to JSON: {str(e)}")
         return None
     
+def _cost_report_elements(
+    previous_period_dates: str,
+    current_period_dates: str,
+    generated: str,
+    data: List[ProfileData],
+    width: float,
+    first: bool,
+    last: bool,
+) -> List["Flowable"]:
+    """Flowables of a block of profiles, with the title first and footer last."""
+    from reportlab.platypus import Paragraph, Spacer
+
+    from aws_finops_dashboard.pdf_utils import (
+        bulletList,
+        formatServicesForList,
+        headerCard,
+        keyValueTable,
+        miniHeader,
+        paragraphStyling,
+        pdf_footer_style,
+        styles,
+    )
+
+    elements: List["Flowable"] = []
+    if first:
+        elements.append(Paragraph("AWS FinOps Dashboard (Cost Report)", styles["Title"]))
+        elements.append(Spacer(1, 10))
+
+        elements.append(paragraphStyling(f"<b>Previous Period:</b> {previous_period_dates}<br/><b>Current Period:</b> {current_period_dates}"))
+        elements.append(Spacer(1, 6))
+
+    for idx, row in enumerate(data):
+        header_text = (
+            f"<b>Profile:</b> {row['profile']}  &nbsp;&nbsp;&nbsp; "
+            f"<b>Account:</b> {row['account_id']}"
+        )
+        if row.get("partial"):
+            header_text += (
+                f"<br/><font color='darkorange'><b>Partial:</b> "
+                f"{row['partial_reason']}</font>"
+            )
+        elements.append(headerCard(header_text, width))
+        elements.append(Spacer(1, 6))
+
+        kv_rows = [
+            ("Previous Period Cost", f"<b>${row['last_month']:.2f}</b>"),
+            ("Current Period Cost", f"<b>${row['current_month']:.2f}</b>"),
+        ]
+        elements.append(keyValueTable(kv_rows))
+        elements.append(Spacer(1, 6))
+
+        elements.append(miniHeader("Previous Period Cost By Service"))
+        prev_svc_items = formatServicesForList(row.get("previous_service_costs", []))
+        elements.append(bulletList(prev_svc_items))
+        elements.append(Spacer(1, 6))
+
+        elements.append(miniHeader("Current Period Cost By Service"))
+        svc_items = formatServicesForList(row["service_costs"])
+        elements.append(bulletList(svc_items))
+        elements.append(Spacer(1, 6))
+
+        elements.append(miniHeader("Budget Status"))
+        budgets = row["budget_info"] if row["budget_info"] else ["No budgets"]
+        elements.append(bulletList(budgets))
+        elements.append(Spacer(1, 6))
+
+        elements.append(miniHeader("EC2 Instances"))
+        ec2_items = [f"{state}: {count}" for state, count in row["ec2_summary"].items() if count > 0] or ["No instances"]
+        elements.append(bulletList(ec2_items))
+
+        if idx < len(data) - 1:
+            elements.append(Spacer(1, 14))
+
+    if last:
+        elements.append(Spacer(1, 8))
+        footer_text = f"This report is generated using AWS FinOps Dashboard (CLI) \u00a9 2025 on {generated}"
+        elements.append(Paragraph(footer_text, pdf_footer_style))
+    return elements
+
+
 def export_cost_dashboard_to_pdf(
     data: List[ProfileData],
     filename: str,
@@ -302,7 +391,8 @@ def export_cost_dashboard_to_pdf(
     current_period_dates: str = "N/A",
     export_handler=None,
 ) -> Optional[str]:
-    from aws_finops_dashboard.export_handler import ExportHandler
+    from aws_finops_dashboard.export_handler import ExportHandler, report_export_error
+    from aws_finops_dashboard.pdf_render import render_report_pdf
 
     try:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M")
@@ -315,85 +405,33 @@ def export_cost_dashboard_to_pdf(
         # Get output destination (BytesIO for S3, file path for local)
         pdf_output = export_handler.get_pdf_output(base_filename)
 
-        doc = SimpleDocTemplate(
-            pdf_output,
-            pagesize=portrait(letter),
-            leftMargin=0.5*inch,
-            rightMargin=0.5*inch,
-            topMargin=0.5*inch,
-            bottomMargin=0.5*inch,
-            allowSplitting=True,
+        build_elements = functools.partial(
+            _cost_report_elements,
+            previous_period_dates,
+            current_period_dates,
+            f"{datetime.now():%Y-%m-%d %H:%M:%S}",
         )
-
-        elements: List[Flowable] = []
-        elements.append(Paragraph("AWS FinOps Dashboard (Cost Report)", styles["Title"]))
-        elements.append(Spacer(1, 10))
-
-        elements.append(paragraphStyling(f"<b>Previous Period:</b> {previous_period_dates}<br/><b>Current Period:</b> {current_period_dates}"))
-        elements.append(Spacer(1, 6))
-
-        for idx, row in enumerate(data):
-            header_tbl = Table(
-                [[paragraphStyling(f"<b>Profile:</b> {row['profile']}  &nbsp;&nbsp;&nbsp; "
-                     f"<b>Account:</b> {row['account_id']}")]],
-                colWidths=[doc.width],
-                hAlign="LEFT",
-            )
-            header_tbl.setStyle(TableStyle([
-                ("BACKGROUND", (0, 0), (-1, -1), colors.whitesmoke),
-                ("BOX", (0, 0), (-1, -1), 0.25, colors.grey),
-                ("LEFTPADDING", (0, 0), (-1, -1), 6),
-                ("RIGHTPADDING", (0, 0), (-1, -1), 6),
-                ("TOPPADDING", (0, 0), (-1, -1), 4),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-            ]))
-            elements.append(header_tbl)
-            elements.append(Spacer(1, 6))
-
-            kv_rows = [
-                ("Previous Period Cost", f"<b>${row['last_month']:.2f}</b>"),
-                ("Current Period Cost", f"<b>${row['current_month']:.2f}</b>"),
-            ]
-            elements.append(keyValueTable(kv_rows))
-            elements.append(Spacer(1, 6))
-
-            elements.append(miniHeader("Previous Period Cost By Service"))
-            prev_svc_items = formatServicesForList(row.get("previous_service_costs", []))
-            elements.append(bulletList(prev_svc_items))
-            elements.append(Spacer(1, 6))
-
-            elements.append(miniHeader("Current Period Cost By Service"))
-            svc_items = formatServicesForList(row["service_costs"])
-            elements.append(bulletList(svc_items))
-            elements.append(Spacer(1, 6))
-
-            elements.append(miniHeader("Budget Status"))
-            budgets = row["budget_info"] if row["budget_info"] else ["No budgets"]
-            elements.append(bulletList(budgets))
-            elements.append(Spacer(1, 6))
-
-            elements.append(miniHeader("EC2 Instances"))
-            ec2_items = [f"{state}: {count}" for state, count in row["ec2_summary"].items() if count > 0] or ["No instances"]
-            elements.append(bulletList(ec2_items))
-
-            if idx < len(data) - 1:
-                elements.append(Spacer(1, 14))
-
-        elements.append(Spacer(1, 8))
-        footer_text = f"This report is generated using AWS FinOps Dashboard (CLI) \u00a9 2025 on {datetime.now():%Y-%m-%d %H:%M:%S}"
-        elements.append(Paragraph(footer_text, pdf_footer_style))
-
-        doc.build(elements)
+        render_report_pdf(pdf_output, build_elements, data)
 
         # Finalize PDF export
         return export_handler.finalize_pdf(pdf_output, base_filename)
     except Exception as e:
-        console.print(f"[bold red]Error exporting to PDF: {str(e)}[/]")
+        report_export_error(export_handler, f"Error exporting to PDF: {str(e)}")
         return None
 
 
 def load_config_file(file_path: str) -> Optional[Dict[str, Any]]:
     """Load configuration from TOML, YAML, or JSON file."""
+    import yaml
+
+    if sys.version_info >= (3, 11):
+        import tomllib
+    else:
+        try:
+            import tomli as tomllib
+        except ImportError:
+            tomllib = None
+
     _, file_extension = os.path.splitext(file_path)
     file_extension = file_extension.lower()
 
@@ -0,0 +1,202 @@
+"""Python memory allocated by each phase of a run, from tracemalloc snapshots."""
+
+import gc
+import os
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+# Allocation sites reported per phase
+TOP_SITES = 5
+
+# Allocations of the profiling itself and of the import machinery are noise
+_IGNORED_FILES = (
+    __file__,
+    tracemalloc.__file__,
+    "<frozen importlib._bootstrap>",
+    "<frozen importlib._bootstrap_external>",
+    "<unknown>",
+)
+
+
+def _short_path(filename: str) -> str:
+    """Return the path of a source file relative to its sys.path entry."""
+    roots = [path for path in sys.path if path and filename.startswith(path)]
+    if not roots:
+        return filename
+    return os.path.relpath(filename, max(roots, key=len))
+
+
+def _format_size(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+class MemoryProfiler:
+    """
+    Takes tracemalloc snapshots at the boundaries of the phases of a run.
+
+    Profiling costs nothing until enable() starts tracemalloc, which then slows
+    every allocation down. Each phase reports the memory it retained (traced
+    at its end minus at its start), the peak traced while it ran and the
+    source lines that retained the most. A phase entered several times, such
+    as the fetch of each trend account, is reported once with its totals.
+    Phases can nest: the peak of an outer phase covers its inner ones.
+    Allocations of worker processes (--processes) are not traced.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._open: List[Dict[str, Any]] = []
+        self._phases: Dict[str, Dict[str, Any]] = {}
+
+    def enable(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.enabled = True
+
+    def _update_peaks(self) -> None:
+        """Carry the peak traced so far into every open phase, then reset it."""
+        peak = tracemalloc.get_traced_memory()[1]
+        for phase in self._open:
+            phase["peak"] = max(phase["peak"], peak)
+        # Python 3.9+; before, peaks are those of the whole run so far
+        reset_peak = getattr(tracemalloc, "reset_peak", None)
+        if reset_peak is not None:
+            reset_peak()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Attribute the allocations of the block to a phase, if profiling."""
+        if not self.enabled:
+            yield
+            return
+        with self._lock:
+            self._update_peaks()
+            summary = self._phases.setdefault(
+                name,
+                {
+                    "phase": name,
+                    "depth": len(self._open),
+                    "entries": 0,
+                    "retained": 0,
+                    "peak": 0,
+                    "sites": {},
+                },
+            )
+            # Garbage awaiting collection is not retained by the phase
+            gc.collect()
+            current = {"peak": tracemalloc.get_traced_memory()[0]}
+            self._open.append(current)
+            before = tracemalloc.take_snapshot()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._update_peaks()
+                self._open.remove(current)
+                gc.collect()
+                after = tracemalloc.take_snapshot()
+                differences = after.compare_to(before, "lineno")
+                self._record(summary, current["peak"], differences)
+
+    def _record(
+        self, summary: Dict[str, Any], peak: int, differences: List[Any]
+    ) -> None:
+        summary["entries"] += 1
+        summary["peak"] = max(summary["peak"], peak)
+        sites = summary["sites"]
+        for difference in differences:
+            frame = difference.traceback[0]
+            # Filtering the grouped differences is much faster than the traces
+            if not difference.size_diff or frame.filename in _IGNORED_FILES:
+                continue
+            summary["retained"] += difference.size_diff
+            site = sites.setdefault(
+                f"{_short_path(frame.filename)}:{frame.lineno}",
+                {"size": 0, "blocks": 0},
+            )
+            site["size"] += difference.size_diff
+            site["blocks"] += difference.count_diff
+
+    def report(self) -> List[Dict[str, Any]]:
+        """
+        Return the phases in the order they first started, each with its top
+        allocation sites by retained size.
+        """
+        with self._lock:
+            phases = []
+            for summary in self._phases.values():
+                sites = sorted(
+                    summary["sites"].items(), key=lambda item: -item[1]["size"]
+                )
+                phases.append(
+                    {
+                        **{k: v for k, v in summary.items() if k != "sites"},
+                        "top_sites": [
+                            {"site": site, **values}
+                            for site, values in sites[:TOP_SITES]
+                            if values["size"] > 0
+                        ],
+                    }
+                )
+            return phases
+
+
+# Shared by every thread of the process
+memory_profiler = MemoryProfiler()
+
+
+def print_memory_profile(phases: List[Dict[str, Any]]) -> None:
+    """Print the memory retained and peak of each phase, then their top sites."""
+    if not phases:
+        console.print("[yellow]No memory profile was recorded[/]")
+        return
+    table = Table(
+        title="Memory Profile",
+        box=box.SIMPLE,
+        style="bright_cyan",
+        title_style="bold bright_cyan",
+    )
+    table.add_column("Phase", style="bold")
+    table.add_column("Runs", justify="right")
+    table.add_column("Retained", justify="right")
+    table.add_column("Peak", justify="right")
+    sites = Table(
+        title="Top Allocation Sites",
+        box=box.SIMPLE,
+        style="bright_cyan",
+        title_style="bold bright_cyan",
+    )
+    sites.add_column("Phase", style="bold")
+    sites.add_column("Retained", justify="right")
+    sites.add_column("Blocks", justify="right")
+    sites.add_column("Line", overflow="fold")
+    for phase in phases:
+        table.add_row(
+            "  " * phase["depth"] + phase["phase"],
+            str(phase["entries"]),
+            _format_size(phase["retained"]),
+            _format_size(phase["peak"]),
+        )
+        for index, site in enumerate(phase["top_sites"]):
+            sites.add_row(
+                phase["phase"] if index == 0 else "",
+                _format_size(site["size"]),
+                str(site["blocks"]),
+                site["site"],
+            )
+    console.print(table)
+    console.print(sites)
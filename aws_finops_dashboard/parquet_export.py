@@ -0,0 +1,293 @@
+"""Columnar (Parquet) export of dashboard, audit and trend data."""
+
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from aws_finops_dashboard.helpers import row_status
+from aws_finops_dashboard.types import ProfileData
+
+if TYPE_CHECKING:
+    from aws_finops_dashboard.export_handler import ExportHandler
+
+
+def _parse_period(period_dates: str) -> Tuple[Optional[date], Optional[date]]:
+    """Parse a 'YYYY-MM-DD to YYYY-MM-DD' period into its start and end dates."""
+    try:
+        start, end = period_dates.split(" to ")
+        return date.fromisoformat(start.strip()), date.fromisoformat(end.strip())
+    except ValueError:
+        return None, None
+
+
+def dashboard_costs_columns(
+    data: List[ProfileData], previous_period_dates: str, current_period_dates: str
+) -> Dict[str, List[Any]]:
+    """One row per (account, period, service) with the cost of the service."""
+    columns: Dict[str, List[Any]] = {
+        "profile": [],
+        "account_id": [],
+        "period": [],
+        "period_name": [],
+        "period_start": [],
+        "period_end": [],
+        "service": [],
+        "cost": [],
+        "status": [],
+    }
+    periods = [
+        ("previous", "previous_period_name", "previous_service_costs", previous_period_dates),
+        ("current", "current_period_name", "service_costs", current_period_dates),
+    ]
+    for row in data:
+        if not row["success"]:
+            continue
+        for period, name_key, costs_key, period_dates in periods:
+            start, end = _parse_period(period_dates)
+            for service, cost in row[costs_key]:  # type: ignore[literal-required]
+                columns["profile"].append(row["profile"])
+                columns["account_id"].append(row["account_id"])
+                columns["period"].append(period)
+                columns["period_name"].append(row[name_key])  # type: ignore[literal-required]
+                columns["period_start"].append(start)
+                columns["period_end"].append(end)
+                columns["service"].append(service)
+                columns["cost"].append(float(cost))
+                columns["status"].append(row_status(row))
+    return columns
+
+
+def dashboard_ec2_columns(data: List[ProfileData]) -> Dict[str, List[Any]]:
+    """One row per (account, instance state) with the number of instances."""
+    columns: Dict[str, List[Any]] = {
+        "profile": [],
+        "account_id": [],
+        "state": [],
+        "count": [],
+        "status": [],
+    }
+    for row in data:
+        if not row["success"]:
+            continue
+        for state, count in row["ec2_summary"].items():
+            columns["profile"].append(row["profile"])
+            columns["account_id"].append(row["account_id"])
+            columns["state"].append(state)
+            columns["count"].append(int(count))
+            columns["status"].append(row_status(row))
+    return columns
+
+
+def dashboard_budgets_columns(data: List[ProfileData]) -> Dict[str, List[Any]]:
+    """One row per (account, budget) with its limit, actual and forecast spend."""
+    columns: Dict[str, List[Any]] = {
+        "profile": [],
+        "account_id": [],
+        "budget": [],
+        "limit": [],
+        "actual": [],
+        "forecast": [],
+        "status": [],
+    }
+    for row in data:
+        for budget in row.get("budgets", []):
+            columns["profile"].append(row["profile"])
+            columns["account_id"].append(row["account_id"])
+            columns["budget"].append(budget["name"])
+            columns["limit"].append(float(budget["limit"]))
+            columns["actual"].append(float(budget["actual"]))
+            forecast = budget.get("forecast")
+            columns["forecast"].append(float(forecast) if forecast is not None else None)
+            columns["status"].append(row_status(row))
+    return columns
+
+
+def audit_findings_columns(
+    raw_audit_data: List[Dict[str, Any]],
+) -> Dict[str, List[Any]]:
+    """
+    One row per audit finding: an untagged, stopped or unused resource, or a
+    budget over its limit (with the overspend as amount). A profile whose
+    audit ran out of time also has an audit_incomplete finding, so it never
+    reads as a clean audit; the status of its rows gives the reason.
+    """
+    columns: Dict[str, List[Any]] = {
+        "profile": [],
+        "account_id": [],
+        "finding": [],
+        "service": [],
+        "region": [],
+        "resource": [],
+        "amount": [],
+        "status": [],
+    }
+
+    def add(
+        row: Dict[str, Any],
+        finding: str,
+        service: Optional[str],
+        region: Optional[str],
+        resource: Optional[str],
+        amount: Optional[float] = None,
+    ) -> None:
+        columns["profile"].append(row["profile"])
+        columns["account_id"].append(row["account_id"])
+        columns["finding"].append(finding)
+        columns["service"].append(service)
+        columns["region"].append(region)
+        columns["resource"].append(resource)
+        columns["amount"].append(amount)
+        columns["status"].append(row_status(row))
+
+    for row in raw_audit_data:
+        if row.get("partial_reason"):
+            add(row, "audit_incomplete", None, None, None)
+        for service, regions in row.get("untagged_resources", {}).items():
+            for region, resources in regions.items():
+                for resource in resources:
+                    add(row, "untagged_resource", service, region, resource)
+        for key, finding, service in (
+            ("stopped_instances", "stopped_instance", "EC2"),
+            ("unused_volumes", "unused_volume", "EBS"),
+            ("unused_eips", "unused_eip", "EC2"),
+        ):
+            for region, resources in row.get(key, {}).items():
+                for resource in resources:
+                    add(row, finding, service, region, resource)
+        for budget in row.get("budget_alerts", []):
+            # Only budgets over their limit are alerts
+            if budget["actual"] > budget["limit"]:
+                add(
+                    row,
+                    "budget_exceeded",
+                    None,
+                    None,
+                    budget["name"],
+                    float(budget["actual"]) - float(budget["limit"]),
+                )
+    return columns
+
+
+def trend_monthly_costs_columns(
+    raw_trend_data: List[Dict[str, Any]],
+) -> Dict[str, List[Any]]:
+    """One row per (account, month) with the total cost of the month."""
+    columns: Dict[str, List[Any]] = {
+        "profile": [],
+        "account_id": [],
+        "month": [],
+        "cost": [],
+    }
+    for row in raw_trend_data:
+        for month, cost in row.get("monthly_costs") or []:
+            columns["profile"].append(row["profile"])
+            columns["account_id"].append(row.get("account_id"))
+            columns["month"].append(datetime.strptime(month, "%b %Y").date())
+            columns["cost"].append(float(cost))
+    return columns
+
+
+def _schema(table: str) -> Any:
+    """Return the Arrow schema of a table, so empty tables keep their types."""
+    import pyarrow as pa
+
+    text = pa.string()
+    schemas = {
+        "costs": [
+            ("profile", text),
+            ("account_id", text),
+            ("period", text),
+            ("period_name", text),
+            ("period_start", pa.date32()),
+            ("period_end", pa.date32()),
+            ("service", text),
+            ("cost", pa.float64()),
+            ("status", text),
+        ],
+        "ec2": [
+            ("profile", text),
+            ("account_id", text),
+            ("state", text),
+            ("count", pa.int64()),
+            ("status", text),
+        ],
+        "budgets": [
+            ("profile", text),
+            ("account_id", text),
+            ("budget", text),
+            ("limit", pa.float64()),
+            ("actual", pa.float64()),
+            ("forecast", pa.float64()),
+            ("status", text),
+        ],
+        "findings": [
+            ("profile", text),
+            ("account_id", text),
+            ("finding", text),
+            ("service", text),
+            ("region", text),
+            ("resource", text),
+            ("amount", pa.float64()),
+            ("status", text),
+        ],
+        "monthly_costs": [
+            ("profile", text),
+            ("account_id", text),
+            ("month", pa.date32()),
+            ("cost", pa.float64()),
+        ],
+    }
+    return pa.schema(schemas[table])
+
+
+def export_table_to_parquet(
+    table: str,
+    build_columns: Callable[[], Dict[str, List[Any]]],
+    file_name: str,
+    path: Optional[str] = None,
+    export_handler: Optional["ExportHandler"] = None,
+) -> Optional[str]:
+    """
+    Export one table of a report to a Parquet file, S3 or Slack.
+
+    Requires the optional pyarrow package.
+
+    Args:
+        table: Name of the table (costs, ec2, budgets, findings, monthly_costs)
+        build_columns: Returns the table as a mapping of column name to values
+        file_name: Base name of the report
+        path: Local directory, used when no export handler is given
+        export_handler: Destination of the file
+    """
+    from aws_finops_dashboard.export_handler import ExportHandler, report_export_error
+
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        report_export_error(
+            export_handler,
+            "Error: pyarrow not installed. Please install it with: pip install pyarrow",
+        )
+        return None
+
+    try:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M")
+        base_filename = f"{file_name}_{table}_{timestamp}.parquet"
+
+        arrow_table = pa.Table.from_pydict(build_columns(), schema=_schema(table))
+        buffer = pa.BufferOutputStream()
+        pq.write_table(arrow_table, buffer, compression="zstd")
+
+        # Use export handler if provided, otherwise create default
+        if export_handler is None:
+            export_handler = ExportHandler(local_dir=path)
+
+        with export_handler.open_stream(
+            base_filename, "application/vnd.apache.parquet"
+        ) as stream:
+            stream.write(memoryview(buffer.getvalue()))
+
+        return stream.destination
+    except Exception as e:
+        report_export_error(export_handler, f"Error exporting {table} to Parquet: {str(e)}")
+        return None
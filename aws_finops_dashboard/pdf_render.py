@@ -0,0 +1,154 @@
+"""Rendering of PDF reports, in chunks laid out in parallel for large reports."""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Any, Callable, List, Optional, Union
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter, portrait
+from reportlab.lib.units import inch
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Flowable, SimpleDocTemplate
+
+# Accounts laid out by each worker process
+PDF_CHUNK_ROWS = 50
+# Below this many accounts, starting worker processes costs more than it saves
+PARALLEL_PDF_MIN_ROWS = 200
+
+# Builds the flowables of a block of report rows:
+# (rows, frame width, is first block, is last block) -> flowables
+ElementBuilder = Callable[[List[Any], float, bool, bool], List[Flowable]]
+
+
+def _document(output: Union[str, BytesIO]) -> SimpleDocTemplate:
+    return SimpleDocTemplate(
+        output,
+        pagesize=portrait(letter),
+        leftMargin=0.5 * inch,
+        rightMargin=0.5 * inch,
+        topMargin=0.5 * inch,
+        bottomMargin=0.5 * inch,
+        allowSplitting=True,
+    )
+
+
+def _draw_page_number(pdf_canvas: canvas.Canvas, page: int, total: int) -> None:
+    width = pdf_canvas._pagesize[0]
+    pdf_canvas.saveState()
+    pdf_canvas.setFont("Helvetica", 8)
+    pdf_canvas.setFillColor(colors.grey)
+    pdf_canvas.drawRightString(
+        width - 0.5 * inch, 0.3 * inch, f"Page {page} of {total}"
+    )
+    pdf_canvas.restoreState()
+
+
+class NumberedCanvas(canvas.Canvas):
+    """Canvas numbering every page as "Page N of M" once the page count is known."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._page_states: List[dict] = []
+
+    def showPage(self) -> None:
+        self._page_states.append(dict(self.__dict__))
+        self._startPage()
+
+    def save(self) -> None:
+        total = len(self._page_states)
+        for state in self._page_states:
+            self.__dict__.update(state)
+            _draw_page_number(self, self._pageNumber, total)
+            super().showPage()
+        super().save()
+
+
+def _render_chunk(
+    build_elements: ElementBuilder, rows: List[Any], first: bool, last: bool
+) -> bytes:
+    """Lay out one block of rows as a standalone PDF, without page numbers."""
+    buffer = BytesIO()
+    doc = _document(buffer)
+    doc.build(build_elements(rows, doc.width, first, last))
+    return buffer.getvalue()
+
+
+def _page_number_overlay(total: int) -> bytes:
+    """Return a PDF of blank pages carrying only their page number."""
+    buffer = BytesIO()
+    overlay = canvas.Canvas(buffer, pagesize=portrait(letter))
+    for page in range(1, total + 1):
+        _draw_page_number(overlay, page, total)
+        overlay.showPage()
+    overlay.save()
+    return buffer.getvalue()
+
+
+def _default_workers(rows: int) -> int:
+    if rows < PARALLEL_PDF_MIN_ROWS:
+        return 1
+    try:
+        import pypdf  # noqa: F401
+    except ImportError:
+        return 1
+    return min(os.cpu_count() or 1, -(-rows // PDF_CHUNK_ROWS))
+
+
+def render_report_pdf(
+    output: Union[str, BytesIO],
+    build_elements: ElementBuilder,
+    rows: List[Any],
+    max_workers: Optional[int] = None,
+) -> None:
+    """
+    Render a report with one section per row to a PDF file or buffer.
+
+    Large reports are split into blocks of PDF_CHUNK_ROWS rows, laid out in a
+    process pool and stitched together with the optional pypdf package; each
+    block starts on a new page. Smaller reports, or any report when pypdf is
+    not installed, are laid out in this process. Pages are numbered either way.
+
+    Args:
+        output: File path or buffer to write the PDF to
+        build_elements: Builds the flowables of a block of rows; must be a
+            module-level function (or a partial of one) so it can be pickled
+        rows: Report rows, in order
+        max_workers: Number of worker processes, by default one per CPU for
+            large reports and none for small ones
+    """
+    workers = _default_workers(len(rows)) if max_workers is None else max_workers
+    if workers <= 1:
+        doc = _document(output)
+        doc.build(
+            build_elements(rows, doc.width, True, True), canvasmaker=NumberedCanvas
+        )
+        return
+
+    from pypdf import PdfReader, PdfWriter
+
+    starts = range(0, max(len(rows), 1), PDF_CHUNK_ROWS)
+    chunks = [rows[start : start + PDF_CHUNK_ROWS] for start in starts]
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(chunks)),
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        rendered = list(
+            executor.map(
+                _render_chunk,
+                [build_elements] * len(chunks),
+                chunks,
+                [index == 0 for index in range(len(chunks))],
+                [index == len(chunks) - 1 for index in range(len(chunks))],
+            )
+        )
+
+    writer = PdfWriter()
+    for chunk in rendered:
+        for page in PdfReader(BytesIO(chunk)).pages:
+            writer.add_page(page)
+    overlay = PdfReader(BytesIO(_page_number_overlay(len(writer.pages))))
+    for page, number in zip(writer.pages, overlay.pages):
+        page.merge_page(number)
+    writer.write(output)
@@ -1,3 +1,6 @@
+import functools
+
+from reportlab.lib import colors
 from reportlab.platypus import (
     Paragraph, 
     Table, 
@@ -7,20 +10,62 @@ from reportlab.platypus import (
 )
 from reportlab.lib.units import inch
 from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-from typing import List
+from typing import Any, Dict, List
 
 styles = getSampleStyleSheet()
 
+# Custom style for the footer
+pdf_footer_style = ParagraphStyle(
+    name="PDF_Footer",
+    parent=styles["Normal"],
+    fontSize=8,
+    textColor=colors.grey,
+    alignment=1,
+    leading=10,
+)
 
-def paragraphStyling(text: str, style_name="BodyText", font_size=9, leading=11):
-    base = styles[style_name]
-    st = ParagraphStyle(
+# Commands of the table styles shared by every table of a report
+TABLE_STYLES: Dict[str, List[Any]] = {
+    "key_value": [
+        ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
+        ("FONTSIZE", (0, 0), (-1, -1), 9),
+        ("LEADING", (0, 0), (-1, -1), 11),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
+        ("TOPPADDING", (0, 0), (-1, -1), 3),
+    ],
+    "header_card": [
+        ("BACKGROUND", (0, 0), (-1, -1), colors.whitesmoke),
+        ("BOX", (0, 0), (-1, -1), 0.25, colors.grey),
+        ("LEFTPADDING", (0, 0), (-1, -1), 6),
+        ("RIGHTPADDING", (0, 0), (-1, -1), 6),
+        ("TOPPADDING", (0, 0), (-1, -1), 4),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+    ],
+}
+
+
+@functools.lru_cache(maxsize=None)
+def cell_style(
+    style_name: str = "BodyText", font_size: int = 9, leading: int = 11
+) -> ParagraphStyle:
+    # Styles are only read while laying out, so every paragraph can share one
+    return ParagraphStyle(
         f"{style_name}_cell",
-        parent=base,
+        parent=styles[style_name],
         fontSize=font_size,
         leading=leading,
     )
-    return Paragraph(text, st)
+
+
+@functools.lru_cache(maxsize=None)
+def table_style(name: str) -> TableStyle:
+    # Tables copy the commands of their style, so one instance serves them all
+    return TableStyle(TABLE_STYLES[name])
+
+
+def paragraphStyling(text: str, style_name="BodyText", font_size=9, leading=11):
+    return Paragraph(text, cell_style(style_name, font_size, leading))
 
 
 def miniHeader(text: str):
@@ -31,14 +76,14 @@ def keyValueTable(rows, colWidths=None):
     # rows = List[Tuple[label, value]]
     data = [[paragraphStyling(f"<b>{k}</b>"), paragraphStyling(v)] for k, v in rows]
     t = Table(data, colWidths=colWidths or [1.6*inch, 5.8*inch], hAlign="LEFT")
-    t.setStyle(TableStyle([
-        ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
-        ("FONTSIZE", (0, 0), (-1, -1), 9),
-        ("LEADING", (0, 0), (-1, -1), 11),
-        ("VALIGN", (0, 0), (-1, -1), "TOP"),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
-        ("TOPPADDING", (0, 0), (-1, -1), 3),
-    ]))
+    t.setStyle(table_style("key_value"))
+    return t
+
+
+def headerCard(text: str, width: float) -> Table:
+    # Boxed single-cell header introducing the section of a profile
+    t = Table([[paragraphStyling(text)]], colWidths=[width], hAlign="LEFT")
+    t.setStyle(table_style("header_card"))
     return t
 
 
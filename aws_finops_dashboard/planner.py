@@ -0,0 +1,237 @@
+"""Dry-run estimate of the AWS API calls, Cost Explorer spend and duration of a run."""
+
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from aws_finops_dashboard.api_metrics import load_latency_history
+from aws_finops_dashboard.aws_client import load_cached_regions
+from aws_finops_dashboard.ce_budget import CE_REQUEST_PRICE
+from aws_finops_dashboard.cost_processor import (
+    COST_DATA_CE_REQUESTS,
+    TREND_CE_REQUESTS,
+)
+from aws_finops_dashboard.run_stats import estimate_wall_time, get_profile_durations
+
+console = Console()
+
+# Regions enabled by default in an AWS account, assumed for profiles whose
+# accessible regions were never probed
+ASSUMED_REGIONS = 17
+# Latency assumed for operations no previous run has timed
+DEFAULT_CALL_SECONDS = 0.3
+
+_CE_OPERATION = "cost-explorer.GetCostAndUsage"
+
+
+def row_calls(mode: str, regions: int, probed: int) -> Dict[str, int]:
+    """
+    Return the calls made for one dashboard or trend row, or one audited profile.
+
+    Args:
+        mode: "dashboard", "audit" or "trend"
+        regions: Regions scanned
+        probed: Regions probed to find the accessible ones, 0 with --regions
+    """
+    if mode == "trend":
+        return {"sts.GetCallerIdentity": 1, _CE_OPERATION: TREND_CE_REQUESTS}
+    probe = {"ec2.DescribeRegions": 1, "ec2.DescribeInstances": probed}
+    if not probed:
+        probe = {}
+    if mode == "audit":
+        calls = Counter(
+            {
+                # Account ID, then again for the budgets
+                "sts.GetCallerIdentity": 2,
+                "budgets.DescribeBudgets": 1,
+                # Untagged and stopped instances
+                "ec2.DescribeInstances": 2 * regions,
+                "ec2.DescribeVolumes": regions,
+                "ec2.DescribeAddresses": regions,
+                "rds.DescribeDBInstances": regions,
+                "lambda.ListFunctions": regions,
+                "elastic-load-balancing-v2.DescribeLoadBalancers": regions,
+                # Only in regions with load balancers
+                "elastic-load-balancing-v2.DescribeTags": regions,
+            }
+        )
+    else:
+        calls = Counter(
+            {
+                "sts.GetCallerIdentity": 1,
+                _CE_OPERATION: COST_DATA_CE_REQUESTS,
+                "budgets.DescribeBudgets": 1,
+                "ec2.DescribeInstances": regions,
+            }
+        )
+    calls.update(probe)
+    return dict(calls)
+
+
+def plan_run(
+    mode: str,
+    profiles: List[str],
+    user_regions: Optional[List[str]],
+    combine: bool = False,
+    processes: Optional[int] = None,
+    completed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Estimate the calls and wall time of a run from local state only.
+
+    Regions come from --regions, or from the last probe of each profile.
+    Rows take the duration recorded for them by previous dashboard runs or,
+    failing that, the sum of the historical latencies of their calls, which
+    are recorded by runs with --timings or --timings-file. With --combine,
+    the accounts of the profiles are not known without calling AWS, so every
+    profile is counted as its own row: an upper bound.
+
+    With --resume, profiles are those left to fetch, and completed is the
+    number of profiles the resumed run already journaled.
+    """
+    latencies = load_latency_history()
+    known = list(latencies.values())
+    default_latency = sum(known) / len(known) if known else DEFAULT_CALL_SECONDS
+    durations = get_profile_durations() if mode == "dashboard" else {}
+
+    calls: Counter = Counter()
+    expected: List[float] = []
+    cached_regions = assumed_regions = from_history = 0
+    for profile in profiles:
+        if user_regions:
+            regions, probed = len(user_regions), 0
+        else:
+            cached = load_cached_regions(profile)
+            if cached is not None:
+                regions, probed = len(cached["regions"]), cached["probed"]
+                cached_regions += 1
+            else:
+                regions = probed = ASSUMED_REGIONS
+                assumed_regions += 1
+        profile_calls = row_calls(mode, regions, probed)
+        if combine and mode != "audit":
+            # Account ID lookup to group the profiles
+            profile_calls["sts.GetCallerIdentity"] += 1
+        calls.update(profile_calls)
+        if profile in durations:
+            expected.append(durations[profile])
+            from_history += 1
+        else:
+            expected.append(
+                sum(
+                    count * latencies.get(operation, default_latency)
+                    for operation, count in profile_calls.items()
+                )
+            )
+
+    # Only dashboard rows are fetched by worker processes
+    workers = 1
+    if mode == "dashboard" and processes and processes > 1:
+        workers = min(processes, len(profiles))
+    ce_requests = calls.get(_CE_OPERATION, 0)
+    return {
+        "mode": mode,
+        "profiles": len(profiles),
+        "completed": completed,
+        "workers": workers,
+        "regions": {
+            "given": len(user_regions) if user_regions else None,
+            "cached": cached_regions,
+            "assumed": assumed_regions,
+        },
+        "calls": {
+            operation: {
+                "calls": count,
+                "seconds": count * latencies.get(operation, default_latency),
+                "historical": operation in latencies,
+            }
+            for operation, count in sorted(calls.items())
+            if count
+        },
+        "ce_requests": ce_requests,
+        "ce_cost": ce_requests * CE_REQUEST_PRICE,
+        "rows_from_history": from_history,
+        "wall_time": estimate_wall_time(expected, workers) or 0.0,
+    }
+
+
+def _format_duration(seconds: float) -> str:
+    if seconds < 10:
+        return f"{seconds:.1f}s"
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h {minutes:02d}m {seconds:02d}s"
+    if minutes:
+        return f"{minutes}m {seconds:02d}s"
+    return f"{seconds}s"
+
+
+def print_plan(plan: Dict[str, Any], max_ce_requests: Optional[int] = None) -> None:
+    """Print the estimate of a run made by plan_run()."""
+    resumed = ""
+    if plan["completed"]:
+        resumed = f" ({plan['completed']} already completed by the resumed run)"
+    console.print(
+        f"[bold bright_cyan]Plan: {plan['mode']} run of {plan['profiles']} profiles{resumed}, no AWS calls made[/]"
+    )
+    regions = plan["regions"]
+    if regions["given"] is not None:
+        console.print(f"[bright_cyan]Regions: {regions['given']} given with --regions[/]")
+    else:
+        assumed = ""
+        if regions["assumed"]:
+            assumed = (
+                f", {ASSUMED_REGIONS} assumed for {regions['assumed']} never probed"
+            )
+        console.print(
+            f"[bright_cyan]Regions: cached for {regions['cached']} profiles{assumed}[/]"
+        )
+
+    table = Table(
+        title="Expected AWS API Calls",
+        box=box.SIMPLE,
+        style="bright_cyan",
+        title_style="bold bright_cyan",
+    )
+    table.add_column("Service", style="bold")
+    table.add_column("Operation")
+    table.add_column("Calls", justify="right")
+    table.add_column("Time", justify="right")
+    table.add_column("Billed", justify="right")
+    for operation, estimate in plan["calls"].items():
+        service, name = operation.split(".", 1)
+        billed = "-"
+        if operation == _CE_OPERATION:
+            billed = f"${estimate['calls'] * CE_REQUEST_PRICE:.2f}"
+        latency = "" if estimate["historical"] else " [dim](assumed)[/]"
+        table.add_row(
+            service,
+            name,
+            str(estimate["calls"]),
+            _format_duration(estimate["seconds"]) + latency,
+            billed,
+        )
+    console.print(table)
+    if plan["mode"] == "audit":
+        console.print(
+            "[dim]Plus one rds.ListTagsForResource per RDS instance and one lambda.ListTags per Lambda function.[/]"
+        )
+
+    console.print(
+        f"[bright_cyan]Cost Explorer: {plan['ce_requests']} requests, ~${plan['ce_cost']:.2f}[/]"
+    )
+    if max_ce_requests is not None and plan["ce_requests"] > max_ce_requests:
+        console.print(
+            f"[yellow]--max-ce-requests {max_ce_requests} will be exhausted; the remaining profiles will use cached cost data or fail[/]"
+        )
+    workers = plan["workers"]
+    console.print(
+        f"[bright_cyan]Estimated wall time: {_format_duration(plan['wall_time'])} "
+        f"with {workers} process{'es' if workers > 1 else ''} "
+        f"({plan['rows_from_history']} of {plan['profiles']} profiles timed by "
+        "previous runs, exports not included)[/]"
+    )
@@ -1,13 +1,22 @@
+import time
 from collections import defaultdict
-from typing import Dict, List, Optional, Union
+from datetime import date
+from typing import Dict, List, Optional, Tuple, Union, cast
 
-import boto3
+from boto3.session import Session
 from rich.console import Console
 
 from aws_finops_dashboard.aws_client import (
+    create_session,
     ec2_summary,
     get_accessible_regions,
 )
+from aws_finops_dashboard.ce_budget import (
+    CostExplorerBudgetExceeded,
+    ce_meter,
+    load_cached_response,
+    save_cached_response,
+)
 from aws_finops_dashboard.cost_processor import (
     change_in_total_cost,
     format_budget_info,
@@ -15,32 +24,144 @@ from aws_finops_dashboard.cost_processor import (
     get_cost_data,
     process_service_costs,
 )
+from aws_finops_dashboard.deadline import ProfileDeadline, ProfileDeadlineExceeded
+from aws_finops_dashboard.run_stats import phase_timer
+from aws_finops_dashboard.tracing import tracer
 from aws_finops_dashboard.types import (
     BudgetInfo,
     CostData,
+    EC2Summary,
     ProfileData,
 )
 
 console = Console()
 
 
+def _fetch_ec2_summary(
+    session: Session,
+    user_regions: Optional[List[str]],
+    deadline: ProfileDeadline,
+) -> Tuple[Optional[EC2Summary], Optional[str]]:
+    """
+    Fetch the EC2 summary within the profile deadline.
+
+    Returns the summary (None if it was never started) and the reason the
+    result is partial, if it is.
+    """
+    if deadline.expired():
+        return None, f"{deadline.describe()}; EC2 summary skipped"
+
+    if user_regions:
+        regions = user_regions
+    else:
+        regions = get_accessible_regions(session, deadline)
+    if deadline.expired():
+        return None, f"{deadline.describe()}; EC2 summary skipped"
+
+    ec2_data = ec2_summary(session, regions, deadline)
+    if deadline.expired():
+        return ec2_data, f"{deadline.describe()}; EC2 summary incomplete"
+    return ec2_data, None
+
+
+def _empty_cost_data(
+    account_id: Optional[str], time_range: Optional[Union[int, str]]
+) -> CostData:
+    """Cost data of an account whose costs could not be fetched."""
+    return {
+        "account_id": account_id,
+        "current_month": 0.0,
+        "last_month": 0.0,
+        "current_month_cost_by_service": [],
+        "previous_month_cost_by_service": [],
+        "budgets": [],
+        "current_period_name": "Current month",
+        "previous_period_name": "Last month",
+        "time_range": time_range,
+        "current_period_start": "N/A",
+        "current_period_end": "N/A",
+        "previous_period_start": "N/A",
+        "previous_period_end": "N/A",
+        "monthly_costs": None,
+    }
+
+
+def _fetch_cost_data(
+    session: Session,
+    profile: str,
+    time_range: Optional[Union[int, str]],
+    tag: Optional[List[str]],
+    deadline: ProfileDeadline,
+    report_date: Optional[date] = None,
+) -> Tuple[Optional[CostData], Optional[str]]:
+    """
+    Fetch the cost data within the profile deadline and the Cost Explorer
+    request budget of the run.
+
+    With --max-ce-requests, the cost data of each profile is cached, and once
+    the budget is spent the cost data last cached for the profile, by this or
+    an earlier run, is used instead. Returns the cost data (None if none is
+    cached, or the deadline ran out) and the reason the result is partial or
+    missing, if it is.
+    """
+    params = [time_range, sorted(tag or [])]
+    try:
+        cost_data = get_cost_data(
+            session, time_range, tag, deadline=deadline, today=report_date
+        )
+    except ProfileDeadlineExceeded as e:
+        return None, str(e)
+    except CostExplorerBudgetExceeded as e:
+        cached = load_cached_response("cost_data", profile, params)
+        if cached is None:
+            return None, f"{str(e)}; cost data not fetched"
+        reason = f"{str(e)}; cost data cached on {cached['saved']}"
+        return cast(CostData, cached["data"]), reason
+    if ce_meter.max_requests is not None:
+        save_cached_response("cost_data", profile, params, dict(cost_data))
+    return cost_data, None
+
+
+def _partial_reason(*reasons: Optional[str]) -> Optional[str]:
+    return "; ".join(reason for reason in reasons if reason) or None
+
+
+@tracer.traced("process_single_profile")
 def process_single_profile(
     profile: str,
     user_regions: Optional[List[str]] = None,
     time_range: Optional[Union[int, str]] = None,
     tag: Optional[List[str]] = None,
+    profile_timeout: Optional[float] = None,
+    call_timeout: Optional[float] = None,
+    timings: Optional[Dict[str, float]] = None,
+    report_date: Optional[date] = None,
 ) -> ProfileData:
-    """Process a single AWS profile and return its data."""
-    try:
-        session = boto3.Session(profile_name=profile)
-        cost_data = get_cost_data(session, time_range, tag)
+    """
+    Process a single AWS profile and return its data.
 
-        if user_regions:
-            profile_regions = user_regions
-        else:
-            profile_regions = get_accessible_regions(session)
+    When the profile_timeout budget runs out, the data fetched so far is
+    returned with the profile marked as partial. The seconds spent in each
+    phase are added to timings, if given. The cost periods are resolved from
+    report_date, today by default.
+    """
+    deadline = ProfileDeadline(profile_timeout, call_timeout)
+    try:
+        with phase_timer(timings, "session"):
+            session = create_session(profile)
+        with phase_timer(timings, "cost"):
+            cost_data, cost_partial_reason = _fetch_cost_data(
+                session, profile, time_range, tag, deadline, report_date
+            )
+        if cost_data is None:
+            # Reported as failed, never as a spend of $0
+            return error_profile_data(profile, cost_partial_reason or "No cost data")
 
-        ec2_data = ec2_summary(session, profile_regions)
+        with phase_timer(timings, "ec2"):
+            ec2_data, ec2_partial_reason = _fetch_ec2_summary(
+                session, user_regions, deadline
+            )
+        partial_reason = _partial_reason(cost_partial_reason, ec2_partial_reason)
         service_costs, service_cost_data = process_service_costs(
             cost_data["current_month_cost_by_service"]
         )
@@ -49,7 +170,11 @@ def process_single_profile(
         )
         budget_info = format_budget_info(cost_data["budgets"])
         account_id = cost_data.get("account_id", "Unknown") or "Unknown"
-        ec2_summary_text = format_ec2_summary(ec2_data)
+        if ec2_data is None:
+            ec2_data = {}
+            ec2_summary_text = ["[yellow]Not fetched (partial)[/]"]
+        else:
+            ec2_summary_text = format_ec2_summary(ec2_data)
         percent_change_in_total_cost = change_in_total_cost(
             cost_data["current_month"], cost_data["last_month"]
         )
@@ -64,73 +189,93 @@ def process_single_profile(
             "previous_service_costs": prev_service_cost_data,
             "previous_service_costs_formatted": prev_service_costs,
             "budget_info": budget_info,
+            "budgets": cost_data["budgets"],
             "ec2_summary": ec2_data,
             "ec2_summary_formatted": ec2_summary_text,
             "success": True,
             "error": None,
+            "partial": partial_reason is not None,
+            "partial_reason": partial_reason,
             "current_period_name": cost_data["current_period_name"],
             "previous_period_name": cost_data["previous_period_name"],
             "percent_change_in_total_cost": percent_change_in_total_cost,
         }
 
     except Exception as e:
-        return {
-            "profile": profile,
-            "account_id": "Error",
-            "last_month": 0,
-            "current_month": 0,
-            "service_costs": [],
-            "service_costs_formatted": [f"Failed to process profile: {str(e)}"],
-            "previous_service_costs": [],
-            "previous_service_costs_formatted": ["Error"],
-            "budget_info": ["N/A"],
-            "ec2_summary": {"N/A": 0},
-            "ec2_summary_formatted": ["Error"],
-            "success": False,
-            "error": str(e),
-            "current_period_name": "Current month",
-            "previous_period_name": "Last month",
-            "percent_change_in_total_cost": None,
-        }
+        return error_profile_data(profile, str(e))
+
+
+def error_profile_data(profile: str, error: str) -> ProfileData:
+    """Build the ProfileData of a profile that failed to process."""
+    return {
+        "profile": profile,
+        "account_id": "Error",
+        "last_month": 0,
+        "current_month": 0,
+        "service_costs": [],
+        "service_costs_formatted": [f"Failed to process profile: {error}"],
+        "previous_service_costs": [],
+        "previous_service_costs_formatted": ["Error"],
+        "budget_info": ["N/A"],
+        "budgets": [],
+        "ec2_summary": {"N/A": 0},
+        "ec2_summary_formatted": ["Error"],
+        "success": False,
+        "error": error,
+        "partial": False,
+        "partial_reason": None,
+        "current_period_name": "Current month",
+        "previous_period_name": "Last month",
+        "percent_change_in_total_cost": None,
+    }
 
 
+@tracer.traced("process_combined_profiles")
 def process_combined_profiles(
     account_id: str,
     profiles: List[str],
     user_regions: Optional[List[str]] = None,
     time_range: Optional[Union[int, str]] = None,
     tag: Optional[List[str]] = None,
+    profile_timeout: Optional[float] = None,
+    call_timeout: Optional[float] = None,
+    timings: Optional[Dict[str, float]] = None,
+    report_date: Optional[date] = None,
 ) -> ProfileData:
     """Process multiple profiles from the same AWS account."""
 
+    deadline = ProfileDeadline(profile_timeout, call_timeout)
     primary_profile = profiles[0]
-    primary_session = boto3.Session(profile_name=primary_profile)
+    with phase_timer(timings, "session"):
+        primary_session = create_session(primary_profile)
 
-    account_cost_data: CostData = {
-        "account_id": account_id,
-        "current_month": 0.0,
-        "last_month": 0.0,
-        "current_month_cost_by_service": [],
-        "previous_month_cost_by_service": [],
-        "budgets": [],
-        "current_period_name": "Current month",
-        "previous_period_name": "Last month",
-        "time_range": time_range,
-        "current_period_start": "N/A",
-        "current_period_end": "N/A",
-        "previous_period_start": "N/A",
-        "previous_period_end": "N/A",
-        "monthly_costs": None,
-    }
+    account_cost_data = _empty_cost_data(account_id, time_range)
+    cost_partial_reason = None
 
     try:
         # Attempt to overwrite with actual data from Cost Explorer
-        account_cost_data = get_cost_data(primary_session, time_range, tag)
+        with phase_timer(timings, "cost"):
+            cost_data, cost_partial_reason = _fetch_cost_data(
+                primary_session,
+                primary_profile,
+                time_range,
+                tag,
+                deadline,
+                report_date,
+            )
+        if cost_data is not None:
+            account_cost_data = cost_data
     except Exception as e:
         console.log(
             f"[bold red]Error getting cost data for account {account_id}: {str(e)}[/]"
         )
         # account_cost_data retains its default values if an error occurs
+    else:
+        if cost_data is None:
+            # Reported as failed, never as a spend of $0
+            return error_profile_data(
+                ", ".join(profiles), cost_partial_reason or "No cost data"
+            )
 
     combined_current_month = account_cost_data["current_month"]
     combined_last_month = account_cost_data["last_month"]
@@ -153,12 +298,11 @@ def process_combined_profiles(
 
     combined_budgets = account_cost_data["budgets"]
 
-    if user_regions:
-        primary_regions = user_regions
-    else:
-        primary_regions = get_accessible_regions(primary_session)
-
-    combined_ec2 = ec2_summary(primary_session, primary_regions)
+    with phase_timer(timings, "ec2"):
+        combined_ec2, ec2_partial_reason = _fetch_ec2_summary(
+            primary_session, user_regions, deadline
+        )
+    partial_reason = _partial_reason(cost_partial_reason, ec2_partial_reason)
 
     service_costs = []
     service_cost_data = [
@@ -189,7 +333,11 @@ def process_combined_profiles(
 
     budget_info = format_budget_info(combined_budgets)
 
-    ec2_summary_text = format_ec2_summary(combined_ec2)
+    if combined_ec2 is None:
+        combined_ec2 = {}
+        ec2_summary_text = ["[yellow]Not fetched (partial)[/]"]
+    else:
+        ec2_summary_text = format_ec2_summary(combined_ec2)
 
     profile_list = ", ".join(profiles)
 
@@ -207,11 +355,63 @@ def process_combined_profiles(
         "previous_service_costs": previous_service_cost_data,
         "previous_service_costs_formatted": previous_service_costs,
         "budget_info": budget_info,
+        "budgets": combined_budgets,
         "ec2_summary": combined_ec2,
         "ec2_summary_formatted": ec2_summary_text,
         "success": True,
         "error": None,
+        "partial": partial_reason is not None,
+        "partial_reason": partial_reason,
         "current_period_name": account_cost_data["current_period_name"],
         "previous_period_name": account_cost_data["previous_period_name"],
         "percent_change_in_total_cost": percent_change_in_total_cost,
     }
+
+
+def process_profile_group(
+    key: str,
+    profiles: List[str],
+    user_regions: Optional[List[str]] = None,
+    time_range: Optional[Union[int, str]] = None,
+    tag: Optional[List[str]] = None,
+    profile_timeout: Optional[float] = None,
+    call_timeout: Optional[float] = None,
+    report_date: Optional[date] = None,
+) -> Tuple[ProfileData, Dict[str, float]]:
+    """
+    Process one dashboard row: a single profile or the profiles of one account.
+
+    This is a module-level function so it can be sent to worker processes; each
+    call creates its own boto3 sessions and returns plain, picklable data.
+
+    Returns:
+        The row data and the seconds spent per phase, including the "total"
+    """
+    timings: Dict[str, float] = {}
+    start = time.perf_counter()
+    with tracer.span("process_profile_group", key=key, profiles=profiles):
+        if len(profiles) > 1:
+            profile_data = process_combined_profiles(
+                key,
+                profiles,
+                user_regions,
+                time_range,
+                tag,
+                profile_timeout,
+                call_timeout,
+                timings,
+                report_date,
+            )
+        else:
+            profile_data = process_single_profile(
+                profiles[0],
+                user_regions,
+                time_range,
+                tag,
+                profile_timeout,
+                call_timeout,
+                timings,
+                report_date,
+            )
+    timings["total"] = time.perf_counter() - start
+    return profile_data, timings
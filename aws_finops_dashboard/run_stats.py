@@ -0,0 +1,143 @@
+"""Historical per-profile and per-phase durations used to schedule runs."""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from aws_finops_dashboard.state import atomic_write_json, get_state_dir
+from aws_finops_dashboard.tracing import tracer
+
+STATS_FILENAME = "profile_stats.json"
+STATS_VERSION = 1
+
+# Weight of the latest run in the moving average of the recorded durations
+SMOOTHING = 0.5
+
+T = TypeVar("T")
+
+
+def get_stats_path() -> str:
+    """Return the path of the local statistics file."""
+    return os.path.join(get_state_dir(), STATS_FILENAME)
+
+
+@contextmanager
+def phase_timer(timings: Optional[Dict[str, float]], phase: str) -> Iterator[None]:
+    """
+    Add the wall time spent in the block to timings[phase], if timings is given.
+
+    The block is also recorded as a span when tracing is enabled.
+    """
+    start = time.perf_counter()
+    try:
+        with tracer.span(phase):
+            yield
+    finally:
+        if timings is not None:
+            timings[phase] = timings.get(phase, 0.0) + time.perf_counter() - start
+
+
+def load_profile_stats(path: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Load the recorded statistics, keyed by profile (or account ID when combined).
+
+    A missing or unreadable file is treated as no history.
+    """
+    try:
+        with open(path or get_stats_path(), encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != STATS_VERSION:
+        return {}
+    profiles = data.get("profiles")
+    return profiles if isinstance(profiles, dict) else {}
+
+
+def record_profile_stats(
+    timings: Dict[str, Dict[str, float]], path: Optional[str] = None
+) -> None:
+    """
+    Merge the phase timings of this run into the statistics file.
+
+    Args:
+        timings: Profile (or account ID) -> phase name -> seconds; the "total"
+            phase is the wall time of the whole profile
+        path: Statistics file, defaults to the one in the state directory
+    """
+    if not timings:
+        return
+    path = path or get_stats_path()
+    stats = load_profile_stats(path)
+    now = time.time()
+    for key, phases in timings.items():
+        entry = stats.get(key) or {"duration": None, "phases": {}, "runs": 0}
+        entry["duration"] = _smooth(entry.get("duration"), phases["total"])
+        entry["phases"] = {
+            phase: _smooth(entry.get("phases", {}).get(phase), seconds)
+            for phase, seconds in phases.items()
+            if phase != "total"
+        }
+        entry["runs"] = entry.get("runs", 0) + 1
+        entry["updated"] = now
+        stats[key] = entry
+    atomic_write_json(path, {"version": STATS_VERSION, "profiles": stats})
+
+
+def _smooth(previous: Optional[float], latest: float) -> float:
+    if previous is None:
+        return round(latest, 3)
+    return round(SMOOTHING * latest + (1 - SMOOTHING) * previous, 3)
+
+
+def get_profile_durations(
+    stats: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, float]:
+    """Return the expected duration in seconds of each profile with history."""
+    stats = load_profile_stats() if stats is None else stats
+    return {
+        key: float(entry["duration"])
+        for key, entry in stats.items()
+        if isinstance(entry, dict) and entry.get("duration") is not None
+    }
+
+
+def estimate_durations(keys: Sequence[str], durations: Dict[str, float]) -> List[float]:
+    """
+    Return the expected duration of each key.
+
+    Keys without history get the average of the known durations, or 0 when
+    nothing is known at all.
+    """
+    known = [durations[key] for key in keys if key in durations]
+    default = sum(known) / len(known) if known else 0.0
+    return [durations.get(key, default) for key in keys]
+
+
+def estimate_wall_time(expected: List[float], workers: int) -> Optional[float]:
+    """
+    Estimate the seconds needed to process rows of the expected durations with
+    the given number of workers, or None when nothing is known.
+    """
+    if not expected or not any(expected):
+        return None
+    return max(sum(expected) / max(workers, 1), max(expected))
+
+
+def longest_first(
+    items: List[Tuple[str, T]], durations: Dict[str, float]
+) -> List[Tuple[str, T]]:
+    """
+    Order (key, item) pairs by expected duration, longest first.
+
+    With many workers the wall time of a run is set by the slowest profiles,
+    so starting them first keeps them from becoming the tail of the run.
+    Ties, and profiles without history, keep their original order.
+    """
+    if not durations:
+        return list(items)
+    expected = estimate_durations([key for key, _ in items], durations)
+    order = sorted(range(len(items)), key=lambda i: -expected[i])
+    return [items[i] for i in order]
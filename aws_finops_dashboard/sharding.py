@@ -0,0 +1,212 @@
+"""Sharded execution: partition profiles across runners and merge their output."""
+
+import argparse
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from aws_finops_dashboard.run_stats import get_profile_durations
+from aws_finops_dashboard.state import atomic_write_json
+
+SHARD_FORMAT = "aws-finops-shard"
+SHARD_FORMAT_VERSION = 1
+
+
+class ShardError(Exception):
+    """Raised when shard outputs are missing, unreadable or inconsistent."""
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parse a shard specification of the form 'i/N' (1-based)."""
+    try:
+        index_text, count_text = value.split("/", 1)
+        index, count = int(index_text), int(count_text)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(
+            "shard must be given as i/N, e.g. 1/4"
+        ) from exc
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(
+            "shard index must be between 1 and the shard count, e.g. 1/4"
+        )
+    return index, count
+
+
+def _stable_hash(profile: str) -> int:
+    """Hash a profile name identically on every machine and Python process."""
+    return int(hashlib.sha256(profile.encode("utf-8")).hexdigest()[:16], 16)
+
+
+def partition_profiles(
+    profiles: List[str],
+    index: int,
+    count: int,
+    durations: Optional[Dict[str, float]] = None,
+) -> List[str]:
+    """
+    Return the profiles assigned to shard index (1-based) of count shards.
+
+    Without durations, profiles are assigned by a stable hash of their name.
+    With historical durations, profiles are assigned longest first to the least
+    loaded shard, so shards finish at about the same time. Profiles without a
+    recorded duration are weighted with the average known duration. Every shard
+    must be given the same profiles and durations to get a consistent partition.
+    The returned profiles keep their original order.
+    """
+    if not durations:
+        return [p for p in profiles if _stable_hash(p) % count == index - 1]
+
+    known = [durations[p] for p in profiles if p in durations]
+    default = sum(known) / len(known) if known else 1.0
+    weights = {p: durations.get(p, default) for p in profiles}
+
+    loads = [0.0] * count
+    assignment: Dict[str, int] = {}
+    for profile in sorted(profiles, key=lambda p: (-weights[p], _stable_hash(p), p)):
+        shard = min(range(count), key=lambda s: (loads[s], s))
+        loads[shard] += weights[profile]
+        assignment[profile] = shard
+    return [p for p in profiles if assignment[p] == index - 1]
+
+
+def load_shard_weights(path: str) -> Dict[str, float]:
+    """
+    Load historical per-profile durations (profile name -> seconds) from JSON.
+
+    Accepts a plain mapping or a profile statistics file written by a run.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ShardError(f"Could not read shard weights file {path}: {e}")
+    if not isinstance(data, dict):
+        raise ShardError(f"Shard weights file {path} must map profiles to seconds")
+    if "profiles" in data and "version" in data:
+        return get_profile_durations(data["profiles"])
+    try:
+        return {str(k): float(v) for k, v in data.items()}
+    except (TypeError, ValueError):
+        raise ShardError(f"Shard weights file {path} must map profiles to seconds")
+
+
+def get_shard_output_path(
+    output_dir: Optional[str], report_name: Optional[str], shard: Tuple[int, int]
+) -> str:
+    """Return the local path of the output file of a shard."""
+    index, count = shard
+    filename = f"{report_name or 'aws_finops'}_shard_{index}_of_{count}.json"
+    return os.path.join(output_dir, filename) if output_dir else filename
+
+
+def write_shard_output(
+    path: str,
+    mode: str,
+    shard: Tuple[int, int],
+    all_profiles: List[str],
+    records: List[Tuple[int, Any]],
+    values: Optional[Dict[str, Any]] = None,
+    params: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Write the output of a shard for a later merge.
+
+    Args:
+        path: Local path of the shard output file
+        mode: Type of run (dashboard, audit, trend)
+        shard: Shard index (1-based) and shard count
+        all_profiles: Profiles of the whole run, before partitioning
+        records: (position in the whole run, record) pairs produced by this shard
+        values: Run-wide values such as the reporting period
+        params: Options every shard of the run must share
+
+    Returns:
+        Absolute path of the written file
+    """
+    atomic_write_json(
+        path,
+        {
+            "format": SHARD_FORMAT,
+            "version": SHARD_FORMAT_VERSION,
+            "mode": mode,
+            "shard": list(shard),
+            "profiles": all_profiles,
+            "values": values or {},
+            "params": params or {},
+            "records": [{"order": order, "data": data} for order, data in records],
+        },
+    )
+    return os.path.abspath(path)
+
+
+def merge_shard_outputs(
+    paths: List[str],
+) -> Tuple[str, List[Any], Dict[str, Any]]:
+    """
+    Merge shard output files into the records of a single run.
+
+    Checks that the files come from the same run (mode, profiles and
+    options), that they cover the same reporting period and that every shard
+    is present exactly once.
+
+    Returns:
+        The run mode, the records in the order a single process would have
+        produced them, and the run-wide values
+    """
+    shards = []
+    for path in paths:
+        try:
+            with open(path, encoding="utf-8") as f:
+                shard = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise ShardError(f"Could not read shard output {path}: {e}")
+        if shard.get("format") != SHARD_FORMAT:
+            raise ShardError(f"{path} is not an aws-finops shard output")
+        if shard.get("version") != SHARD_FORMAT_VERSION:
+            raise ShardError(
+                f"{path} has unsupported shard format version {shard.get('version')}"
+            )
+        shards.append(shard)
+    if not shards:
+        raise ShardError("No shard outputs given")
+
+    first = shards[0]
+    count = first["shard"][1]
+    for shard in shards[1:]:
+        for field in ("mode", "profiles"):
+            if shard[field] != first[field]:
+                raise ShardError(f"Shard outputs disagree on {field}; not the same run")
+        params, first_params = shard.get("params", {}), first.get("params", {})
+        mismatched = sorted(
+            key
+            for key in set(params) | set(first_params)
+            if params.get(key) != first_params.get(key)
+        )
+        if mismatched:
+            raise ShardError(
+                f"Shard outputs used different options: {', '.join(mismatched)}"
+            )
+        if shard["shard"][1] != count:
+            raise ShardError("Shard outputs disagree on the shard count")
+        if shard["values"] != first["values"]:
+            # Same options, but the reporting period is derived from the date
+            raise ShardError(
+                "Shard outputs cover different reporting periods, as they ran on "
+                "different days; run all the shards of a report on the same day"
+            )
+
+    indexes = sorted(shard["shard"][0] for shard in shards)
+    if indexes != list(range(1, count + 1)):
+        missing = sorted(set(range(1, count + 1)) - set(indexes))
+        if missing:
+            raise ShardError(
+                f"Missing output for shard(s) {', '.join(map(str, missing))} of {count}"
+            )
+        raise ShardError("The same shard was given more than once")
+
+    records = sorted(
+        (record for shard in shards for record in shard["records"]),
+        key=lambda record: record["order"],
+    )
+    return first["mode"], [record["data"] for record in records], first["values"]
@@ -0,0 +1,45 @@
+"""Local state directory shared by run journals, caches and statistics."""
+
+import json
+import os
+import tempfile
+from typing import Any
+
+STATE_DIR_ENV = "AWS_FINOPS_STATE_DIR"
+
+
+def get_state_dir() -> str:
+    """
+    Return the local state directory, creating it if needed.
+
+    Defaults to ~/.aws-finops and can be overridden with AWS_FINOPS_STATE_DIR.
+    """
+    state_dir = os.getenv(STATE_DIR_ENV) or os.path.join(
+        os.path.expanduser("~"), ".aws-finops"
+    )
+    os.makedirs(state_dir, exist_ok=True)
+    return state_dir
+
+
+def atomic_write_json(path: str, data: Any) -> None:
+    """
+    Write data as JSON so readers never observe a partially written file.
+
+    The document is written to a temporary file in the same directory, flushed
+    to disk and then renamed over the destination.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,137 @@
+"""Spans of the phases of a run, saved in the Chrome trace event format."""
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Tuple, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Wall-clock time of perf_counter's origin, so spans recorded by worker
+# processes line up with those of the main process
+_CLOCK_OFFSET = time.time() - time.perf_counter()
+
+
+def _microseconds(perf_time: float) -> float:
+    return round((perf_time + _CLOCK_OFFSET) * 1_000_000, 1)
+
+
+class Tracer:
+    """
+    Records spans with the process and thread they ran on.
+
+    Recording costs nothing until enable() is called. Worker processes record
+    into their own tracer; their drain() is merged into the main process one,
+    and write() saves all spans as a Chrome trace (chrome://tracing, Perfetto
+    or speedscope), one track per process and thread.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._events: List[Dict[str, Any]] = []
+        self._threads: Dict[Tuple[int, int], str] = {}
+        self._processes: Dict[int, str] = {}
+
+    def enable(self, process_name: str = "aws-finops-dashboard") -> None:
+        self.enabled = True
+        self._processes[os.getpid()] = process_name
+
+    def add_span(
+        self, name: str, start: float, duration: float, category: str, **args: Any
+    ) -> None:
+        """Record a span that started at the given perf_counter() time."""
+        thread = threading.current_thread()
+        pid, tid = os.getpid(), threading.get_native_id()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": _microseconds(start),
+            "dur": round(duration * 1_000_000, 1),
+            "pid": pid,
+            "tid": tid,
+            "args": args,
+        }
+        with self._lock:
+            self._events.append(event)
+            self._threads[(pid, tid)] = thread.name
+
+    @contextmanager
+    def span(self, name: str, category: str = "phase", **args: Any) -> Iterator[None]:
+        """Record the block as a span, if tracing is enabled."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_span(name, start, time.perf_counter() - start, category, **args)
+
+    def traced(self, name: str) -> Callable[[F], F]:
+        """Decorator recording every call of the function as a span."""
+
+        def decorator(function: F) -> F:
+            @functools.wraps(function)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.span(name):
+                    return function(*args, **kwargs)
+
+            return wrapper  # type: ignore[return-value]
+
+        return decorator
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Return the recorded spans, with their thread names, and forget them."""
+        with self._lock:
+            events = self._events + self._metadata()
+            self._events = []
+        return events
+
+    def merge(self, events: List[Dict[str, Any]]) -> None:
+        """Add the spans drained from another tracer, e.g. of a worker process."""
+        with self._lock:
+            for event in events:
+                if event["ph"] != "M":
+                    self._events.append(event)
+                elif event["name"] == "thread_name":
+                    key = (event["pid"], event["tid"])
+                    self._threads[key] = event["args"]["name"]
+                elif event["name"] == "process_name":
+                    self._processes[event["pid"]] = event["args"]["name"]
+
+    def _metadata(self) -> List[Dict[str, Any]]:
+        events: List[Dict[str, Any]] = [
+            {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": name}}
+            for pid, name in self._processes.items()
+        ]
+        events.extend(
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for (pid, tid), name in self._threads.items()
+        )
+        return events
+
+    def write(self, path: str) -> None:
+        """Save the spans recorded so far as a Chrome trace JSON file."""
+        with self._lock:
+            events = sorted(self._events, key=lambda event: event["ts"])
+            document = {
+                "traceEvents": self._metadata() + events,
+                "displayTimeUnit": "ms",
+            }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(document, f)
+
+
+# Shared by every thread of the process
+tracer = Tracer()
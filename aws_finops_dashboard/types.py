@@ -43,15 +43,29 @@ class ProfileData(TypedDict):
     previous_service_costs: List[Tuple[str, float]]
     previous_service_costs_formatted: List[str]
     budget_info: List[str]
+    budgets: List[BudgetInfo]
     ec2_summary: Dict[str, int]
     ec2_summary_formatted: List[str]
     success: bool
     error: Optional[str]
+    partial: bool
+    partial_reason: Optional[str]
     current_period_name: str
     previous_period_name: str
     percent_change_in_total_cost: Optional[float]
 
 
+class ExportOutcome(TypedDict):
+    """Type for the result of exporting one report artifact."""
+
+    report: str
+    format: str
+    destination: Optional[str]
+    error: Optional[str]
+    skipped: bool
+    seconds: float
+
+
 class CLIArgs(TypedDict, total=False):
     """Type for CLI arguments."""
 
@@ -0,0 +1,113 @@
+"""Background check for a newer release on PyPI, cached in the state directory."""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from rich.console import Console
+
+from aws_finops_dashboard.state import atomic_write_json, get_state_dir
+
+console = Console()
+
+PYPI_URL = "https://pypi.org/pypi/aws-finops-dashboard/json"
+VERSION_CHECK_FILENAME = "version_check.json"
+# Set to any non-empty value to never contact PyPI
+DISABLE_ENV = "AWS_FINOPS_NO_VERSION_CHECK"
+# PyPI is asked at most once per period; runs in between use the cached answer
+CACHE_SECONDS = 24 * 60 * 60
+
+
+def get_version_check_path() -> str:
+    """Return the path of the cached result of the last version check."""
+    return os.path.join(get_state_dir(), VERSION_CHECK_FILENAME)
+
+
+def _load_cached_check() -> Optional[Dict[str, Optional[str]]]:
+    """
+    Return the result of a check made within CACHE_SECONDS, if any: the latest
+    version found, or None if PyPI could not be reached.
+    """
+    try:
+        with open(get_version_check_path(), encoding="utf-8") as f:
+            cached = json.load(f)
+        if time.time() - float(cached["checked"]) < CACHE_SECONDS:
+            latest = cached["latest"]
+            return {"latest": str(latest) if latest is not None else None}
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def _save_check(latest: Optional[str]) -> None:
+    try:
+        atomic_write_json(
+            get_version_check_path(), {"checked": time.time(), "latest": latest}
+        )
+    except (OSError, TypeError, ValueError):
+        pass
+
+
+class VersionCheck:
+    """
+    Looks up the latest release without ever delaying the run.
+
+    start() answers from the cache when it is recent; otherwise it asks PyPI
+    on a daemon thread, which also refreshes the cache, failures included.
+    notify() prints the update notice if an answer has arrived by then, and
+    nothing otherwise: a slow or unreachable PyPI (air-gapped hosts) costs no
+    time at all, and is asked at most once per CACHE_SECONDS.
+    """
+
+    def __init__(self, current_version: str, disabled: bool = False):
+        self.current_version = current_version
+        self.disabled = disabled or bool(os.getenv(DISABLE_ENV))
+        self.latest: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "VersionCheck":
+        if self.disabled:
+            return self
+        cached = _load_cached_check()
+        if cached is not None:
+            self.latest = cached["latest"]
+        else:
+            self._thread = threading.Thread(
+                target=self._fetch, name="version-check", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def _fetch(self) -> None:
+        try:
+            import requests
+
+            response = requests.get(PYPI_URL, timeout=3)
+            latest = str(response.json()["info"]["version"])
+        except Exception:
+            # Failures are cached too, so an unreachable PyPI is only asked
+            # again once the cache expires
+            _save_check(None)
+            return
+        _save_check(latest)
+        self.latest = latest
+
+    def notify(self) -> None:
+        """Print the update notice if a newer version is known; never waits."""
+        if self.latest is None:
+            return
+        try:
+            from packaging import version
+
+            if version.parse(self.latest) <= version.parse(self.current_version):
+                return
+        except Exception:
+            return
+        console.print(
+            f"[bold red]A new version of AWS FinOps Dashboard is available: {self.latest}[/]"
+        )
+        console.print(
+            "[bold bright_yellow]Please update using:\npipx upgrade aws-finops-dashboard\nor\npip install --upgrade aws-finops-dashboard\n[/]"
+        )
@@ -0,0 +1,111 @@
+"""
+Allocations saved by the shared paragraph and table styles of pdf_utils.
+
+Lays out a cost dashboard PDF for many accounts twice, once with the cached
+styles and once creating a new style for every paragraph and table as before,
+and reports the style objects created, the peak traced memory and the time.
+
+    python -m benchmarks.bench_pdf_styles --accounts 1000
+"""
+
+import argparse
+import functools
+import time
+import tracemalloc
+from io import BytesIO
+from typing import Any, Dict, List, Optional
+
+from aws_finops_dashboard import helpers, pdf_utils
+from aws_finops_dashboard.pdf_render import render_report_pdf
+
+_created = {"ParagraphStyle": 0, "TableStyle": 0}
+
+
+def _counted(name: str, style_class: Any) -> Any:
+    """Wrap a style class to count its instances (subclasses fail its checks)."""
+
+    def create(*args: Any, **kwargs: Any) -> Any:
+        _created[name] += 1
+        return style_class(*args, **kwargs)
+
+    return create
+
+
+def _rows(accounts: int, services: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "profile": f"bench-{n:04d}",
+            "account_id": f"{n:012d}",
+            "last_month": 1000.0 + n,
+            "current_month": 500.0 + n,
+            "previous_service_costs": [
+                (f"Synthetic Service {s:03d}", 100.0 / (s + 1)) for s in range(services)
+            ],
+            "service_costs": [
+                (f"Synthetic Service {s:03d}", 90.0 / (s + 1)) for s in range(services)
+            ],
+            "budget_info": ["budget-0 limit: $1000.00", "budget-0 actual: $400.00"],
+            "ec2_summary": {"running": 3, "stopped": 1},
+        }
+        for n in range(accounts)
+    ]
+
+
+def _measure(rows: List[Dict[str, Any]], cached: bool) -> Dict[str, float]:
+    pdf_utils.cell_style.cache_clear()
+    pdf_utils.table_style.cache_clear()
+    if cached:
+        cell_style, table_style = pdf_utils.cell_style, pdf_utils.table_style
+    else:
+        cell_style = pdf_utils.cell_style.__wrapped__
+        table_style = pdf_utils.table_style.__wrapped__
+    originals = (pdf_utils.cell_style, pdf_utils.table_style)
+    pdf_utils.cell_style, pdf_utils.table_style = cell_style, table_style
+    _created.update(ParagraphStyle=0, TableStyle=0)
+    build = functools.partial(helpers._cost_report_elements, "N/A", "N/A", "benchmark")
+    try:
+        tracemalloc.start()
+        start = time.perf_counter()
+        render_report_pdf(BytesIO(), build, rows, max_workers=1)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        pdf_utils.cell_style, pdf_utils.table_style = originals
+    return {
+        "paragraph_styles": _created["ParagraphStyle"],
+        "table_styles": _created["TableStyle"],
+        "peak_mib": peak / 1024 / 1024,
+        "seconds": elapsed,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--accounts", type=int, default=1000)
+    parser.add_argument("--services", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    pdf_utils.ParagraphStyle = _counted("ParagraphStyle", pdf_utils.ParagraphStyle)
+    pdf_utils.TableStyle = _counted("TableStyle", pdf_utils.TableStyle)
+    rows = _rows(args.accounts, args.services)
+
+    results = {
+        "uncached": _measure(rows, cached=False),
+        "cached": _measure(rows, cached=True),
+    }
+    print(
+        f"{'styles':>8} {'ParagraphStyle':>15} {'TableStyle':>11} "
+        f"{'peak MiB':>9} {'seconds':>8}"
+    )
+    for name, result in results.items():
+        print(
+            f"{name:>8} {result['paragraph_styles']:>15} {result['table_styles']:>11} "
+            f"{result['peak_mib']:>9.1f} {result['seconds']:>8.2f}"
+        )
+    saved = 1 - results["cached"]["peak_mib"] / results["uncached"]["peak_mib"]
+    print(f"Peak memory reduced by {saved:.0%} for {args.accounts} accounts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Throughput of thread-pool vs process-pool profile processing.
+
+Runs process_profile_group against the synthetic AWS backend for a growing
+number of profiles, once with a thread pool and once with a process pool of
+the same size (the --processes mode), and reports the profile count from which
+the process pool has the higher throughput.
+
+    python -m benchmarks.bench_process_pool --workers 8 --latency 0.02
+"""
+
+import argparse
+import functools
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional
+
+from aws_finops_dashboard.profile_processor import process_profile_group
+from benchmarks.synthetic_aws import (
+    SyntheticAWS,
+    install_backend,
+    write_aws_config,
+)
+
+
+def _run(executor: Executor, profiles: List[str], regions: List[str]) -> float:
+    process_group = functools.partial(process_profile_group, user_regions=regions)
+    start = time.perf_counter()
+    results = list(executor.map(process_group, profiles, [[p] for p in profiles]))
+    elapsed = time.perf_counter() - start
+    failed = [data["profile"] for data, _ in results if not data["success"]]
+    if failed:
+        raise RuntimeError(f"Profiles failed: {failed[:3]}")
+    return elapsed
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--services", type=int, default=150)
+    parser.add_argument("--instances", type=int, default=200)
+    parser.add_argument(
+        "--profiles", type=int, nargs="+", default=[8, 32, 64, 128, 256]
+    )
+    args = parser.parse_args(argv)
+
+    # Set before the pools exist, so the spawned workers inherit it and no
+    # run reads or fills the user's region and Cost Explorer caches.
+    os.environ["AWS_FINOPS_STATE_DIR"] = tempfile.mkdtemp(prefix="aws-finops-bench-")
+    backend = SyntheticAWS(
+        latency=args.latency,
+        services=args.services,
+        instances_per_region=args.instances,
+    )
+    all_profiles = write_aws_config(max(args.profiles))
+    regions = backend.regions
+    install_backend(backend)
+
+    thread_pool = ThreadPoolExecutor(max_workers=args.workers)
+    process_pool = ProcessPoolExecutor(
+        max_workers=args.workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=install_backend,
+        initargs=(backend,),
+    )
+    # Start the worker processes before timing, as a long run amortizes this
+    _run(process_pool, all_profiles[: args.workers], regions)
+
+    print(f"{'profiles':>8} {'threads p/s':>12} {'processes p/s':>14}")
+    crossover = None
+    with thread_pool, process_pool:
+        for count in args.profiles:
+            profiles = all_profiles[:count]
+            thread_rate = count / _run(thread_pool, profiles, regions)
+            process_rate = count / _run(process_pool, profiles, regions)
+            print(f"{count:>8} {thread_rate:>12.1f} {process_rate:>14.1f}")
+            if crossover is None and process_rate > thread_rate:
+                crossover = count
+
+    if crossover is None:
+        print("Thread pool was faster at every profile count measured")
+    else:
+        print(f"Process pool is faster from {crossover} profiles")
+
+
+if __name__ == "__main__":
+    main()
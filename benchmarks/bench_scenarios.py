@@ -0,0 +1,185 @@
+"""
+End-to-end benchmark of the dashboard, audit and trend runs, fully offline.
+
+Each scenario runs the aws-finops command in a fresh process against the
+synthetic AWS backend, with N profiles (one account each) in M regions, and
+reports its wall time, AWS API calls and peak resident memory. Save the
+results of two releases with --output to compare them.
+
+    python -m benchmarks.bench_scenarios --profiles 50 --regions 4 --latency 0.02
+    python -m benchmarks.bench_scenarios --scenario audit trend --output after.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Any, Dict, List, Optional
+
+from benchmarks.synthetic_aws import SyntheticAWS, install_backend, write_aws_config
+
+# Scenario name -> aws-finops arguments, besides --profiles
+SCENARIOS: Dict[str, List[str]] = {
+    "dashboard": [],
+    "dashboard-export": ["--report-type", "csv", "json", "pdf"],
+    "audit": ["--audit", "--report-type", "csv", "json", "pdf"],
+    "trend": ["--trend", "--report-type", "json"],
+}
+
+# Regions reported by DescribeRegions, the first --regions of them are used
+REGIONS = [
+    "us-east-1",
+    "us-east-2",
+    "us-west-1",
+    "us-west-2",
+    "eu-west-1",
+    "eu-west-2",
+    "eu-central-1",
+    "ap-south-1",
+    "ap-southeast-1",
+    "ap-southeast-2",
+    "ap-northeast-1",
+    "sa-east-1",
+]
+
+_RESULT_MARKER = "BENCHMARK_RESULT "
+
+
+def _peak_rss_mib() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def _run_scenario(name: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Run one scenario in this process and return its measurements."""
+    from aws_finops_dashboard import cli
+    from aws_finops_dashboard.api_metrics import api_calls, summarize
+
+    backend = SyntheticAWS(
+        latency=args.latency,
+        regions=REGIONS[: args.regions],
+        services=args.services,
+        instances_per_region=args.instances,
+        resources_per_region=args.resources,
+    )
+    profiles = write_aws_config(args.profiles)
+    install_backend(backend)
+    api_calls.enable()
+
+    output_dir = tempfile.mkdtemp(prefix="aws-finops-bench-")
+    os.environ["AWS_FINOPS_STATE_DIR"] = output_dir
+    sys.argv = [
+        "aws-finops",
+        "--profiles",
+        *profiles,
+        "--no-version-check",
+        "--report-name",
+        name,
+        "--dir",
+        output_dir,
+        *SCENARIOS[name],
+    ]
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull:
+        with redirect_stdout(devnull), redirect_stderr(devnull):
+            exit_code = cli.main()
+    elapsed = time.perf_counter() - start
+
+    operations = summarize(api_calls.snapshot(), ("service", "operation"))
+    calls = sum(operation["calls"] for operation in operations)
+    return {
+        "scenario": name,
+        "exit_code": exit_code,
+        "profiles": args.profiles,
+        "regions": args.regions,
+        "seconds": round(elapsed, 3),
+        "api_calls": calls,
+        "api_calls_per_profile": round(calls / args.profiles, 1),
+        "calls_by_operation": {
+            f"{operation['service']}.{operation['operation']}": operation["calls"]
+            for operation in operations
+        },
+        "peak_rss_mib": _peak_rss_mib(),
+    }
+
+
+def _run_in_subprocess(name: str, argv: List[str]) -> Dict[str, Any]:
+    """Run a scenario in a fresh interpreter so its peak memory is its own."""
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_scenarios", "--run", name, *argv],
+        stdout=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    for line in completed.stdout.splitlines():
+        if line.startswith(_RESULT_MARKER):
+            return json.loads(line[len(_RESULT_MARKER) :])
+    raise RuntimeError(f"Scenario {name} reported no result")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--scenario", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument("--profiles", type=int, default=20)
+    parser.add_argument("--regions", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.01)
+    parser.add_argument("--services", type=int, default=20)
+    parser.add_argument("--instances", type=int, default=20)
+    parser.add_argument("--resources", type=int, default=4)
+    parser.add_argument("--output", help="Save the results to a JSON file")
+    parser.add_argument("--run", choices=list(SCENARIOS), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run:
+        result = _run_scenario(args.run, args)
+        print(_RESULT_MARKER + json.dumps(result))
+        return
+
+    shared = [
+        f"--profiles={args.profiles}",
+        f"--regions={args.regions}",
+        f"--latency={args.latency}",
+        f"--services={args.services}",
+        f"--instances={args.instances}",
+        f"--resources={args.resources}",
+    ]
+    print(
+        f"{args.profiles} profiles x {args.regions} regions, "
+        f"{args.latency * 1000:.0f} ms per call"
+    )
+    print(
+        f"{'scenario':>16} {'seconds':>8} {'API calls':>10} "
+        f"{'per profile':>12} {'peak RSS MiB':>13}"
+    )
+    results = []
+    for name in args.scenario:
+        result = _run_in_subprocess(name, shared)
+        results.append(result)
+        rss = result["peak_rss_mib"]
+        print(
+            f"{name:>16} {result['seconds']:>8.2f} {result['api_calls']:>10} "
+            f"{result['api_calls_per_profile']:>12.1f} "
+            f"{'n/a' if rss is None else f'{rss:.1f}':>13}"
+        )
+        if result["exit_code"] != 0:
+            print(f"{'':>16} exited with code {result['exit_code']}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"parameters": vars(args), "results": results}, f, indent=2)
+        print(f"Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+AWS API call budgets of the data-fetching code paths.
+
+Runs each code path once against the synthetic AWS backend and counts its
+calls per operation, then fails if any operation is called more often than
+its pinned budget, or at all when it has none. Cost Explorer bills every
+request, so a refactor that repeats a call must show up here, not on the
+invoice. Run it in CI:
+
+    python -m benchmarks.check_call_budgets
+
+When a change is meant to alter the calls of a path, update its budget in
+CALL_BUDGETS in the same commit.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.synthetic_aws import SyntheticAWS, install_backend, write_aws_config
+
+# Fixture the budgets are pinned for: per-region and per-resource calls show
+# up as multiples of these
+REGIONS = ["us-east-1", "us-west-2", "eu-west-1"]
+RESOURCES_PER_REGION = 4
+COMBINED_PROFILES = 2
+
+# Code path -> operation -> maximum calls for one profile (or account)
+CALL_BUDGETS: Dict[str, Dict[str, int]] = {
+    "get_cost_data": {
+        "sts.GetCallerIdentity": 1,
+        # Current and previous period totals, and both by service
+        "cost-explorer.GetCostAndUsage": 4,
+        "budgets.DescribeBudgets": 1,
+    },
+    "get_trend": {
+        "sts.GetCallerIdentity": 1,
+        # Six months in a single monthly query
+        "cost-explorer.GetCostAndUsage": 1,
+    },
+    "process_single_profile": {
+        "sts.GetCallerIdentity": 1,
+        "cost-explorer.GetCostAndUsage": 4,
+        "budgets.DescribeBudgets": 1,
+        # Accessible region probe, then the instances of each region
+        "ec2.DescribeRegions": 1,
+        "ec2.DescribeInstances": 2 * len(REGIONS),
+    },
+    "process_single_profile (--regions)": {
+        "sts.GetCallerIdentity": 1,
+        "cost-explorer.GetCostAndUsage": 4,
+        "budgets.DescribeBudgets": 1,
+        "ec2.DescribeInstances": len(REGIONS),
+    },
+    "process_combined_profiles": {
+        # Costs are fetched once per account, through its first profile
+        "sts.GetCallerIdentity": 1,
+        "cost-explorer.GetCostAndUsage": 4,
+        "budgets.DescribeBudgets": 1,
+        "ec2.DescribeRegions": 1,
+        "ec2.DescribeInstances": 2 * len(REGIONS),
+    },
+    "get_untagged_resources": {
+        "ec2.DescribeInstances": len(REGIONS),
+        "rds.DescribeDBInstances": len(REGIONS),
+        "rds.ListTagsForResource": len(REGIONS) * RESOURCES_PER_REGION,
+        "lambda.ListFunctions": len(REGIONS),
+        "lambda.ListTags": len(REGIONS) * RESOURCES_PER_REGION,
+        "elastic-load-balancing-v2.DescribeLoadBalancers": len(REGIONS),
+        # One call for all the load balancers of a region
+        "elastic-load-balancing-v2.DescribeTags": len(REGIONS),
+    },
+    "get_stopped_instances": {"ec2.DescribeInstances": len(REGIONS)},
+    "get_unused_volumes": {"ec2.DescribeVolumes": len(REGIONS)},
+    "get_unused_eips": {"ec2.DescribeAddresses": len(REGIONS)},
+    "get_budgets": {
+        "sts.GetCallerIdentity": 1,
+        "budgets.DescribeBudgets": 1,
+    },
+}
+
+
+def _code_paths(profiles: List[str]) -> Dict[str, Callable[[], object]]:
+    from aws_finops_dashboard import aws_client, cost_processor, profile_processor
+
+    def session():  # type: ignore[no-untyped-def]
+        return profile_processor.create_session(profiles[0])
+
+    return {
+        "get_cost_data": lambda: cost_processor.get_cost_data(session()),
+        "get_trend": lambda: cost_processor.get_trend(session(), None),
+        "process_single_profile": lambda: profile_processor.process_single_profile(
+            profiles[0]
+        ),
+        "process_single_profile (--regions)": (
+            lambda: profile_processor.process_single_profile(profiles[0], REGIONS)
+        ),
+        "process_combined_profiles": (
+            lambda: profile_processor.process_combined_profiles(
+                "000000000000", profiles[:COMBINED_PROFILES]
+            )
+        ),
+        "get_untagged_resources": (
+            lambda: aws_client.get_untagged_resources(session(), REGIONS)
+        ),
+        "get_stopped_instances": (
+            lambda: aws_client.get_stopped_instances(session(), REGIONS)
+        ),
+        "get_unused_volumes": lambda: aws_client.get_unused_volumes(session(), REGIONS),
+        "get_unused_eips": lambda: aws_client.get_unused_eips(session(), REGIONS),
+        "get_budgets": lambda: aws_client.get_budgets(session()),
+    }
+
+
+def count_calls(run: Callable[[], object]) -> Dict[str, int]:
+    """Return the API calls made by run, per service.operation."""
+    from aws_finops_dashboard.api_metrics import api_calls
+
+    api_calls.enable()
+    api_calls.drain()
+    run()
+    calls: Dict[str, int] = Counter()
+    for record in api_calls.drain():
+        calls[f"{record['service']}.{record['operation']}"] += len(record["latencies"])
+    return dict(calls)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--path",
+        nargs="+",
+        choices=list(CALL_BUDGETS),
+        default=list(CALL_BUDGETS),
+        help="Code paths to check (default: all)",
+    )
+    args = parser.parse_args(argv)
+
+    # Keep the region and Cost Explorer caches of the user's runs out of the
+    # counts, and the synthetic responses out of those caches.
+    os.environ["AWS_FINOPS_STATE_DIR"] = tempfile.mkdtemp(prefix="aws-finops-bench-")
+    profiles = write_aws_config(COMBINED_PROFILES)
+    install_backend(
+        SyntheticAWS(regions=REGIONS, resources_per_region=RESOURCES_PER_REGION)
+    )
+    code_paths = _code_paths(profiles)
+
+    failures = []
+    for path in args.path:
+        budget = CALL_BUDGETS[path]
+        calls = count_calls(code_paths[path])
+        print(f"{path}: {sum(calls.values())} calls")
+        for operation in sorted(set(budget) | set(calls)):
+            count, allowed = calls.get(operation, 0), budget.get(operation, 0)
+            status = "OK"
+            if count > allowed:
+                status = "FAIL"
+                failures.append(f"{path}: {operation} {count} > {allowed}")
+            elif count < allowed:
+                status = "under budget, lower it"
+            print(f"  {operation:<50} {count:>4} / {allowed:<4} {status}")
+
+    if failures:
+        print("FAIL: over budget:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
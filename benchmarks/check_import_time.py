@@ -0,0 +1,106 @@
+"""
+Startup-time budget of the CLI entry point.
+
+Runs ``aws-finops --help`` (cli.main() with --help) in a fresh interpreter with
+``-X importtime`` and fails if it takes longer than the budget or pulls in a
+module that only some commands need (boto3, reportlab, YAML, requests...).
+Timing main() rather than the import catches modules imported inside it
+before the arguments are parsed. Run it in CI:
+
+    python -m benchmarks.check_import_time --budget-ms 150
+"""
+
+import argparse
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+ENTRY_POINT = "aws_finops_dashboard.cli"
+
+# Imports the CLI and runs it with --help, then reports the elapsed time
+_HELP_SCRIPT = f"""
+import sys, time
+start = time.perf_counter()
+import {ENTRY_POINT} as cli
+sys.argv = ["aws-finops", "--help"]
+try:
+    cli.main()
+except SystemExit:
+    pass
+sys.stderr.write("elapsed: %d\\n" % ((time.perf_counter() - start) * 1000000))
+"""
+
+# Imported by the code paths that use them, never at CLI startup
+DEFERRED_MODULES = [
+    "boto3",
+    "botocore",
+    "reportlab",
+    "yaml",
+    "tomllib",
+    "tomli",
+    "requests",
+    "packaging",
+    "pyarrow",
+]
+
+
+def measure_help(runs: int) -> Tuple[int, Dict[str, int]]:
+    """
+    Return the elapsed time in microseconds of ``--help`` in a fresh
+    interpreter, and the cumulative import time of each module it imported,
+    for the fastest of several runs.
+    """
+    best: Tuple[int, Dict[str, int]] = (0, {})
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _HELP_SCRIPT],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        elapsed = 0
+        timings: Dict[str, int] = {}
+        for line in result.stderr.splitlines():
+            if line.startswith("elapsed:"):
+                elapsed = int(line.split(":")[1])
+            # import time: self [us] | cumulative | imported package
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line.split("|")
+            try:
+                timings[name.strip()] = int(cumulative)
+            except ValueError:
+                continue  # header line
+        if not best[1] or elapsed < best[0]:
+            best = (elapsed, timings)
+    return best
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--budget-ms", type=float, default=150.0)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    elapsed, timings = measure_help(args.runs)
+    elapsed_ms = elapsed / 1000
+    loaded = sorted(name for name in timings if name in DEFERRED_MODULES)
+
+    print(f"aws-finops --help: {elapsed_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    failed = False
+    if loaded:
+        print(f"FAIL: imported at startup: {', '.join(loaded)}")
+        failed = True
+    if elapsed_ms > args.budget_ms:
+        slowest = sorted(timings.items(), key=lambda item: -item[1])[:5]
+        print("FAIL: over budget; slowest imports:")
+        for name, micros in slowest:
+            print(f"  {micros / 1000:8.1f} ms  {name}")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
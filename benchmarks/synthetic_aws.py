@@ -0,0 +1,427 @@
+"""
+Synthetic AWS backend for offline benchmarks.
+
+Responses are generated in the wire format of each service and served through
+botocore's ``before-send`` event, so no network or real credentials are used
+but botocore still serializes every request and parses every response exactly
+as it would against AWS.
+"""
+
+import json
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+from io import BytesIO
+from typing import Callable, Dict, Iterator, List, Optional
+from urllib.parse import parse_qs, unquote, urlparse
+
+import boto3
+from botocore.awsrequest import AWSPreparedRequest, AWSResponse
+
+DEFAULT_REGIONS = ["us-east-1", "us-west-2", "eu-west-1", "ap-southeast-1"]
+
+
+class _RawResponse(BytesIO):
+    """Raw HTTP body in the shape botocore reads it from urllib3."""
+
+    def stream(self, **kwargs) -> Iterator[bytes]:  # type: ignore[no-untyped-def]
+        yield self.getvalue()
+
+
+class SyntheticAWS:
+    """
+    Generates AWS responses for the operations used by the dashboard.
+
+    Args:
+        latency: Seconds slept per call to emulate the network round trip
+        regions: Regions reported by DescribeRegions
+        services: Number of services with costs in each Cost Explorer response
+        instances_per_region: EC2 instances returned per region
+        budgets: Number of budgets per account
+        resources_per_region: EBS volumes, Elastic IPs, RDS instances, Lambda
+            functions and load balancers returned per region, for the audit;
+            every other one is untagged, unattached or unassociated
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        regions: Optional[List[str]] = None,
+        services: int = 20,
+        instances_per_region: int = 5,
+        budgets: int = 2,
+        resources_per_region: int = 4,
+    ):
+        self.latency = latency
+        self.regions = regions or DEFAULT_REGIONS
+        self.services = services
+        self.instances_per_region = instances_per_region
+        self.budgets = budgets
+        self.resources_per_region = resources_per_region
+        self._handlers: Dict[str, Callable[[AWSPreparedRequest, str], bytes]] = {
+            "sts.GetCallerIdentity": self._sts_get_caller_identity,
+            "ec2.DescribeRegions": self._ec2_describe_regions,
+            "ec2.DescribeInstances": self._ec2_describe_instances,
+            "ec2.DescribeVolumes": self._ec2_describe_volumes,
+            "ec2.DescribeAddresses": self._ec2_describe_addresses,
+            "rds.DescribeDBInstances": self._rds_describe_db_instances,
+            "rds.ListTagsForResource": self._rds_list_tags_for_resource,
+            "lambda.ListFunctions": self._lambda_list_functions,
+            "lambda.ListTags": self._lambda_list_tags,
+            "elastic-load-balancing-v2.DescribeLoadBalancers": self._elbv2_describe_load_balancers,
+            "elastic-load-balancing-v2.DescribeTags": self._elbv2_describe_tags,
+            "cost-explorer.GetCostAndUsage": self._ce_get_cost_and_usage,
+            "budgets.DescribeBudgets": self._budgets_describe_budgets,
+        }
+
+    def install(self, session: boto3.Session) -> None:
+        """Serve every call made by clients of the session from this backend."""
+        session.events.register("before-send", self._respond)
+
+    def _respond(
+        self, request: AWSPreparedRequest, event_name: str, **kwargs
+    ) -> AWSResponse:  # type: ignore[no-untyped-def]
+        operation = event_name.split(".", 1)[1]
+        handler = self._handlers.get(operation)
+        if handler is None:
+            raise NotImplementedError(f"No synthetic response for {operation}")
+        region = _region_from_url(request.url)
+        body = handler(request, region)
+        if self.latency:
+            time.sleep(self.latency)
+        return AWSResponse(
+            request.url, 200, {"x-amzn-requestid": "synthetic"}, _RawResponse(body)
+        )
+
+    def _sts_get_caller_identity(self, request: AWSPreparedRequest, region: str) -> bytes:
+        account = _account_for(request)
+        return (
+            '<GetCallerIdentityResponse xmlns="https://sts.amazonaws.com/doc/2011-06-15/">'
+            "<GetCallerIdentityResult>"
+            f"<Arn>arn:aws:iam::{account}:user/benchmark</Arn>"
+            "<UserId>AIDABENCHMARK</UserId>"
+            f"<Account>{account}</Account>"
+            "</GetCallerIdentityResult>"
+            "<ResponseMetadata><RequestId>synthetic</RequestId></ResponseMetadata>"
+            "</GetCallerIdentityResponse>"
+        ).encode("utf-8")
+
+    def _ec2_describe_regions(self, request: AWSPreparedRequest, region: str) -> bytes:
+        items = "".join(
+            f"<item><regionName>{name}</regionName>"
+            f"<regionEndpoint>ec2.{name}.amazonaws.com</regionEndpoint></item>"
+            for name in self.regions
+        )
+        return (
+            '<DescribeRegionsResponse xmlns="http://ec2.amazonaws.com/doc/2016-11-15/">'
+            f"<requestId>synthetic</requestId><regionInfo>{items}</regionInfo>"
+            "</DescribeRegionsResponse>"
+        ).encode("utf-8")
+
+    def _ec2_describe_instances(
+        self, request: AWSPreparedRequest, region: str
+    ) -> bytes:
+        states = ["running", "stopped", "running", "terminated"]
+        wanted = _query_filter(request, "instance-state-name")
+        instances = "".join(
+            "<item>"
+            f"<instanceId>i-{region.replace('-', '')}{n:08d}</instanceId>"
+            "<instanceType>t3.micro</instanceType>"
+            f"<instanceState><code>16</code><name>{states[n % len(states)]}</name></instanceState>"
+            "<launchTime>2024-01-01T00:00:00.000Z</launchTime>"
+            f"{_EC2_TAGS if n % 2 == 0 else ''}"
+            "</item>"
+            for n in range(self.instances_per_region)
+            if wanted is None or states[n % len(states)] in wanted
+        )
+        return (
+            '<DescribeInstancesResponse xmlns="http://ec2.amazonaws.com/doc/2016-11-15/">'
+            "<requestId>synthetic</requestId><reservationSet>"
+            f"<item><reservationId>r-synthetic</reservationId><instancesSet>{instances}</instancesSet></item>"
+            "</reservationSet></DescribeInstancesResponse>"
+        ).encode("utf-8")
+
+    def _ec2_describe_volumes(self, request: AWSPreparedRequest, region: str) -> bytes:
+        wanted = _query_filter(request, "status")
+        volumes = "".join(
+            "<item>"
+            f"<volumeId>vol-{region.replace('-', '')}{n:08d}</volumeId>"
+            f"<size>8</size><status>{status}</status><volumeType>gp3</volumeType>"
+            "</item>"
+            for n, status in (
+                (n, "in-use" if n % 2 == 0 else "available")
+                for n in range(self.resources_per_region)
+            )
+            if wanted is None or status in wanted
+        )
+        return (
+            '<DescribeVolumesResponse xmlns="http://ec2.amazonaws.com/doc/2016-11-15/">'
+            f"<requestId>synthetic</requestId><volumeSet>{volumes}</volumeSet>"
+            "</DescribeVolumesResponse>"
+        ).encode("utf-8")
+
+    def _ec2_describe_addresses(
+        self, request: AWSPreparedRequest, region: str
+    ) -> bytes:
+        addresses = "".join(
+            "<item>"
+            f"<publicIp>198.51.100.{n % 256}</publicIp>"
+            f"<allocationId>eipalloc-{n:08d}</allocationId><domain>vpc</domain>"
+            f"{f'<associationId>eipassoc-{n:08d}</associationId>' if n % 2 == 0 else ''}"
+            "</item>"
+            for n in range(self.resources_per_region)
+        )
+        return (
+            '<DescribeAddressesResponse xmlns="http://ec2.amazonaws.com/doc/2016-11-15/">'
+            f"<requestId>synthetic</requestId><addressesSet>{addresses}</addressesSet>"
+            "</DescribeAddressesResponse>"
+        ).encode("utf-8")
+
+    def _rds_describe_db_instances(
+        self, request: AWSPreparedRequest, region: str
+    ) -> bytes:
+        account = _account_for(request)
+        instances = "".join(
+            "<DBInstance>"
+            f"<DBInstanceIdentifier>db-{n}</DBInstanceIdentifier>"
+            f"<DBInstanceArn>arn:aws:rds:{region}:{account}:db:db-{n}</DBInstanceArn>"
+            "</DBInstance>"
+            for n in range(self.resources_per_region)
+        )
+        return (
+            '<DescribeDBInstancesResponse xmlns="http://rds.amazonaws.com/doc/2014-10-31/">'
+            f"<DescribeDBInstancesResult><DBInstances>{instances}</DBInstances>"
+            "</DescribeDBInstancesResult>"
+            "<ResponseMetadata><RequestId>synthetic</RequestId></ResponseMetadata>"
+            "</DescribeDBInstancesResponse>"
+        ).encode("utf-8")
+
+    def _rds_list_tags_for_resource(
+        self, request: AWSPreparedRequest, region: str
+    ) -> bytes:
+        arn = _query_params(request).get("ResourceName", [""])[0]
+        tags = "<Tag><Key>team</Key><Value>finops</Value></Tag>" if _tagged(arn) else ""
+        return (
+            '<ListTagsForResourceResponse xmlns="http://rds.amazonaws.com/doc/2014-10-31/">'
+            f"<ListTagsForResourceResult><TagList>{tags}</TagList>"
+            "</ListTagsForResourceResult>"
+            "<ResponseMetadata><RequestId>synthetic</RequestId></ResponseMetadata>"
+            "</ListTagsForResourceResponse>"
+        ).encode("utf-8")
+
+    def _lambda_list_functions(
+        self, request: AWSPreparedRequest, region: str
+    ) -> bytes:
+        account = _account_for(request)
+        functions = [
+            {
+                "FunctionName": f"function-{n}",
+                "FunctionArn": f"arn:aws:lambda:{region}:{account}:function:function-{n}",
+                "Runtime": "python3.12",
+            }
+            for n in range(self.resources_per_region)
+        ]
+        return json.dumps({"Functions": functions}).encode("utf-8")
+
+    def _lambda_list_tags(self, request: AWSPreparedRequest, region: str) -> bytes:
+        arn = unquote(urlparse(request.url).path.rsplit("/", 1)[-1])
+        tags = {"team": "finops"} if _tagged(arn) else {}
+        return json.dumps({"Tags": tags}).encode("utf-8")
+
+    def _elbv2_describe_load_balancers(
+        self, request: AWSPreparedRequest, region: str
+    ) -> bytes:
+        account = _account_for(request)
+        load_balancers = "".join(
+            "<member>"
+            f"<LoadBalancerArn>arn:aws:elasticloadbalancing:{region}:{account}:"
+            f"loadbalancer/app/lb-{n}/{n:016x}</LoadBalancerArn>"
+            f"<LoadBalancerName>lb-{n}</LoadBalancerName><Type>application</Type>"
+            "</member>"
+            for n in range(self.resources_per_region)
+        )
+        return (
+            '<DescribeLoadBalancersResponse xmlns="http://elasticloadbalancing.amazonaws.com/doc/2015-12-01/">'
+            "<DescribeLoadBalancersResult>"
+            f"<LoadBalancers>{load_balancers}</LoadBalancers>"
+            "</DescribeLoadBalancersResult>"
+            "<ResponseMetadata><RequestId>synthetic</RequestId></ResponseMetadata>"
+            "</DescribeLoadBalancersResponse>"
+        ).encode("utf-8")
+
+    def _elbv2_describe_tags(self, request: AWSPreparedRequest, region: str) -> bytes:
+        params = _query_params(request)
+        members = [name for name in params if name.startswith("ResourceArns.member.")]
+        arns = [
+            params[name][0]
+            for name in sorted(members, key=lambda name: int(name.rsplit(".", 1)[-1]))
+        ]
+        tags = "<member><Key>team</Key><Value>finops</Value></member>"
+        # Load balancer ARNs end with .../app/<name>/<id>
+        descriptions = "".join(
+            f"<member><ResourceArn>{arn}</ResourceArn>"
+            f"<Tags>{tags if _tagged(arn.rsplit('/', 2)[-2]) else ''}</Tags></member>"
+            for arn in arns
+        )
+        return (
+            '<DescribeTagsResponse xmlns="http://elasticloadbalancing.amazonaws.com/doc/2015-12-01/">'
+            f"<DescribeTagsResult><TagDescriptions>{descriptions}</TagDescriptions>"
+            "</DescribeTagsResult>"
+            "<ResponseMetadata><RequestId>synthetic</RequestId></ResponseMetadata>"
+            "</DescribeTagsResponse>"
+        ).encode("utf-8")
+
+    def _ce_get_cost_and_usage(self, request: AWSPreparedRequest, region: str) -> bytes:
+        params = json.loads(request.body or b"{}")
+        period = params.get("TimePeriod", {})
+        start = date.fromisoformat(period.get("Start", date.today().isoformat()))
+        end = date.fromisoformat(period.get("End", (start + timedelta(1)).isoformat()))
+        # Monthly results have one period per month started in the range, as
+        # the trend asks for six months in one call
+        starts = [start]
+        if params.get("Granularity") == "MONTHLY":
+            while _next_month(starts[-1]) < end:
+                starts.append(_next_month(starts[-1]))
+        return json.dumps(
+            {
+                "ResultsByTime": [
+                    self._ce_result(params, period_start, end)
+                    for period_start in starts
+                ]
+            }
+        ).encode("utf-8")
+
+    def _ce_result(self, params: Dict, start: date, end: date) -> Dict:
+        grouped = bool(params.get("GroupBy"))
+        result = {
+            "TimePeriod": {
+                "Start": start.isoformat(),
+                "End": min(end, _next_month(start)).isoformat(),
+            },
+            "Total": {} if grouped else {"UnblendedCost": {"Amount": "1234.56", "Unit": "USD"}},
+            "Groups": [
+                {
+                    "Keys": [f"Synthetic Service {n:03d}"],
+                    "Metrics": {
+                        "UnblendedCost": {"Amount": f"{100.0 / (n + 1):.10f}", "Unit": "USD"}
+                    },
+                }
+                for n in range(self.services)
+            ]
+            if grouped
+            else [],
+            "Estimated": False,
+        }
+        return result
+
+    def _budgets_describe_budgets(
+        self, request: AWSPreparedRequest, region: str
+    ) -> bytes:
+        budgets = [
+            {
+                "BudgetName": f"budget-{n}",
+                "BudgetLimit": {"Amount": "1000.0", "Unit": "USD"},
+                "CalculatedSpend": {
+                    "ActualSpend": {"Amount": f"{400.0 * (n + 1):.2f}", "Unit": "USD"},
+                    "ForecastedSpend": {"Amount": f"{600.0 * (n + 1):.2f}", "Unit": "USD"},
+                },
+                "TimeUnit": "MONTHLY",
+                "BudgetType": "COST",
+            }
+            for n in range(self.budgets)
+        ]
+        return json.dumps({"Budgets": budgets}).encode("utf-8")
+
+
+_EC2_TAGS = "<tagSet><item><key>team</key><value>finops</value></item></tagSet>"
+
+
+def _next_month(day: date) -> date:
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _tagged(name: str) -> bool:
+    # Resources with an even number at the end of their name are tagged
+    digits = name[len(name.rstrip("0123456789")) :]
+    return digits != "" and int(digits) % 2 == 0
+
+
+def _query_params(request: AWSPreparedRequest) -> Dict[str, List[str]]:
+    body = request.body or b""
+    if isinstance(body, bytes):
+        body = body.decode("utf-8")
+    return parse_qs(body)
+
+
+def _query_filter(request: AWSPreparedRequest, name: str) -> Optional[List[str]]:
+    """Return the values of the EC2 filter with the given name, if any."""
+    params = _query_params(request)
+    for key, values in params.items():
+        if key.startswith("Filter.") and key.endswith(".Name") and values[0] == name:
+            prefix = key[: -len("Name")] + "Value."
+            return [
+                value[0] for param, value in params.items() if param.startswith(prefix)
+            ]
+    return None
+
+
+def _region_from_url(url: str) -> str:
+    host = urlparse(url).hostname or ""
+    parts = host.split(".")
+    return parts[1] if len(parts) > 3 else "us-east-1"
+
+
+def _account_for(request: AWSPreparedRequest) -> str:
+    # Each profile signs with its own access key, which encodes its account number
+    auth = request.headers.get("Authorization", b"")
+    if isinstance(auth, bytes):
+        auth = auth.decode("utf-8")
+    marker = "Credential=AKIASYNTH"
+    if marker in auth:
+        return auth.split(marker, 1)[1][:12]
+    return "000000000000"
+
+
+def install_backend(backend: SyntheticAWS) -> None:
+    """
+    Route every session the dashboard creates to the synthetic backend.
+
+    Sessions are still created by aws_client.create_session, so they keep
+    their API call instrumentation. Must be called again in
+    worker processes, e.g. as their initializer.
+    """
+    from aws_finops_dashboard import aws_client, dashboard_runner, profile_processor
+
+    def create_session(profile_name=None):  # type: ignore[no-untyped-def]
+        session = aws_client.create_session(profile_name)
+        backend.install(session)
+        return session
+
+    profile_processor.create_session = create_session
+    dashboard_runner.create_session = create_session
+
+
+def write_aws_config(profiles: int, directory: Optional[str] = None) -> List[str]:
+    """
+    Write an AWS config and credentials file with synthetic profiles.
+
+    Points AWS_CONFIG_FILE and AWS_SHARED_CREDENTIALS_FILE at them (inherited by
+    worker processes) and returns the profile names.
+    """
+    directory = directory or tempfile.mkdtemp(prefix="aws-finops-bench-")
+    names = [f"bench-{n:04d}" for n in range(profiles)]
+    config_path = os.path.join(directory, "config")
+    credentials_path = os.path.join(directory, "credentials")
+    with open(config_path, "w", encoding="utf-8") as f:
+        for name in names:
+            f.write(f"[profile {name}]\nregion = us-east-1\n")
+    with open(credentials_path, "w", encoding="utf-8") as f:
+        for n, name in enumerate(names):
+            f.write(
+                f"[{name}]\naws_access_key_id = AKIASYNTH{n:012d}\n"
+                "aws_secret_access_key = synthetic\n"
+            )
+    os.environ["AWS_CONFIG_FILE"] = config_path
+    os.environ["AWS_SHARED_CREDENTIALS_FILE"] = credentials_path
+    return names